@@ -2,23 +2,54 @@ import os
 import sys
 from flask import Flask
 from flask import request, jsonify, render_template
-import joblib
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 import numpy as np
-import certifi
-ca=certifi.where()
 
 from dotenv import load_dotenv
 load_dotenv()
-mongo_db_url=os.getenv("MONGO_URL_KEY")
-print(mongo_db_url)
 
-from networksecurity.pipeline.training_pipeline import TrainingPipeline
-from networksecurity.exception import NetworkSecurityException
-from networksecurity.logging import logger
-from networksecurity.utils.ml_utils.model.estimator import NetworkSecurityModel
+# Serving imports only: the training stack (pymongo, sklearn, xgboost, scipy) is imported
+# by the training job process, and the model registry prefers the NumPy-only compiled model
+from networksecurity.pipeline.training_job import TrainingJobManager, TrainingInProgressError
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging as logger
+from networksecurity.utils.ml_utils.model.registry import ModelRegistry
+from networksecurity.utils.ml_utils.model.batch_input import (
+    NPY_CONTENT_TYPES,
+    BatchInputError,
+    batch_from_npy,
+    batch_from_json,
+    score_batch
+)
+from networksecurity.utils.ml_utils.model.micro_batcher import MicroBatcher, MicroBatcherUnavailableError
+from networksecurity.utils.ml_utils.drift.monitor import DriftMonitor
+from networksecurity.constant.training_pipeline import PREDICTION_BATCH_MAX_BYTES
 
 
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = PREDICTION_BATCH_MAX_BYTES
+
+# Loaded once per process and hot reloaded when the artifact changes
+model_registry = ModelRegistry()
+try:
+    model_registry.load()
+except Exception as e:
+    # a broken artifact must not stop the app: /predict answers 404 until a loadable model is published
+    logger.error(f"Starting without a model: {e}")
+model_registry.start_watching()
+
+# Optional: coalesce concurrent single-row /predict calls into vectorized batches
+micro_batcher = None
+if os.getenv("MICRO_BATCHING_ENABLED", "false").lower() in ("1", "true", "yes"):
+    micro_batcher = MicroBatcher(model_registry.get_model)
+    micro_batcher.start()
+
+# Live feature drift against the training reference shipped inside the model
+drift_monitor = DriftMonitor(model_registry.get_model)
+drift_monitor.start()
+
+# Training runs in its own process; /train only schedules it
+training_jobs = TrainingJobManager()
 
 
 # ---------- ROUTES ----------
@@ -31,17 +62,27 @@ def home():
 def train():
     try:
         logger.info("Training pipeline triggered via API...")
-        pipeline = TrainingPipeline()
-        artifact = pipeline.run_pipeline()
+        job = training_jobs.submit()
         return jsonify({
-            "status": "success",
-            "message": "Training pipeline completed successfully",
-            "model_path": artifact.trained_model_file_path
-        })
+            "status": "accepted",
+            "message": "Training pipeline started",
+            "job_id": job["job_id"],
+            "status_url": f"/train/{job['job_id']}"
+        }), 202
+    except TrainingInProgressError as e:
+        return jsonify({"error": str(e), "job_id": e.job_id}), 409
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
 
+@app.route("/train/<job_id>", methods=["GET"])
+def train_status(job_id):
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown training job {job_id}"}), 404
+    return jsonify(job)
+
+
 @app.route("/predict", methods=["POST"])
 def predict():
     try:
@@ -50,29 +91,84 @@ def predict():
         if not data:
             return jsonify({"error": "No input data provided"}), 400
 
-        # Load latest trained model
-        model_path = "artifacts/model/trained_model.pkl"
-        if not os.path.exists(model_path):
+        # Cached model, swapped in by the registry when a new one is trained
+        model = model_registry.get_model()
+        if model is None:
             return jsonify({"error": "Model not found. Train the model first using /train"}), 404
 
-        model: NetworkSecurityModel = joblib.load(model_path)
-
         # Convert input JSON to numpy array (expects flat feature list)
         input_array = np.array(data["features"]).reshape(1, -1)
+        drift_monitor.observe(input_array)
 
         # Predict
-        prediction = model.predict(input_array)
-        prediction_class = int(prediction[0])
+        if micro_batcher is not None:
+            prediction_class = int(micro_batcher.predict(input_array))
+        else:
+            prediction = model.predict(input_array)
+            prediction_class = int(prediction[0])
 
         return jsonify({
             "status": "success",
             "prediction": prediction_class
         })
 
+    except MicroBatcherUnavailableError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+@app.route("/predict_batch", methods=["POST"])
+def predict_batch():
+    try:
+        model = model_registry.get_model()
+        if model is None:
+            return jsonify({"error": "Model not found. Train the model first using /train"}), 404
+
+        n_features = getattr(model, "n_features", None)
+
+        if request.mimetype in NPY_CONTENT_TYPES:
+            # Compact binary body: one np.save'd 2-D array
+            matrix, valid_index, errors, n_rows = batch_from_npy(request.get_data(), n_features)
+        else:
+            data = request.get_json(silent=True)
+            if data is None:
+                return jsonify({"error": "No input data provided"}), 400
+            matrix, valid_index, errors, n_rows = batch_from_json(
+                data, n_features, getattr(model, "feature_names", None)
+            )
+
+        drift_monitor.observe(matrix)
+        return jsonify(score_batch(model, matrix, valid_index, n_rows, errors))
+
+    except BatchInputError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except RequestEntityTooLarge:
+        return jsonify({"error": f"Request body exceeds {PREDICTION_BATCH_MAX_BYTES} bytes"}), 413
+    except HTTPException:
+        # client errors raised by Flask itself keep their status code
+        raise
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
 
+@app.route("/model/status", methods=["GET"])
+def model_status():
+    return jsonify(model_registry.status())
+
+
+@app.route("/predict/metrics", methods=["GET"])
+def predict_metrics():
+    if micro_batcher is None:
+        return jsonify({"micro_batching": False})
+    return jsonify({"micro_batching": True, **micro_batcher.stats()})
+
+
+@app.route("/drift", methods=["GET"])
+def drift():
+    return jsonify(drift_monitor.report())
+
+
 # ---------- ENTRY ----------
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8080, debug=True)
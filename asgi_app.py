@@ -0,0 +1,240 @@
+import os
+import sys
+import json
+import asyncio
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Serving imports only, see app.py
+from networksecurity.pipeline.training_job import TrainingJobManager, TrainingInProgressError
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.registry import ModelRegistry
+from networksecurity.utils.ml_utils.model.batch_input import (
+    NPY_CONTENT_TYPES,
+    BatchInputError,
+    batch_from_npy,
+    batch_from_json,
+    score_batch
+)
+from networksecurity.utils.ml_utils.model.micro_batcher import MicroBatcher, MicroBatcherUnavailableError
+from networksecurity.utils.ml_utils.drift.monitor import DriftMonitor
+from networksecurity.constant.training_pipeline import (
+    PREDICTION_BATCH_MAX_BYTES,
+    INFERENCE_THREAD_POOL_SIZE,
+    INFERENCE_MAX_PENDING_REQUESTS
+)
+
+
+# Loaded at import so a pre-forking launcher shares the model pages with its workers
+model_registry = ModelRegistry()
+try:
+    model_registry.load()
+except Exception as e:
+    # a broken artifact must not stop the app: /predict answers 404 until a loadable model is published
+    logging.error(f"Starting without a model: {e}")
+
+training_jobs = TrainingJobManager()
+# CPU-bound decoding and scoring run on inference_pool, never on the event loop
+inference_pool = None
+pending_requests = None
+
+drift_monitor = DriftMonitor(model_registry.get_model)
+
+micro_batcher = None
+if os.getenv("MICRO_BATCHING_ENABLED", "false").lower() in ("1", "true", "yes"):
+    micro_batcher = MicroBatcher(model_registry.get_model)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Threads do not survive fork(), so they are started per worker process
+    global inference_pool, pending_requests
+    inference_pool = ThreadPoolExecutor(max_workers=INFERENCE_THREAD_POOL_SIZE, thread_name_prefix="inference")
+    pending_requests = asyncio.Semaphore(INFERENCE_MAX_PENDING_REQUESTS)
+    # the watcher thread loads new models: request handlers never load on the event loop
+    model_registry.start_watching()
+    drift_monitor.start()
+    if micro_batcher is not None:
+        micro_batcher.start()
+    logging.info(f"ASGI worker {os.getpid()} ready")
+    yield
+    model_registry.stop_watching()
+    drift_monitor.stop()
+    if micro_batcher is not None:
+        micro_batcher.stop()
+    inference_pool.shutdown(wait=False)
+
+
+app = FastAPI(title="NetworkSecurity", lifespan=lifespan)
+
+
+async def run_inference(func, *args):
+    """
+    Run a blocking scoring call on the bounded inference pool.
+    """
+    async with pending_requests:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(inference_pool, func, *args)
+
+
+def monitor_and_score(model, matrix, valid_index, n_rows, errors) -> dict:
+    # large batches are binned on the inference pool too, not on the event loop
+    drift_monitor.observe(matrix)
+    return score_batch(model, matrix, valid_index, n_rows, errors)
+
+
+def decode_and_score(model, body: bytes, content_type: str) -> dict:
+    # decoding a batch of up to PREDICTION_BATCH_MAX_BYTES is CPU work too: it runs on the pool
+    n_features = getattr(model, "n_features", None)
+    if content_type in NPY_CONTENT_TYPES:
+        matrix, valid_index, errors, n_rows = batch_from_npy(body, n_features)
+    else:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise BatchInputError("No input data provided")
+        matrix, valid_index, errors, n_rows = batch_from_json(
+            data, n_features, getattr(model, "feature_names", None)
+        )
+    return monitor_and_score(model, matrix, valid_index, n_rows, errors)
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """
+    The request body, read no further than max_bytes: a declared Content-Length over
+    the limit is refused before reading, a chunked upload once it passes the limit.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        if not content_length.isdigit():
+            raise BatchInputError("Invalid Content-Length")
+        if int(content_length) > max_bytes:
+            raise BatchInputError("Request body too large", status_code=413)
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise BatchInputError("Request body too large", status_code=413)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def model_not_found() -> JSONResponse:
+    return JSONResponse({"error": "Model not found. Train the model first using /train"}, status_code=404)
+
+
+# ---------- ROUTES ----------
+@app.get("/")
+async def home():
+    return RedirectResponse(url="/docs")
+
+
+@app.get("/train")
+async def train():
+    try:
+        logging.info("Training pipeline triggered via API...")
+        job = training_jobs.submit()
+        return JSONResponse({
+            "status": "accepted",
+            "message": "Training pipeline started",
+            "job_id": job["job_id"],
+            "status_url": f"/train/{job['job_id']}"
+        }, status_code=202)
+    except TrainingInProgressError as e:
+        return JSONResponse({"error": str(e), "job_id": e.job_id}, status_code=409)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+@app.get("/train/{job_id}")
+async def train_status(job_id: str):
+    job = training_jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": f"Unknown training job {job_id}"}, status_code=404)
+    return job
+
+
+@app.post("/predict")
+async def predict(request: Request):
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Body is not valid JSON"}, status_code=400)
+        if not data:
+            return JSONResponse({"error": "No input data provided"}, status_code=400)
+
+        model = model_registry.current_model
+        if model is None:
+            return model_not_found()
+
+        input_array = np.array(data["features"]).reshape(1, -1)
+        drift_monitor.observe(input_array)
+
+        if micro_batcher is not None:
+            # the batcher thread does the scoring; awaiting its future blocks no pool thread
+            future = micro_batcher.submit(input_array)
+            try:
+                prediction = await asyncio.wait_for(asyncio.wrap_future(future), micro_batcher.timeout)
+            except asyncio.TimeoutError:
+                raise micro_batcher.timed_out(future)
+            prediction_class = int(prediction)
+        else:
+            prediction = await run_inference(model.predict, input_array)
+            prediction_class = int(prediction[0])
+
+        return {"status": "success", "prediction": prediction_class}
+
+    except MicroBatcherUnavailableError as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+@app.post("/predict_batch")
+async def predict_batch(request: Request):
+    try:
+        model = model_registry.current_model
+        if model is None:
+            return model_not_found()
+
+        body = await read_body(request, PREDICTION_BATCH_MAX_BYTES)
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        return await run_inference(decode_and_score, model, body, content_type)
+
+    except BatchInputError as e:
+        return JSONResponse({"error": str(e)}, status_code=e.status_code)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+@app.get("/model/status")
+async def model_status():
+    return model_registry.status()
+
+
+@app.get("/predict/metrics")
+async def predict_metrics():
+    if micro_batcher is None:
+        return {"micro_batching": False}
+    return {"micro_batching": True, **micro_batcher.stats()}
+
+
+@app.get("/drift")
+async def drift():
+    return drift_monitor.report()
+
+
+# ---------- ENTRY ----------
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8080)
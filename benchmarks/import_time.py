@@ -0,0 +1,116 @@
+"""
+Import-time regression benchmark for the serving entry points.
+
+Imports each module in a fresh interpreter under `python -X importtime`,
+reports the total and the slowest imports, and fails when the time budget
+is exceeded or a training-only package leaks into the serving process:
+
+    python benchmarks/import_time.py                        # app and asgi_app
+    python benchmarks/import_time.py --module app --max-ms 800 --top 15
+
+Run it from the repository root (with no model artifact, the time is the
+import cost alone). Every module is imported --repeat times; the median run is reported.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# never needed to answer /predict with the compiled model
+TRAINING_ONLY_PACKAGES = ("sklearn", "xgboost", "scipy", "pandas", "pymongo", "joblib")
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    `-X importtime` lines -> [(module, depth, self_us, cumulative_us)] in output order
+    (an import is listed after everything it imported).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  self_us |  cumulative_us | <2 spaces per nesting level>module"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def importer_of(rows: list, index: int) -> str:
+    # walk up the parents (the next line one level up) until we leave the package
+    package = rows[index][0].split(".")[0]
+    depth = rows[index][1]
+    for name, row_depth, _, _ in rows[index + 1:]:
+        if row_depth < depth:
+            if name.split(".")[0] != package:
+                return name
+            depth = row_depth
+    return "<top level>"
+
+
+def profile_import(module: str) -> dict:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = parse_importtime(result.stderr)
+    total_us = sum(cumulative for _, depth, _, cumulative in rows if depth == 0)
+
+    leaked = {}
+    for index, (name, _, _, _) in enumerate(rows):
+        package = name.split(".")[0]
+        if package in TRAINING_ONLY_PACKAGES and package not in leaked:
+            leaked[package] = importer_of(rows, index)
+    return {"total_ms": total_us / 1000.0, "rows": rows, "leaked": leaked}
+
+
+def benchmark(module: str, repeat: int, top: int) -> dict:
+    runs = [profile_import(module) for _ in range(repeat)]
+    median = sorted(runs, key=lambda run: run["total_ms"])[len(runs) // 2]
+    slowest = sorted((row for row in median["rows"] if row[1] == 1), key=lambda row: row[3], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": round(median["total_ms"], 1),
+        "runs_ms": [round(run["total_ms"], 1) for run in runs],
+        "stdev_ms": round(statistics.pstdev(run["total_ms"] for run in runs), 1),
+        "slowest_imports_ms": {name: round(cumulative / 1000.0, 1) for name, _, _, cumulative in slowest},
+        "training_only_packages": median["leaked"]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time profile of the serving entry points")
+    parser.add_argument("--module", action="append", help="Module to import, repeat for several "
+                                                          "(default: app and asgi_app)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest direct imports to list")
+    parser.add_argument("--max-ms", type=float, help="Fail when a module takes longer than this to import")
+    parser.add_argument("--allow-training-imports", action="store_true",
+                        help="Do not fail when sklearn/xgboost/scipy/pandas/pymongo/joblib get imported")
+    parser.add_argument("--output", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results, failures = [], []
+    for module in args.module or ["app", "asgi_app"]:
+        result = benchmark(module, args.repeat, args.top)
+        results.append(result)
+        print(f"{module}: {result['total_ms']:.1f} ms (median of {args.repeat}, runs {result['runs_ms']})")
+        for name, ms in result["slowest_imports_ms"].items():
+            print(f"    {ms:9.1f} ms  {name}")
+        for package, importer in result["training_only_packages"].items():
+            print(f"    training-only package {package} imported by {importer}")
+        if args.max_ms is not None and result["total_ms"] > args.max_ms:
+            failures.append(f"{module} imports in {result['total_ms']:.1f} ms > {args.max_ms} ms")
+        if result["training_only_packages"] and not args.allow_training_imports:
+            failures.append(f"{module} imports {sorted(result['training_only_packages'])}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
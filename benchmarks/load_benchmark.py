@@ -0,0 +1,124 @@
+"""
+Closed-loop load benchmark for the /predict endpoints.
+
+Start the servers to compare, then point the benchmark at them, e.g.
+
+    python app.py                                   # Flask, port 8080
+    python serve.py --workers 4 --port 8081         # ASGI, pre-forked
+    python benchmarks/load_benchmark.py \
+        --target flask=http://localhost:8080 --target asgi=http://localhost:8081 \
+        --features 30 --concurrency 32 --requests 5000
+
+Each client thread keeps one HTTP/1.1 connection open and sends requests
+back to back; throughput and latency percentiles are reported per target.
+"""
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def make_payload(n_features: int, batch_rows: int) -> bytes:
+    rng = random.Random(42)
+    row = lambda: [rng.choice([-1, 0, 1]) for _ in range(n_features)]
+    if batch_rows > 1:
+        return json.dumps({"rows": [row() for _ in range(batch_rows)]}).encode()
+    return json.dumps({"features": row()}).encode()
+
+
+def run_client(url: str, path: str, payload: bytes, n_requests: int, latencies: list, errors: list,
+               lock: threading.Lock) -> None:
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+    local_latencies, local_errors = [], 0
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                local_errors += 1
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+        local_latencies.append(time.perf_counter() - start)
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def benchmark(name: str, url: str, path: str, payload: bytes, concurrency: int, total_requests: int,
+              batch_rows: int) -> dict:
+    latencies, errors, lock = [], [], threading.Lock()
+    per_client = max(1, total_requests // concurrency)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(run_client, url, path, payload, per_client, latencies, errors, lock)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    n = len(latencies)
+    return {
+        "target": name,
+        "requests": n,
+        "errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(n / elapsed, 1) if elapsed else 0.0,
+        "rows_per_sec": round(n * batch_rows / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(1000 * percentile(latencies, 50), 3),
+        "p95_ms": round(1000 * percentile(latencies, 95), 3),
+        "p99_ms": round(1000 * percentile(latencies, 99), 3)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput benchmark for the Flask and ASGI prediction servers")
+    parser.add_argument("--target", action="append", required=True,
+                        help="name=url of a running server, repeat to compare several")
+    parser.add_argument("--features", type=int, required=True, help="Number of raw features per row")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch-rows", type=int, default=1,
+                        help="Rows per request; >1 benchmarks /predict_batch instead of /predict")
+    parser.add_argument("--warmup", type=int, default=100, help="Requests sent before measuring")
+    parser.add_argument("--output", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    path = "/predict_batch" if args.batch_rows > 1 else "/predict"
+    payload = make_payload(args.features, args.batch_rows)
+
+    results = []
+    for target in args.target:
+        name, _, url = target.partition("=")
+        if not url:
+            name, url = target, target
+        benchmark(name, url, path, payload, min(args.concurrency, args.warmup), args.warmup, args.batch_rows)
+        results.append(benchmark(name, url, path, payload, args.concurrency, args.requests, args.batch_rows))
+
+    header = f"{'target':<12}{'req/s':>10}{'rows/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['target']:<12}{r['requests_per_sec']:>10}{r['rows_per_sec']:>12}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
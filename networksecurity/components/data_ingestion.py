@@ -1,16 +1,29 @@
 
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
-from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.logging.instrumentation import instrumented
 ##configuration of data ingestion
 from networksecurity.entity.config_entity import DataIngestionConfig
 from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
+from networksecurity.utils.main_utils.utils import (
+    read_yaml_file,
+    apply_schema_dtypes,
+    save_dataframe,
+    load_dataframe,
+    get_schema_dtypes,
+    documents_to_dataframe,
+    get_collection_as_dataframe
+)
 
 import os
 import sys
+import json
 import numpy as np
 import pandas as pd
 import pymongo
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
 from typing import List
 
 from sklearn.model_selection import train_test_split
@@ -23,39 +36,198 @@ class DataIngestion:
     def __init__(self,data_ingestion_config:DataIngestionConfig):
         try:
             self.data_ingestion_config=data_ingestion_config
+            self.schema=read_yaml_file(SCHEMA_FILE_PATH)
             
         except Exception as e:
             raise NetworkSecurityException (e,sys)
         
+    @instrumented
     def export_collection_as_dataframe(self):
         try:
             database_name=self.data_ingestion_config.database_name
             collection_name=self.data_ingestion_config.collection_name
             self.mongo_client=pymongo.MongoClient(MONGO_DB_URL)
-            collection=self.mongo_client[database_name][collection_name]
 
-            df=pd.DataFrame(list(collection.find()))
-            if "_id" in df.columns.to_list():
-                df=df.drop(columns=["_id"],axis=1)
-            
-            df.replace({"na":np.nan},inplace=True)
+            # projected, batched cursor straight into typed columns ("na" -> NaN, no _id)
+            df=get_collection_as_dataframe(
+                database_name,collection_name,self.mongo_client,
+                schema=self.schema,batch_size=self.data_ingestion_config.batch_size
+            )
             return df
 
         except Exception as e:
-            raise NetworkSecurityException
+            raise NetworkSecurityException(e,sys)
     
+    def get_collection(self):
+        if getattr(self,"mongo_client",None) is None:
+            self.mongo_client=pymongo.MongoClient(MONGO_DB_URL)
+        return self.mongo_client[self.data_ingestion_config.database_name][self.data_ingestion_config.collection_name]
+
+    def source_fingerprint(self)->dict:
+        """
+        Cheap summary of the collection state for stage caching: document count and newest _id.
+        In-place updates of existing documents do not change it.
+        """
+        try:
+            collection=self.get_collection()
+            newest=collection.find_one({},projection={"_id":1},sort=[("_id",pymongo.DESCENDING)])
+            return {
+                "database":self.data_ingestion_config.database_name,
+                "collection":self.data_ingestion_config.collection_name,
+                "documents":collection.estimated_document_count(),
+                "newest_id":str(newest["_id"]) if newest else None
+            }
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def read_watermark(self):
+        """Watermark of the last ingested change, None before the first incremental run"""
+        try:
+            watermark_file_path=self.data_ingestion_config.watermark_file_path
+            if not os.path.exists(watermark_file_path) or \
+                    not os.path.exists(self.data_ingestion_config.persistent_feature_store_file_path):
+                return None
+            with open(watermark_file_path,"r") as file:
+                watermark=json.load(file)
+            strategy=self.data_ingestion_config.watermark_strategy
+            required_key="resume_token" if strategy=="change_stream" else "last_timestamp"
+            if watermark.get("strategy")!=strategy or required_key not in watermark:
+                logging.info("Watermark missing or from another strategy, falling back to a full export")
+                return None
+            return watermark
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    def write_watermark(self,watermark:dict):
+        try:
+            watermark_file_path=self.data_ingestion_config.watermark_file_path
+            os.makedirs(os.path.dirname(watermark_file_path),exist_ok=True)
+            watermark["strategy"]=self.data_ingestion_config.watermark_strategy
+            watermark["updated_at"]=datetime.now(timezone.utc).isoformat()
+            tmp_path=watermark_file_path+".tmp"
+            with open(tmp_path,"w") as file:
+                json.dump(watermark,file,indent=2)
+            os.replace(tmp_path,watermark_file_path)
+            logging.info(f"Watermark saved: {watermark}")
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @staticmethod
+    def _object_id_watermark(dataframe:pd.DataFrame,previous:dict=None)->dict:
+        if len(dataframe)==0:
+            return dict(previous or {})
+        last_id=max(dataframe["_id"])
+        return {"last_id":str(last_id),"last_timestamp":last_id.generation_time.isoformat()}
+
+    @instrumented
+    def export_collection_delta(self,watermark:dict):
+        """
+        Pull only documents past the watermark.
+        Returns (delta dataframe with _id, deleted _ids, new watermark).
+        """
+        try:
+            config=self.data_ingestion_config
+            collection=self.get_collection()
+
+            if config.watermark_strategy=="change_stream":
+                dtypes={"_id":"object",**get_schema_dtypes(self.schema)}
+                documents,deleted_ids=[],[]
+                with collection.watch(full_document="updateLookup",resume_after=watermark["resume_token"],
+                                      batch_size=config.batch_size) as stream:
+                    while True:
+                        change=stream.try_next()
+                        if change is None:
+                            break
+                        operation=change["operationType"]
+                        if operation in ("insert","update","replace") and change.get("fullDocument"):
+                            documents.append(change["fullDocument"])
+                        elif operation=="delete":
+                            deleted_ids.append(str(change["documentKey"]["_id"]))
+                    resume_token=stream.resume_token
+                delta=documents_to_dataframe(documents,dtypes,config.batch_size)
+                return delta,deleted_ids,{"resume_token":resume_token}
+
+            # object_id: _id embeds its creation time; re-read a short lag window and let the merge dedupe
+            since=datetime.fromisoformat(watermark["last_timestamp"])-timedelta(seconds=config.watermark_lag_seconds)
+            delta=get_collection_as_dataframe(
+                config.database_name,config.collection_name,self.mongo_client,
+                schema=self.schema,batch_size=config.batch_size,
+                query={"_id":{"$gte":ObjectId.from_datetime(since)}},include_id=True
+            )
+            return delta,[],self._object_id_watermark(delta,watermark)
+
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @instrumented
+    def export_full_with_watermark(self):
+        """Full export that also records where the next incremental run starts"""
+        try:
+            config=self.data_ingestion_config
+            collection=self.get_collection()
+            if config.watermark_strategy=="change_stream":
+                # open the stream first so changes made during the export are replayed next time
+                with collection.watch(full_document="updateLookup") as stream:
+                    resume_token=stream.resume_token
+                    dataframe=get_collection_as_dataframe(
+                        config.database_name,config.collection_name,self.mongo_client,
+                        schema=self.schema,batch_size=config.batch_size,include_id=True
+                    )
+                return dataframe,{"resume_token":resume_token}
+
+            dataframe=get_collection_as_dataframe(
+                config.database_name,config.collection_name,self.mongo_client,
+                schema=self.schema,batch_size=config.batch_size,include_id=True
+            )
+            return dataframe,self._object_id_watermark(dataframe)
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @instrumented
+    def merge_into_feature_store(self,delta:pd.DataFrame,deleted_ids:List[str]=None,replace:bool=False):
+        """
+        Upsert the delta into the persistent feature store, keyed by the Mongo _id.
+        Returns the merged dataframe and the delta rows whose _id was not in the store yet.
+        """
+        try:
+            store_path=self.data_ingestion_config.persistent_feature_store_file_path
+            delta=delta.copy()
+            delta["_id"]=delta["_id"].astype(str)
+
+            if replace or not os.path.exists(store_path):
+                merged=delta
+                new_rows=delta
+            else:
+                store=load_dataframe(store_path,self.schema)
+                new_rows=delta[~delta["_id"].isin(store["_id"])]
+                if deleted_ids:
+                    store=store[~store["_id"].isin(deleted_ids)]
+                merged=pd.concat([store,delta],ignore_index=True)
+                merged=merged.drop_duplicates(subset="_id",keep="last").reset_index(drop=True)
+
+            merged=apply_schema_dtypes(merged,self.schema)
+            tmp_path=store_path+".tmp"+os.path.splitext(store_path)[1]
+            save_dataframe(tmp_path,merged)
+            os.replace(tmp_path,store_path)
+            logging.info(f"Feature store {store_path}: {len(delta)} rows merged, "
+                         f"{len(deleted_ids or [])} deleted, {len(merged)} total")
+            return merged,new_rows
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+    @instrumented
     def export_data_into_feature_store(self,dataframe:pd.DataFrame):
         try:
             feature_store_file_path=self.data_ingestion_config.feature_store_file_path
-            #creating folder
-            dir_path=os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path,exist_ok=True)
-            dataframe.to_csv(feature_store_file_path,index=False,header=True)
+            # typed once here, so downstream stages read columns without type inference
+            dataframe=apply_schema_dtypes(dataframe,self.schema)
+            save_dataframe(feature_store_file_path,dataframe)
             return dataframe
         
         except Exception as e:
             raise NetworkSecurityException(e,sys)
 
+    @instrumented
     def split_data_as_train_test(self,dataframe:pd.DataFrame):
         try:
             train_set,test_set=train_test_split(
@@ -65,30 +237,49 @@ class DataIngestion:
             logging.info(
                 "Excited split_data_as_train_test method of Data_ingestion class"
             )
-            dir_path=os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path,exist_ok=True)
             logging.info(f"Exporting train and test file path")
-            train_set.to_csv(
-                self.data_ingestion_config.training_file_path,index=False,header=True
-            )
-            test_set.to_csv(
-                self.data_ingestion_config.testing_file_path,index=False,header=True
-            )
+            save_dataframe(self.data_ingestion_config.training_file_path,train_set)
+            save_dataframe(self.data_ingestion_config.testing_file_path,test_set)
             logging.info(f"Exported train and test file path")
         
         except Exception as e:
             raise NetworkSecurityException(e,sys)
 
-    def initiate_data_ingestion(self):
+    def initiate_data_ingestion(self,full_refresh:bool=False):
         try:
-            dataframe=self.export_collection_as_dataframe()
+            config=self.data_ingestion_config
+            delta_file_path=None
+
+            if config.ingestion_mode!="incremental":
+                dataframe=self.export_collection_as_dataframe()
+            else:
+                watermark=None if full_refresh else self.read_watermark()
+                if watermark is None:
+                    logging.info("Full export, rebuilding the persistent feature store")
+                    export,new_watermark=self.export_full_with_watermark()
+                    merged,_=self.merge_into_feature_store(export,replace=True)
+                else:
+                    delta,deleted_ids,new_watermark=self.export_collection_delta(watermark)
+                    logging.info(f"Incremental export: {len(delta)} new/changed, {len(deleted_ids)} deleted documents")
+                    merged,new_rows=self.merge_into_feature_store(delta,deleted_ids)
+                    if config.watermark_strategy!="change_stream":
+                        # the object_id lag window re-reads documents already stored: only unseen _ids are new
+                        logging.info(f"{len(new_rows)} of the {len(delta)} exported documents are new")
+                        delta=new_rows
+                    delta_file_path=config.delta_file_path
+                    save_dataframe(delta_file_path,apply_schema_dtypes(delta.drop(columns=["_id"]),self.schema))
+                # store first, then watermark: a crash in between only replays the delta
+                self.write_watermark(new_watermark)
+                dataframe=merged.drop(columns=["_id"])
+
             dataframe=self.export_data_into_feature_store(dataframe)
             self.split_data_as_train_test(dataframe)
 
             dataingestionartifact=DataIngestionArtifact(trained_file_path=self.data_ingestion_config.training_file_path,
-                                                        test_file_path=self.data_ingestion_config.testing_file_path)
+                                                        test_file_path=self.data_ingestion_config.testing_file_path,
+                                                        delta_file_path=delta_file_path)
             return dataingestionartifact
         
 
         except Exception as e:
-            raise NetworkSecurityException
\ No newline at end of file
+            raise NetworkSecurityException(e,sys)
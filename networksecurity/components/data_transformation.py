@@ -15,7 +15,22 @@ from networksecurity.entity.artifact_entity import (
 from networksecurity.entity.config_entity import DataTransformationConfig
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
-from networksecurity.utils.main_utils.utils import save_numpy_array
+from networksecurity.logging.instrumentation import instrumented
+from networksecurity.utils.main_utils.utils import (
+    save_numpy_array,
+    save_feature_matrix,
+    compact_int_dtype,
+    get_schema_dtypes,
+    get_file_format,
+    apply_schema_dtypes,
+    iter_dataframe_chunks,
+    count_dataframe_rows,
+    load_dataframe
+)
+from networksecurity.utils.main_utils.streaming_preprocessor import StreamingPreprocessorFitter, transform_to_disk
+
+# ColumnTransformer.sparse_threshold per output format: the output is sparse when its density is below it
+SPARSE_THRESHOLDS = {"auto": 0.3, "sparse": 1.0, "dense": 0.0}
 
 class DataTransformation:
     def __init__(self,
@@ -53,22 +68,106 @@ class DataTransformation:
             preprocessor = ColumnTransformer([
                 ("num_pipeline", num_pipeline, numerical_columns),
                 ("cat_pipeline", cat_pipeline, categorical_columns)
-            ])
+            ], sparse_threshold=SPARSE_THRESHOLDS[self.data_transformation_config.output_format])
 
             return preprocessor
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def initiate_data_transformation(self, schema: dict) -> DataTransformationArtifact:
+    @instrumented
+    def fit_preprocessor(self, schema: dict) -> str:
         """
-        Performs data transformation and saves transformed arrays + preprocessing object
+        Fit the preprocessing object on the train split and save it; returns its path
         """
         try:
-            logging.info("🚀 Starting Data Transformation...")
+            preprocessor = self.get_data_transformer_object(schema)
+            train_file_path = self.data_ingestion_artifact.trained_file_path
+            target_column = schema["target_column"]
+            if self.data_transformation_config.fit_mode == "streaming":
+                fitter = StreamingPreprocessorFitter(preprocessor, self.data_transformation_config.median_sketch_accuracy)
+                preprocessor = fitter.fit(
+                    lambda: (chunk.drop(columns=[target_column]) for chunk in self.iter_chunks(train_file_path, schema))
+                )
+            else:
+                train_df = load_dataframe(train_file_path, schema)
+                preprocessor.fit(train_df.drop(columns=[target_column]))
+
+            preprocessor_file_path = self.data_transformation_config.transformed_object_file_path
+            os.makedirs(os.path.dirname(preprocessor_file_path), exist_ok=True)
+            joblib.dump(preprocessor, preprocessor_file_path)
+            logging.info(f"Preprocessing object saved at {preprocessor_file_path}")
+            return preprocessor_file_path
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
 
-            # Load train and test datasets
-            train_df = pd.read_csv(self.data_ingestion_artifact.training_file_path)
-            test_df = pd.read_csv(self.data_ingestion_artifact.testing_file_path)
+    def label_array(self, y: pd.Series, schema: dict) -> np.ndarray:
+        """
+        Target column as an array; int-typed targets shrink to the smallest integer dtype (int8 for -1/1).
+        """
+        y = np.asarray(y)
+        target_dtype = get_schema_dtypes(schema).get(schema["target_column"])
+        if not self.data_transformation_config.compact_labels or target_dtype != "int64" or y.dtype.kind not in "iuf":
+            return y
+        if y.dtype.kind == "f" and not (np.isfinite(y).all() and (y == np.round(y)).all()):
+            return y
+        return y.astype(compact_int_dtype(y))
+
+    def iter_chunks(self, file_path: str, schema: dict):
+        """
+        Stream a split in chunks of chunk_size rows, typed like load_dataframe would type it.
+        """
+        is_csv = get_file_format(file_path) == "csv"
+        for chunk in iter_dataframe_chunks(file_path, self.data_transformation_config.chunk_size):
+            yield apply_schema_dtypes(chunk, schema) if is_csv else chunk
+
+    @instrumented
+    def transform_split_streaming(self, schema: dict, preprocessor, file_path: str,
+                                  features_file_path: str, labels_file_path: str) -> str:
+        """
+        Transform one split chunk by chunk straight to disk; returns the features path written
+        """
+        config = self.data_transformation_config
+        target_column = schema["target_column"]
+        labels = []
+
+        def feature_chunks():
+            for chunk in self.iter_chunks(file_path, schema):
+                labels.append(chunk[target_column].to_numpy())
+                yield chunk.drop(columns=[target_column])
+
+        n_rows = count_dataframe_rows(file_path, config.chunk_size)
+        written = transform_to_disk(preprocessor, feature_chunks(), n_rows, features_file_path, config.feature_dtype)
+        save_numpy_array(labels_file_path, self.label_array(np.concatenate(labels), schema))
+        return written
+
+    @instrumented
+    def transform_data(self, schema: dict, preprocessor_file_path: str) -> DataTransformationArtifact:
+        """
+        Transform train and test with a fitted preprocessing object and save the arrays
+        """
+        try:
+            config = self.data_transformation_config
+            if config.fit_mode == "streaming":
+                preprocessor = joblib.load(preprocessor_file_path)
+                data_transformation_artifact = DataTransformationArtifact(
+                    transformed_train_features_file_path=self.transform_split_streaming(
+                        schema, preprocessor, self.data_ingestion_artifact.trained_file_path,
+                        config.transformed_train_features_file_path, config.transformed_train_labels_file_path
+                    ),
+                    transformed_train_labels_file_path=config.transformed_train_labels_file_path,
+                    transformed_test_features_file_path=self.transform_split_streaming(
+                        schema, preprocessor, self.data_ingestion_artifact.test_file_path,
+                        config.transformed_test_features_file_path, config.transformed_test_labels_file_path
+                    ),
+                    transformed_test_labels_file_path=config.transformed_test_labels_file_path,
+                    transformed_object_file_path=preprocessor_file_path
+                )
+                logging.info(f"Data Transformation Artifact: {data_transformation_artifact}")
+                return data_transformation_artifact
+
+            # Load train and test datasets (typed columnar artifacts load without re-parsing)
+            train_df = load_dataframe(self.data_ingestion_artifact.trained_file_path, schema)
+            test_df = load_dataframe(self.data_ingestion_artifact.test_file_path, schema)
 
             target_column = schema["target_column"]
 
@@ -79,38 +178,43 @@ class DataTransformation:
             X_test = test_df.drop(columns=[target_column])
             y_test = test_df[target_column]
 
-            # Get preprocessing object
-            preprocessor = self.get_data_transformer_object(schema)
-
-            # Fit on train, transform both train & test
-            X_train_transformed = preprocessor.fit_transform(X_train)
+            preprocessor = joblib.load(preprocessor_file_path)
+            X_train_transformed = preprocessor.transform(X_train)
             X_test_transformed = preprocessor.transform(X_test)
 
-            # Concatenate with target
-            train_arr = np.c_[X_train_transformed, np.array(y_train)]
-            test_arr = np.c_[X_test_transformed, np.array(y_test)]
-
-            # Save transformed arrays
-            save_numpy_array(self.data_transformation_config.transformed_train_file_path, train_arr)
-            save_numpy_array(self.data_transformation_config.transformed_test_file_path, test_arr)
-
-            # Save preprocessing object
-            joblib.dump(preprocessor, self.data_transformation_config.transformed_object_file_path)
-            logging.info(f"Preprocessing object saved at {self.data_transformation_config.transformed_object_file_path}")
+            # Save features and labels separately: float32 features, dense (memory-mappable .npy)
+            # or CSR (.npz) as the preprocessor produced them, never densified or stacked with y
+            train_features_file_path = save_feature_matrix(
+                config.transformed_train_features_file_path, X_train_transformed, config.feature_dtype
+            )
+            test_features_file_path = save_feature_matrix(
+                config.transformed_test_features_file_path, X_test_transformed, config.feature_dtype
+            )
+            save_numpy_array(config.transformed_train_labels_file_path, self.label_array(y_train, schema))
+            save_numpy_array(config.transformed_test_labels_file_path, self.label_array(y_test, schema))
 
             # Return artifact
             data_transformation_artifact = DataTransformationArtifact(
-                transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
-                transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
-                transformed_object_file_path=self.data_transformation_config.transformed_object_file_path
+                transformed_train_features_file_path=train_features_file_path,
+                transformed_train_labels_file_path=config.transformed_train_labels_file_path,
+                transformed_test_features_file_path=test_features_file_path,
+                transformed_test_labels_file_path=config.transformed_test_labels_file_path,
+                transformed_object_file_path=preprocessor_file_path
             )
 
             logging.info(f"Data Transformation Artifact: {data_transformation_artifact}")
             return data_transformation_artifact
-        
-        
 
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-
+    def initiate_data_transformation(self, schema: dict) -> DataTransformationArtifact:
+        """
+        Performs data transformation and saves transformed arrays + preprocessing object
+        """
+        try:
+            logging.info("🚀 Starting Data Transformation...")
+            preprocessor_file_path = self.fit_preprocessor(schema)
+            return self.transform_data(schema, preprocessor_file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
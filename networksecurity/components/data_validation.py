@@ -2,10 +2,19 @@ from networksecurity.entity.artifact_entity import DataIngestionArtifact, DataVa
 from networksecurity.entity.config_entity import DataValidationConfig
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
+from networksecurity.logging.instrumentation import instrumented
 from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
 from networksecurity.utils.main_utils import read_yaml_file
-from scipy.stats import ks_2samp
-import pandas as pd
+from networksecurity.utils.main_utils.utils import get_schema_dtypes, iter_dataframe_chunks
+from networksecurity.utils.main_utils.validation_engine import ValidationEngine, NUMERIC_DTYPES
+from networksecurity.utils.ml_utils.drift.sketch import (
+    QuantileSketch,
+    drift_report,
+    load_drift_reference,
+    save_drift_reference,
+    sketch_chunks
+)
+from typing import Dict
 import os, sys
 import yaml
 
@@ -17,6 +26,7 @@ class DataValidation:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
             self.schema = self.read_schema(SCHEMA_FILE_PATH)
+            self.validation_engine = ValidationEngine(self.schema)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
@@ -30,93 +40,114 @@ class DataValidation:
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def validate_columns(self, df: pd.DataFrame) -> bool:
-        """Check if all required columns are present in dataset"""
+    @instrumented
+    def validate_file(self, file_path: str) -> dict:
+        """Stream one split through the validation engine; returns its report"""
         try:
-            required_columns = [col["name"] for col in self.schema["columns"]]
-            df_columns = df.columns.tolist()
-
-            missing_cols = [col for col in required_columns if col not in df_columns]
-            if missing_cols:
-                logging.error(f"Missing columns: {missing_cols}")
-                return False
+            report = self.validation_engine.validate_file(file_path, self.data_validation_config.chunk_size)
+            for rule in report.failed_rules:
+                logging.error(f"Validation failed for {file_path}: {rule}")
+            return report.to_dict()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
 
-            logging.info("All required columns are present.")
-            return True
+    @instrumented
+    def build_drift_sketches(self, file_path: str) -> Dict[str, QuantileSketch]:
+        """Stream a split once and sketch every numeric schema column"""
+        try:
+            config = self.data_validation_config
+            columns = [name for name, dtype in get_schema_dtypes(self.schema).items() if dtype in NUMERIC_DTYPES]
+            return sketch_chunks(iter_dataframe_chunks(file_path, config.chunk_size), columns,
+                                 config.drift_sketch_accuracy)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def validate_domain_values(self, df: pd.DataFrame) -> bool:
-        """Check if domain values are within allowed set"""
+    @instrumented
+    def detect_data_drift(self, reference: Dict[str, QuantileSketch],
+                          current: Dict[str, QuantileSketch]) -> dict:
+        """Check drift (KS, PSI, Jensen-Shannon) from the column sketches"""
         try:
-            if "domain_values" not in self.schema:
-                return True
+            config = self.data_validation_config
+            return drift_report(reference, current, config.drift_psi_bins, config.drift_p_value_threshold)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
 
-            for col, allowed_values in self.schema["domain_values"].items():
-                if col in df.columns:
-                    invalid = df[~df[col].isin(allowed_values)]
-                    if not invalid.empty:
-                        logging.error(f"Invalid values found in column {col}")
-                        return False
-            logging.info(" Domain values validated.")
-            return True
+    def _save_drift_report(self, report: dict) -> str:
+        drift_report_file = self.data_validation_config.drift_report_file_path
+        os.makedirs(os.path.dirname(drift_report_file), exist_ok=True)
+        with open(drift_report_file, "w") as f:
+            yaml.dump(report, f)
+        drifted = [name for name, result in report.items() if result["drift_detected"]]
+        logging.info(f" Drift report saved at: {drift_report_file} ({len(drifted)} drifted columns)")
+        return drift_report_file
+
+    @instrumented
+    def generate_drift_report(self) -> str:
+        """
+        Sketch train and test, save the train sketches as the drift reference,
+        compare the two and save the report; returns the report path.
+        """
+        try:
+            config = self.data_validation_config
+            train_file_path = self.data_ingestion_artifact.trained_file_path
+            reference = self.build_drift_sketches(train_file_path)
+            save_drift_reference(config.drift_reference_file_path, reference, source=train_file_path)
+            current = self.build_drift_sketches(self.data_ingestion_artifact.test_file_path)
+            return self._save_drift_report(self.detect_data_drift(reference, current))
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def detect_data_drift(self, base_df: pd.DataFrame, current_df: pd.DataFrame) -> dict:
-        """Check drift using KS-test"""
+    @instrumented
+    def check_drift_against_reference(self, file_path: str, reference_file_path: str = None) -> dict:
+        """
+        Compare a new file with a saved drift reference; the reference data
+        itself is never reloaded. Saves and returns the report.
+        """
         try:
-            drift_report = {}
-            for col in base_df.columns:
-                if col in current_df.columns and pd.api.types.is_numeric_dtype(base_df[col]):
-                    d1 = base_df[col].dropna()
-                    d2 = current_df[col].dropna()
-                    if len(d1) > 0 and len(d2) > 0:
-                        stat, pvalue = ks_2samp(d1, d2)
-                        drift_report[col] = {
-                            "p_value": float(pvalue),
-                            "drift_detected": bool(pvalue < 0.05)
-                        }
-            return drift_report
+            reference = load_drift_reference(reference_file_path or self.data_validation_config.drift_reference_file_path)
+            report = self.detect_data_drift(reference, self.build_drift_sketches(file_path))
+            self._save_drift_report(report)
+            return report
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def initiate_data_validation(self) -> DataValidationArtifact:
-        """Main method to perform validation"""
+    def initiate_data_validation(self, detect_drift: bool = True) -> DataValidationArtifact:
+        """
+        Main method to perform validation.
+        With detect_drift=False only the schema checks run; the pipeline DAG
+        calls generate_drift_report() as a separate, concurrent node.
+        """
         try:
             logging.info("🚀 Starting Data Validation...")
 
-            # Load datasets
-            train_df = pd.read_csv(self.data_ingestion_artifact.training_file_path)
-            test_df = pd.read_csv(self.data_ingestion_artifact.testing_file_path)
-
-            # Step 1: Validate schema
-            status_train = self.validate_columns(train_df)
-            status_test = self.validate_columns(test_df)
-
-            # Step 2: Validate domain values
-            domain_status_train = self.validate_domain_values(train_df)
-            domain_status_test = self.validate_domain_values(test_df)
-
-            # Step 3: Drift detection
-            drift_report = self.detect_data_drift(train_df, test_df)
+            # Step 1: presence, dtype, domain, range and null rules, one streamed pass per split
+            train_report = self.validate_file(self.data_ingestion_artifact.trained_file_path)
+            test_report = self.validate_file(self.data_ingestion_artifact.test_file_path)
+            status_train = train_report["passed"]
+            status_test = test_report["passed"]
 
-            # Save drift report
-            drift_report_file = self.data_validation_config.drift_report_file_path
-            os.makedirs(os.path.dirname(drift_report_file), exist_ok=True)
-            with open(drift_report_file, "w") as f:
-                yaml.dump(drift_report, f)
+            validation_report_file = self.data_validation_config.validation_report_file_path
+            os.makedirs(os.path.dirname(validation_report_file), exist_ok=True)
+            with open(validation_report_file, "w") as f:
+                yaml.safe_dump({"train": train_report, "test": test_report}, f, sort_keys=False)
+            logging.info(f" Validation report saved at: {validation_report_file}")
 
-            logging.info(f" Drift report saved at: {drift_report_file}")
+            # Step 2: Drift detection
+            if detect_drift:
+                drift_report_file = self.generate_drift_report()
+            else:
+                drift_report_file = self.data_validation_config.drift_report_file_path
 
             # Create artifact
             data_validation_artifact = DataValidationArtifact(
-                validation_status=status_train and status_test and domain_status_train and domain_status_test,
-                valid_train_file_path=self.data_ingestion_artifact.training_file_path if status_train else None,
-                valid_test_file_path=self.data_ingestion_artifact.testing_file_path if status_test else None,
-                invalid_train_file_path=None if status_train else self.data_ingestion_artifact.training_file_path,
-                invalid_test_file_path=None if status_test else self.data_ingestion_artifact.testing_file_path,
-                drift_report_file_path=drift_report_file
+                validation_status=status_train and status_test,
+                valid_train_file_path=self.data_ingestion_artifact.trained_file_path if status_train else None,
+                valid_test_file_path=self.data_ingestion_artifact.test_file_path if status_test else None,
+                invalid_train_file_path=None if status_train else self.data_ingestion_artifact.trained_file_path,
+                invalid_test_file_path=None if status_test else self.data_ingestion_artifact.test_file_path,
+                drift_report_file_path=drift_report_file,
+                validation_report_file_path=validation_report_file,
+                drift_reference_file_path=self.data_validation_config.drift_reference_file_path
             )
 
             logging.info(f"Data Validation Artifact: {data_validation_artifact}")
@@ -1,135 +1,270 @@
 import sys, os
+import glob
+import json
+import time
 import joblib
+import numpy as np
+from scipy import sparse
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from xgboost import XGBClassifier
-from sklearn.model_selection import GridSearchCV
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
-from networksecurity.components.logger.logging import logging
-from networksecurity.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.logging.instrumentation import instrumented
+from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.entity.artifact_entity import (
+    DataIngestionArtifact,
     DataTransformationArtifact,
     ModelTrainerArtifact
 )
 from networksecurity.entity.config_entity import ModelTrainerConfig
-from networksecurity.utils.ml_utils.metric.classification_metric import ClassificationMetric
+from networksecurity.utils.main_utils.utils import load_numpy_array, load_feature_matrix, load_dataframe
+from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
 from networksecurity.utils.ml_utils.model.estimator import NetworkSecurityModel
+from networksecurity.utils.ml_utils.model.search import HyperparameterSearch, score_on_all_rows
+from networksecurity.utils.ml_utils.model.fit_cache import FitCache
+from networksecurity.utils.ml_utils.model.export import export_for_serving
+from networksecurity.utils.ml_utils.model.incremental import (
+    continue_training,
+    drift_guard,
+    merge_drift_reference,
+    supports_incremental
+)
+
+
+def matrix_bytes(matrix) -> int:
+    if sparse.issparse(matrix):
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return matrix.nbytes
 
 
 class ModelTrainer:
     def __init__(self,
                  data_transformation_artifact: DataTransformationArtifact,
-                 model_trainer_config: ModelTrainerConfig = ModelTrainerConfig()):
+                 model_trainer_config: ModelTrainerConfig):
         try:
             logging.info("Model Trainer initialization started.")
             self.data_transformation_artifact = data_transformation_artifact
             self.model_trainer_config = model_trainer_config
-            self.metric = ClassificationMetric()
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def _tune_and_evaluate(self, model, param_grid, X_train, y_train, X_test, y_test, model_name: str):
-        """Helper function: Hyperparameter tuning + evaluation"""
+    @staticmethod
+    def get_candidate_models() -> list:
+        """Candidate model families with their parameter grids"""
+        return [
+            {
+                "model": RandomForestClassifier(random_state=42),
+                "param_grid": {
+                    "n_estimators": [50, 100, 200],
+                    "max_depth": [5, 10, None],
+                    "min_samples_split": [2, 5, 10]
+                },
+                "name": "RandomForest"
+            },
+            {
+                "model": LogisticRegression(max_iter=500, solver="saga"),
+                "param_grid": {
+                    "C": [0.1, 1, 10],
+                    "penalty": ["l1", "l2"]
+                },
+                "name": "LogisticRegression"
+            },
+            {
+                "model": XGBClassifier(eval_metric="logloss"),
+                "param_grid": {
+                    "n_estimators": [50, 100, 200],
+                    "max_depth": [3, 6, 10],
+                    "learning_rate": [0.01, 0.1, 0.2]
+                },
+                "name": "XGBoost"
+            }
+        ]
+
+    @instrumented
+    def _search(self, X_train, y_train, families: list = None, n_jobs: int = None) -> HyperparameterSearch:
+        """Hyperparameter search over the given candidate families (default: all) at once"""
         try:
-            logging.info(f"Running GridSearchCV for {model_name}...")
-            grid = GridSearchCV(model, param_grid, cv=3, n_jobs=-1, verbose=1, scoring="accuracy")
-            grid.fit(X_train, y_train)
+            config = self.model_trainer_config
+            cache = FitCache(config.fit_cache_dir, config.fit_cache_max_bytes) if config.fit_cache_dir else None
+            search = HyperparameterSearch(
+                families or self.get_candidate_models(),
+                strategy=config.search_strategy,
+                scoring=config.search_scoring,
+                cv=config.search_cv_folds,
+                factor=config.halving_factor,
+                n_jobs=n_jobs or config.search_n_jobs,
+                time_budget_seconds=config.search_time_budget_seconds,
+                cache=cache
+            )
+            return search.fit(X_train, y_train)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
 
-            best_model = grid.best_estimator_
-            logging.info(f"{model_name} Best Params: {grid.best_params_}")
+    @instrumented
+    def load_arrays(self):
+        """Transformed train/test arrays, labels encoded as 0..k-1, plus the original classes"""
+        try:
+            logging.info("Loading transformed train/test arrays.")
+            start = time.perf_counter()
+            artifact = self.data_transformation_artifact
+            # dense features are read-only memory maps: no copy at load time, and search workers
+            # in other processes share the same page-cache pages instead of each holding a copy;
+            # sparse features load as CSR and are handed to the estimators as is
+            X_train = load_feature_matrix(artifact.transformed_train_features_file_path, mmap_mode="r")
+            X_test = load_feature_matrix(artifact.transformed_test_features_file_path, mmap_mode="r")
+            y_train = load_numpy_array(artifact.transformed_train_labels_file_path)
+            y_test = load_numpy_array(artifact.transformed_test_labels_file_path)
 
-            # Predictions
-            y_train_pred = best_model.predict(X_train)
-            y_test_pred = best_model.predict(X_test)
+            # XGBoost needs labels 0..k-1; the saved model maps predictions back
+            y_train_raw_dtype = y_train.dtype
+            classes, y_train = np.unique(y_train, return_inverse=True)
+            y_test = np.searchsorted(classes, y_test)
 
-            # Metrics
-            train_metric = self.metric.calculate_metrics(y_train, y_train_pred)
-            test_metric = self.metric.calculate_metrics(y_test, y_test_pred)
+            is_sparse = sparse.issparse(X_train)
+            self.data_load_report = {
+                "mmap": not is_sparse,
+                "sparse": is_sparse,
+                "density": round(X_train.nnz / max(1, X_train.shape[0] * X_train.shape[1]), 6) if is_sparse else 1.0,
+                "feature_dtype": str(X_train.dtype),
+                "label_dtype": str(y_train_raw_dtype),
+                "train_shape": list(X_train.shape),
+                "test_shape": list(X_test.shape),
+                "feature_bytes": int(matrix_bytes(X_train) + matrix_bytes(X_test)),
+                "load_seconds": round(time.perf_counter() - start, 6)
+            }
+            return X_train, y_train, X_test, y_test, classes
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
 
-            logging.info(f"{model_name} Train Metrics: {train_metric}")
-            logging.info(f"{model_name} Test Metrics: {test_metric}")
+    @staticmethod
+    def _search_result(search: HyperparameterSearch) -> dict:
+        return {
+            "family": search.best_family_,
+            "best_params": search.best_params_,
+            "best_cv_score": search.best_score_,
+            "search_seconds": search.search_seconds_,
+            "cached_cells": search.cached_cells_,
+            "best_n_samples": search.best_n_samples_,
+            "n_samples": search.n_samples_,
+            "rungs": search.history_,
+            "estimator": search.best_estimator_
+        }
 
-            return {
-                "model_name": model_name,
-                "model": best_model,
-                "train_metric": train_metric,
-                "test_metric": test_metric
-            }
+    @instrumented
+    def search_family(self, family_name: str = None, n_jobs: int = None) -> dict:
+        """
+        Search a single candidate family (None: all of them at once); the pipeline DAG runs
+        one of these per family. The refitted winner is saved next to the model, so the
+        result is plain JSON and the stage cache can reuse it.
+        """
+        try:
+            families = [family for family in self.get_candidate_models()
+                        if family_name is None or family["name"] == family_name]
+            if not families:
+                raise ValueError(f"Unknown model family {family_name}")
+            X_train, y_train, _, _, _ = self.load_arrays()
+            result = self._search_result(self._search(X_train, y_train, families, n_jobs))
 
+            estimator_file_path = os.path.join(self.model_trainer_config.model_trainer_dir, "search",
+                                               f"{family_name or 'all'}.pkl")
+            os.makedirs(os.path.dirname(estimator_file_path), exist_ok=True)
+            joblib.dump(result.pop("estimator"), estimator_file_path)
+            result["estimator_file_path"] = estimator_file_path
+            return result
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+    def compare_on_all_rows(self, search_results: list, X_train, y_train) -> list:
+        """
+        With a time budget, a search can stop before its last rung, and a score on a
+        subsample is not comparable to one on all rows. Such results are re-scored with
+        the full-data folds of the last rung before the families are compared.
+        """
+        config = self.model_trainer_config
+        if all(result["best_n_samples"] == result["n_samples"] for result in search_results):
+            return search_results
+        compared = []
+        for result in search_results:
+            if result["best_n_samples"] < result["n_samples"]:
+                score = score_on_all_rows(self.search_estimator(result), X_train, y_train,
+                                          scoring=config.search_scoring, cv=config.search_cv_folds)
+                logging.info(f"{result['family']} scored {result['best_cv_score']:.4f} on "
+                             f"{result['best_n_samples']} rows only, {score:.4f} on all rows")
+                result = {**result, "subsample_cv_score": result["best_cv_score"], "best_cv_score": score,
+                          "best_n_samples": result["n_samples"]}
+            compared.append(result)
+        return compared
+
+    @staticmethod
+    def search_estimator(result: dict):
+        if "estimator" in result:
+            return result["estimator"]
+        return joblib.load(result["estimator_file_path"])
+
+    @staticmethod
+    def load_drift_reference(drift_reference_file_path: str = None) -> dict:
+        """Training sketches per column, shipped inside the model for the serving drift monitor"""
+        if not drift_reference_file_path or not os.path.exists(drift_reference_file_path):
+            logging.warning("No drift reference found, the model will be served without drift monitoring")
+            return None
+        with open(drift_reference_file_path, "r") as file:
+            return json.load(file)["columns"]
+
+    @instrumented
+    def save_best_model(self, search_results: list, drift_reference_file_path: str = None) -> ModelTrainerArtifact:
+        """Pick the best search result by CV score, evaluate it and save the serving model"""
         try:
-            logging.info("Loading transformed train/test arrays.")
-            train_arr = joblib.load(self.data_transformation_artifact.transformed_train_file_path)
-            test_arr = joblib.load(self.data_transformation_artifact.transformed_test_file_path)
-
-            X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
-            X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
-
-            # Candidate models with parameter grids
-            candidate_models = [
-                {
-                    "model": RandomForestClassifier(random_state=42),
-                    "param_grid": {
-                        "n_estimators": [50, 100, 200],
-                        "max_depth": [5, 10, None],
-                        "min_samples_split": [2, 5, 10]
-                    },
-                    "name": "RandomForest"
-                },
-                {
-                    "model": LogisticRegression(max_iter=500, solver="saga"),
-                    "param_grid": {
-                        "C": [0.1, 1, 10],
-                        "penalty": ["l1", "l2"]
-                    },
-                    "name": "LogisticRegression"
-                },
-                {
-                    "model": XGBClassifier(use_label_encoder=False, eval_metric="logloss"),
-                    "param_grid": {
-                        "n_estimators": [50, 100, 200],
-                        "max_depth": [3, 6, 10],
-                        "learning_rate": [0.01, 0.1, 0.2]
-                    },
-                    "name": "XGBoost"
-                }
-            ]
-
-            results = []
-            for candidate in candidate_models:
-                res = self._tune_and_evaluate(
-                    candidate["model"],
-                    candidate["param_grid"],
-                    X_train, y_train,
-                    X_test, y_test,
-                    candidate["name"]
-                )
-                results.append(res)
+            X_train, y_train, X_test, y_test, classes = self.load_arrays()
+            search_results = self.compare_on_all_rows(search_results, X_train, y_train)
+            best = max(search_results, key=lambda result: result["best_cv_score"])
+            best_model = self.search_estimator(best)
 
-            # Select best model (based on test f1_score or accuracy)
-            best_result = max(results, key=lambda x: x["test_metric"].f1_score)
+            train_metric = get_classification_score(y_train, best_model.predict(X_train))
+            test_metric = get_classification_score(y_test, best_model.predict(X_test))
+            logging.info(f"{best['family']} Train Metrics: {train_metric}")
+            logging.info(f"{best['family']} Test Metrics: {test_metric}")
 
-            logging.info(f"Best Model Selected: {best_result['model_name']} with F1 Score: {best_result['test_metric'].f1_score}")
+            logging.info(f"Best Model Selected: {best['family']} {best['best_params']} "
+                         f"with F1 Score: {test_metric.f1_score}")
 
             # Save final model
             model_dir = self.model_trainer_config.trained_model_file_path
             os.makedirs(os.path.dirname(model_dir), exist_ok=True)
 
             final_model = NetworkSecurityModel(
-                model=best_result["model"],
-                preprocessor_path=self.data_transformation_artifact.preprocessed_object_file_path
+                model=best_model,
+                preprocessor_path=self.data_transformation_artifact.transformed_object_file_path,
+                classes=classes,
+                drift_reference=self.load_drift_reference(drift_reference_file_path)
             )
 
             joblib.dump(final_model, model_dir)
             logging.info(f"Final best model saved at {model_dir}")
 
+            compiled_report = self.export_compiled_model(final_model, X_test)
+
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path=model_dir,
-                train_metric=best_result["train_metric"],
-                test_metric=best_result["test_metric"]
+                train_metric=train_metric,
+                test_metric=test_metric,
+                search_report={
+                    "strategy": self.model_trainer_config.search_strategy,
+                    "best_family": best["family"],
+                    "best_params": best["best_params"],
+                    "best_cv_score": best["best_cv_score"],
+                    "searches": [
+                        {key: value for key, value in result.items() if key != "estimator"}
+                        for result in search_results
+                    ]
+                },
+                compiled_model_file_path=compiled_report.get("compiled_model_file_path"),
+                compiled_model_report=compiled_report,
+                data_load_report={**self.data_load_report, **self.peak_rss()}
             )
 
             logging.info("Model Trainer pipeline completed successfully ✅")
@@ -137,3 +272,165 @@ class ModelTrainer:
 
         except Exception as e:
             raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def peak_rss() -> dict:
+        """Peak resident memory of this process and of its finished children (e.g. search workers), in MB"""
+        if resource is None:
+            return {}
+        # ru_maxrss is in KB on Linux (bytes on macOS)
+        unit = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit, 1),
+            "peak_rss_children_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit, 1)
+        }
+
+    @instrumented
+    def export_compiled_model(self, final_model: NetworkSecurityModel, X_test) -> dict:
+        """
+        Export the NumPy-only serving form of the final model, checked against it on the test split.
+        The pickle stays the reference: a model that cannot be compiled exactly is only logged.
+        """
+        try:
+            return export_for_serving(final_model, self.model_trainer_config.compiled_model_file_path, X_test)
+        except Exception as e:
+            logging.warning(f"Compiled serving model not exported, serve the pickle instead: {e}")
+            return {"error": str(e)}
+
+    def find_base_model(self) -> str:
+        """The configured base model, else the newest model.pkl of an earlier run (None if there is none)"""
+        config = self.model_trainer_config
+        if config.base_model_file_path:
+            return config.base_model_file_path if os.path.exists(config.base_model_file_path) else None
+        run_dir = os.path.dirname(config.model_trainer_dir)
+        pattern = os.path.join(os.path.dirname(run_dir), "*", os.path.basename(config.model_trainer_dir),
+                               os.path.basename(config.trained_model_file_path))
+        # run directories are named %m_%d_%Y_..., which does not sort by time: use the file times
+        models = [path for path in glob.glob(pattern) if not path.startswith(run_dir + os.sep)]
+        return max(models, key=os.path.getmtime) if models else None
+
+    def save_incremental_report(self, report: dict) -> None:
+        file_path = self.model_trainer_config.incremental_report_file_path
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as file:
+            json.dump(report, file, indent=2, default=str)
+
+    @instrumented
+    def initiate_incremental_training(self, data_ingestion_artifact: DataIngestionArtifact,
+                                      schema: dict) -> ModelTrainerArtifact:
+        """
+        Continue the newest earlier model on the rows ingested since (the ingestion
+        delta) instead of searching from scratch, with its preprocessor unchanged.
+        Returns None when a full retrain is needed instead; the reason is logged
+        and written to the incremental report either way.
+        """
+        try:
+            config = self.model_trainer_config
+            start = time.perf_counter()
+            base_model_file_path = self.find_base_model()
+            report = {"base_model_file_path": base_model_file_path,
+                      "delta_file_path": data_ingestion_artifact.delta_file_path}
+
+            def full_retrain(reason: str):
+                report.update(mode="full", reason=reason)
+                self.save_incremental_report(report)
+                logging.info(f"Incremental update not possible, full retrain: {reason}")
+                return None
+
+            if base_model_file_path is None:
+                return full_retrain("no model from an earlier run")
+            if not data_ingestion_artifact.delta_file_path:
+                return full_retrain("no ingestion delta, the data was ingested in full")
+            base_model = joblib.load(base_model_file_path)
+            updates = getattr(base_model, "incremental_updates", 0)
+            if not supports_incremental(base_model.model):
+                return full_retrain(f"{type(base_model.model).__name__} cannot be trained incrementally")
+            if updates >= config.incremental_max_updates:
+                return full_retrain(f"{updates} incremental updates since the last full retrain")
+
+            target_column = schema["target_column"]
+            delta = load_dataframe(data_ingestion_artifact.delta_file_path, schema)
+            X_delta, y_delta = delta.drop(columns=[target_column]), delta[target_column].to_numpy()
+            classes = base_model.classes if base_model.classes is not None else base_model.model.classes_
+            report["delta_rows"] = len(delta)
+            unknown = np.setdiff1d(y_delta, classes)
+            if unknown.size:
+                return full_retrain(f"new classes {unknown.tolist()}")
+
+            if os.path.getmtime(data_ingestion_artifact.delta_file_path) <= os.path.getmtime(base_model_file_path):
+                # a reused ingestion artifact: the previous model was trained after this delta was written
+                report.update(mode="unchanged", reason="the delta is older than the previous model, "
+                                                       "previous model kept")
+                final_model = base_model
+            elif len(delta) < config.incremental_min_rows:
+                report.update(mode="unchanged", reason=f"only {len(delta)} new rows "
+                                                       f"(< {config.incremental_min_rows}), previous model kept")
+                final_model = base_model
+            else:
+                if not base_model.drift_reference:
+                    return full_retrain("the previous model has no drift reference to check the new rows against")
+                drift = drift_guard(base_model.drift_reference, X_delta,
+                                    config.incremental_drift_psi_threshold, config.incremental_max_drifted_share)
+                report["drift"] = drift
+                if drift["exceeded"]:
+                    return full_retrain(f"{len(drift['drifted_columns'])} of {drift['columns']} columns drifted "
+                                        f"(PSI > {config.incremental_drift_psi_threshold})")
+                y_encoded = np.searchsorted(classes, y_delta)
+                if np.unique(y_encoded).size < len(classes):
+                    return full_retrain("the new rows do not hold every class")
+
+                model, update = continue_training(
+                    base_model.model, base_model.transform(X_delta), y_encoded, np.arange(len(classes)),
+                    xgb_rounds=config.incremental_xgb_rounds,
+                    forest_trees=config.incremental_forest_trees,
+                    sgd_epochs=config.incremental_sgd_epochs,
+                    sgd_learning_rate=config.incremental_sgd_learning_rate
+                )
+                final_model = NetworkSecurityModel(
+                    model=model,
+                    preprocessor=base_model.preprocessor,
+                    classes=base_model.classes,
+                    drift_reference=merge_drift_reference(base_model.drift_reference, X_delta),
+                    incremental_updates=updates + 1
+                )
+                report.update(mode="incremental", update=update)
+
+            # evaluated like a full retrain: on encoded labels, the test split of this run
+            test_df = load_dataframe(data_ingestion_artifact.test_file_path, schema)
+            X_test = final_model.transform(test_df.drop(columns=[target_column]))
+            y_test = np.searchsorted(classes, test_df[target_column].to_numpy())
+            train_metric = get_classification_score(
+                np.searchsorted(classes, y_delta), final_model.model.predict(final_model.transform(X_delta))
+            ) if len(delta) else None
+            test_metric = get_classification_score(y_test, final_model.model.predict(X_test))
+            logging.info(f"Incremental update ({report['mode']}) Test Metrics: {test_metric}")
+
+            model_file_path = config.trained_model_file_path
+            os.makedirs(os.path.dirname(model_file_path), exist_ok=True)
+            joblib.dump(final_model, model_file_path)
+            logging.info(f"Updated model saved at {model_file_path}")
+            compiled_report = self.export_compiled_model(final_model, X_test)
+
+            report.update(incremental_updates=final_model.incremental_updates,
+                          seconds=round(time.perf_counter() - start, 3))
+            self.save_incremental_report(report)
+            logging.info("Incremental model update completed successfully ✅")
+            return ModelTrainerArtifact(
+                trained_model_file_path=model_file_path,
+                train_metric=train_metric,
+                test_metric=test_metric,
+                compiled_model_file_path=compiled_report.get("compiled_model_file_path"),
+                compiled_model_report=compiled_report,
+                data_load_report=self.peak_rss(),
+                incremental_report=report
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def initiate_model_trainer(self, drift_reference_file_path: str = None) -> ModelTrainerArtifact:
+        try:
+            X_train, y_train, _, _, _ = self.load_arrays()
+            search = self._search(X_train, y_train)
+            return self.save_best_model([self._search_result(search)], drift_reference_file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -1,7 +1,6 @@
 import os
 import sys
-import numpy as np
-import pandas as pd
+from typing import Optional
 
 TARGET_COLUMN="RESULT"
 PIPELINE_NAME:str ="NetworkSecurity"
@@ -13,6 +12,25 @@ TEST_FILE_NAME:str="test.csv"
 
 SCHEMA_FILE_PATH=os.path.join("data_schema","schema.yaml")
 
+# manifests of finished stages, shared by all runs (see pipeline/stage_cache.py)
+STAGE_CACHE_DIR_NAME:str ="stage_cache"
+
+# "dag" runs independent pipeline steps concurrently on a process pool, "sequential" runs the stages in order
+TRAINING_PIPELINE_EXECUTOR:str ="dag"
+TRAINING_PIPELINE_MAX_WORKERS:Optional[int] =None  # None = one per CPU
+PIPELINE_TIMELINE_FILE_NAME:str ="pipeline_timeline.json"
+# per-run stage metrics (wall / CPU time, peak RSS, bytes read/written, rows), compared with the previous run
+PIPELINE_METRICS_FILE_NAME:str ="metrics.json"
+# cProfile every stage into <run>/profiles/<stage>.prof (slower); PIPELINE_PROFILE=1 in the environment also turns it on
+PIPELINE_PROFILE:bool =False
+PIPELINE_PROFILE_ENV_KEY:str ="PIPELINE_PROFILE"
+PIPELINE_PROFILE_DIR_NAME:str ="profiles"
+PIPELINE_PROFILE_TOP_FUNCTIONS:int =15
+# a stage regresses when it gets more than 20% slower / bigger, and by at least 1 s / 50 MB
+PIPELINE_REGRESSION_THRESHOLD:float =0.2
+PIPELINE_REGRESSION_MIN_SECONDS:float =1.0
+PIPELINE_REGRESSION_MIN_MB:float =50.0
+
 """data ingestion """
 DATA_INGESTION_COLLECTION_NAME:str ="NetworkData"
 DATA_INGESTION_DATABASE_NAME:str ="AIML Course"
@@ -20,6 +38,17 @@ DATA_INGESTION_DIR_NAME:str ="data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR:str ="feature_store"
 DATA_INGESTION_INGESTED_DIR:str ="ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATION:float= 0.2
+# artifact format between pipeline stages: "csv", "parquet" or "feather"
+DATA_INGESTION_FEATURE_STORE_FORMAT:str ="parquet"
+DATA_INGESTION_MONGO_BATCH_SIZE:int =10000
+# "full" re-exports the collection, "incremental" only pulls documents past the watermark
+DATA_INGESTION_MODE:str ="incremental"
+# "object_id" (new documents, by _id timestamp) or "change_stream" (inserts + updates, needs a replica set)
+DATA_INGESTION_WATERMARK_STRATEGY:str ="object_id"
+DATA_INGESTION_WATERMARK_FILE_NAME:str ="watermark.json"
+DATA_INGESTION_DELTA_DIR:str ="delta"
+# re-read this far behind the last _id timestamp, ids from different writers are not strictly ordered
+DATA_INGESTION_WATERMARK_LAG_SECONDS:int =60
 
 """data validation"""
 
@@ -28,13 +57,35 @@ DATA_VALIDATION_VALID_DIR:str ="validated"
 DATA_VALIDATION_INVALID_DIR:str ="invalid"
 DATA_VALIDATION_DRIFT_REPORT_DIR:str="drift_report"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME:str="report.yaml"
+DATA_VALIDATION_REPORT_FILE_NAME:str="validation_report.yaml"
+# rows per chunk when streaming a split through the validation engine
+DATA_VALIDATION_CHUNK_SIZE:int=100000
+# per-column sketches of the train split, compared against by later drift checks
+DATA_VALIDATION_DRIFT_REFERENCE_FILE_NAME:str="drift_reference.json"
+DATA_VALIDATION_DRIFT_SKETCH_ACCURACY:float=0.01
+DATA_VALIDATION_DRIFT_PSI_BINS:int=10
+DATA_VALIDATION_DRIFT_P_VALUE_THRESHOLD:float=0.05
 
 """ data transformation """
 
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORM_OBJECT_NAME: str = "transformer.joblib"
-DATA_TRANSFORMATION_TRAIN_FILE_NAME: str = "train_transformed.npy"
-DATA_TRANSFORMATION_TEST_FILE_NAME: str = "test_transformed.npy"
+# features and labels in separate contiguous .npy files, memory-mapped by the trainer
+DATA_TRANSFORMATION_TRAIN_FEATURES_FILE_NAME: str = "train_features.npy"
+DATA_TRANSFORMATION_TRAIN_LABELS_FILE_NAME: str = "train_labels.npy"
+DATA_TRANSFORMATION_TEST_FEATURES_FILE_NAME: str = "test_features.npy"
+DATA_TRANSFORMATION_TEST_LABELS_FILE_NAME: str = "test_labels.npy"
+DATA_TRANSFORMATION_FEATURE_DTYPE: str = "float32"
+# "auto": sparse CSR when the one-hot output is sparse enough (ColumnTransformer's 0.3 density
+# threshold), "sparse": CSR whenever a branch is sparse, "dense": always a dense matrix
+DATA_TRANSFORMATION_OUTPUT_FORMAT: str = "auto"
+# labels are stored in the smallest integer dtype that holds them when the schema types the target as int
+DATA_TRANSFORMATION_COMPACT_LABELS: bool = True
+# "memory" fits the preprocessor on the whole train frame; "streaming" fits and transforms chunk by
+# chunk for splits larger than memory (medians from exact counts or a quantile sketch, scalers by partial_fit)
+DATA_TRANSFORMATION_FIT_MODE: str = "memory"
+DATA_TRANSFORMATION_CHUNK_SIZE: int = 100_000
+DATA_TRANSFORMATION_MEDIAN_SKETCH_ACCURACY: float = 0.001
 DATA_TRANSFORMATION_PREPROCESSOR_REPORT_NAME: str = "preprocessor_report.yaml"
 
 """ model trainer """
@@ -46,4 +97,70 @@ MODEL_TRAINER_REPORT_NAME: str = "report.yaml"
 
 # optional extra paths
 MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_models"
-MODEL_TRAINER_FINAL_MODEL_FILE_NAME: str = "final_model.joblib"
\ No newline at end of file
+MODEL_TRAINER_FINAL_MODEL_FILE_NAME: str = "final_model.joblib"
+# NumPy-only export of the final model for serving
+MODEL_TRAINER_COMPILED_MODEL_FILE_NAME: str = "model_compiled.npz"
+
+# hyperparameter search: "halving" (successive halving) or "grid" (exhaustive)
+MODEL_TRAINER_SEARCH_STRATEGY: str = "halving"
+MODEL_TRAINER_SEARCH_SCORING: str = "f1_macro"
+MODEL_TRAINER_SEARCH_CV_FOLDS: int = 3
+MODEL_TRAINER_HALVING_FACTOR: int = 3
+MODEL_TRAINER_SEARCH_N_JOBS: int = -1
+MODEL_TRAINER_SEARCH_TIME_BUDGET_SECONDS: Optional[float] = None  # None = no limit
+
+# CV scores / refitted models shared across runs (under ARTIFACT_DIR, not the timestamped run dir)
+MODEL_TRAINER_FIT_CACHE_DIR_NAME: str = "fit_cache"
+MODEL_TRAINER_FIT_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+
+# "full" searches and refits every run; "incremental" continues the newest earlier model on the rows
+# ingested since (the ingestion delta) and falls back to a full retrain when there is no usable
+# previous model, the new rows lack a class, their drift is high or MAX_UPDATES is reached
+MODEL_TRAINER_TRAINING_MODE: str = "full"
+MODEL_TRAINER_INCREMENTAL_BASE_MODEL_FILE_PATH: Optional[str] = None  # None = newest model.pkl of an earlier run
+MODEL_TRAINER_INCREMENTAL_MIN_ROWS: int = 100  # fewer new rows keep the previous model as is
+MODEL_TRAINER_INCREMENTAL_MAX_UPDATES: int = 10
+MODEL_TRAINER_INCREMENTAL_XGB_ROUNDS: int = 50
+MODEL_TRAINER_INCREMENTAL_FOREST_TREES: int = 20
+MODEL_TRAINER_INCREMENTAL_SGD_EPOCHS: int = 5
+MODEL_TRAINER_INCREMENTAL_SGD_LEARNING_RATE: float = 0.01
+MODEL_TRAINER_INCREMENTAL_DRIFT_PSI_THRESHOLD: float = 0.2
+MODEL_TRAINER_INCREMENTAL_MAX_DRIFTED_SHARE: float = 0.1
+MODEL_TRAINER_INCREMENTAL_REPORT_FILE_NAME: str = "incremental_report.json"
+
+""" model serving """
+
+SERVING_MODEL_FILE_PATH: str = os.path.join("artifacts", "model", "trained_model.pkl")
+# served instead of the pickle when present: no sklearn/xgboost import at serve time
+SERVING_COMPILED_MODEL_FILE_PATH: str = os.path.join("artifacts", "model", "model_compiled.npz")
+SERVING_MODEL_PATH_ENV_KEY: str = "SERVING_MODEL_PATH"
+MODEL_REGISTRY_POLL_INTERVAL_SECONDS: float = 5.0
+PREDICTION_BATCH_MAX_ROWS: int = 10000
+PREDICTION_BATCH_MAX_BYTES: int = 32 * 1024 * 1024
+MICRO_BATCH_MAX_ROWS: int = 64
+MICRO_BATCH_MAX_WAIT_MS: float = 2.0
+MICRO_BATCH_MAX_QUEUE_DEPTH: int = 10000
+MICRO_BATCH_TIMEOUT_SECONDS: float = 5.0  # a /predict call waits this long for its batch, then gets a 503
+INFERENCE_THREAD_POOL_SIZE: int = 4
+INFERENCE_MAX_PENDING_REQUESTS: int = 256
+SERVING_HOST: str = "0.0.0.0"
+SERVING_PORT: int = 8080
+# live drift monitoring of /predict traffic against the model's training reference
+DRIFT_MONITOR_BINS: int = 10
+DRIFT_MONITOR_FLUSH_INTERVAL_SECONDS: float = 10.0
+DRIFT_MONITOR_WINDOW_FLUSHES: int = 360  # window of one hour
+DRIFT_MONITOR_MIN_ROWS: int = 500
+DRIFT_MONITOR_PSI_THRESHOLD: float = 0.2
+# rows a shard buffers before binning them in one vectorized call
+DRIFT_MONITOR_BUFFER_ROWS: int = 256
+# counter shards, each request thread is assigned one: a fixed number however many threads come and go
+DRIFT_MONITOR_SHARDS: int = 8
+
+""" training jobs """
+
+TRAINING_JOBS_DIR: str = os.path.join("artifacts", "training_jobs")
+TRAINING_LOCK_FILE_PATH: str = os.path.join("artifacts", "training.lock")
+
+""" batch prediction """
+
+BATCH_PREDICTION_CHUNK_SIZE: int = 100000
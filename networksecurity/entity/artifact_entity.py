@@ -4,6 +4,8 @@ from dataclasses import dataclass
 class DataIngestionArtifact:
     trained_file_path:str
     test_file_path:str
+    # rows new or changed since the previous run (incremental ingestion only)
+    delta_file_path:str=None
 
 @dataclass
 class DataValidationArtifact:
@@ -13,20 +15,17 @@ class DataValidationArtifact:
     invalid_train_file_path:str
     invalid_test_file_path:str
     drift_report_file_path:str
-    
+    validation_report_file_path:str=None
+    drift_reference_file_path:str=None
+
 @dataclass
 class DataTransformationArtifact:
-    transformed_train_file_path: str
-    transformed_test_file_path: str
+    transformed_train_features_file_path: str
+    transformed_train_labels_file_path: str
+    transformed_test_features_file_path: str
+    transformed_test_labels_file_path: str
     transformed_object_file_path: str
 
-# New after transformation
-@dataclass
-class ModelTrainerArtifact:
-    model_file_path: str
-    train_score: float
-    test_score: float
-
 @dataclass
 class ClassificationMetricArtifact:
     """
@@ -38,26 +37,6 @@ class ClassificationMetricArtifact:
     recall: float
     f1_score: float
 
-@dataclass
-class ModelEvaluationArtifact:
-    is_model_accepted: bool
-    improved_accuracy: float
-
-@dataclass
-class ModelPusherArtifact:
-    saved_model_path: str
-    model_registry_path: str
-    
-
-from dataclasses import dataclass
-
-@dataclass
-class ClassificationMetricArtifact:
-    accuracy: float
-    precision: float
-    recall: float
-    f1_score: float
-
     def __str__(self):
         return (
             f"ClassificationMetricArtifact("
@@ -67,18 +46,28 @@ class ClassificationMetricArtifact:
             f"f1_score={self.f1_score:.4f})"
         )
 
-
+# New after transformation
 @dataclass
 class ModelTrainerArtifact:
-    model_path: str
-    report_path: str
-    metrics: ClassificationMetricArtifact
+    trained_model_file_path: str
+    train_metric: ClassificationMetricArtifact
+    test_metric: ClassificationMetricArtifact
+    # winning model family/params and per-rung history of the hyperparameter search
+    search_report: dict = None
+    # NumPy-only serving export and its parity check; None when the model could not be compiled
+    compiled_model_file_path: str = None
+    compiled_model_report: dict = None
+    # how the transformed arrays were loaded: mmap, bytes, load seconds, peak RSS
+    data_load_report: dict = None
+    # incremental update of the previous model: mode, base model, rows, drift check; None for a full retrain
+    incremental_report: dict = None
 
-    def __str__(self):
-        return (
-            f"ModelTrainerArtifact(\n"
-            f"  model_path={self.model_path},\n"
-            f"  report_path={self.report_path},\n"
-            f"  metrics={self.metrics}\n"
-            f")"
-        )
+@dataclass
+class ModelEvaluationArtifact:
+    is_model_accepted: bool
+    improved_accuracy: float
+
+@dataclass
+class ModelPusherArtifact:
+    saved_model_path: str
+    model_registry_path: str
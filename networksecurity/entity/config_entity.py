@@ -2,6 +2,7 @@ from datetime import datetime
 import os
 
 from networksecurity.constant import training_pipeline
+from networksecurity.utils.main_utils.utils import with_file_format
 
 # Root directory for all artifacts
 ARTIFACT_DIR = os.path.join(os.getcwd(), "artifacts")
@@ -12,9 +13,6 @@ PIPELINE_TIMESTAMP = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
 ARTIFACT_DIR = os.path.join(ARTIFACT_DIR, PIPELINE_TIMESTAMP)
 
 
-print(training_pipeline.PIPELINE_NAME)
-print(training_pipeline.ARTIFACT_DIR)
-
 class TrainingPipelineConfig:
     def __init__(self,timestamp=datetime.now()):
         timestamp=timestamp.strftime("%m_%d_%Y_%H_%M_%S")
@@ -22,6 +20,17 @@ class TrainingPipelineConfig:
         self.artifact_name=training_pipeline.ARTIFACT_DIR
         self.artifact_dir=os.path.join(self.artifact_name,timestamp)
         self.timestamp:str=timestamp
+        self.stage_cache_dir:str=os.path.join(self.artifact_name,training_pipeline.STAGE_CACHE_DIR_NAME)
+        self.executor:str=training_pipeline.TRAINING_PIPELINE_EXECUTOR
+        self.max_workers=training_pipeline.TRAINING_PIPELINE_MAX_WORKERS
+        self.timeline_file_path:str=os.path.join(self.artifact_dir,training_pipeline.PIPELINE_TIMELINE_FILE_NAME)
+        self.metrics_file_path:str=os.path.join(self.artifact_dir,training_pipeline.PIPELINE_METRICS_FILE_NAME)
+        self.profile:bool=training_pipeline.PIPELINE_PROFILE or os.getenv(training_pipeline.PIPELINE_PROFILE_ENV_KEY)=="1"
+        self.profile_dir:str=os.path.join(self.artifact_dir,training_pipeline.PIPELINE_PROFILE_DIR_NAME)
+        self.profile_top_functions:int=training_pipeline.PIPELINE_PROFILE_TOP_FUNCTIONS
+        self.regression_threshold:float=training_pipeline.PIPELINE_REGRESSION_THRESHOLD
+        self.regression_min_seconds:float=training_pipeline.PIPELINE_REGRESSION_MIN_SECONDS
+        self.regression_min_mb:float=training_pipeline.PIPELINE_REGRESSION_MIN_MB
 
 
         
@@ -30,19 +39,42 @@ class DataIngestionConfig:
         self.data_ingestion_dir:str=os.path.join(
             training_pipeline_config.artifact_dir,training_pipeline.DATA_INGESTION_DIR_NAME
         )
+        self.file_format:str=training_pipeline.DATA_INGESTION_FEATURE_STORE_FORMAT
         self.feature_store_file_path:str=os.path.join(
-            self.data_ingestion_dir,training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR.FILE_NAME
+            self.data_ingestion_dir,training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR,
+            with_file_format(training_pipeline.FILE_NAME,self.file_format)
         )
         self.training_file_path:str=os.path.join(
-            self.data_ingestion_dir,training_pipeline.DATA_INGESTION_INGESTED_DIR,training_pipeline.TRAIN_FILE_NAME
+            self.data_ingestion_dir,training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            with_file_format(training_pipeline.TRAIN_FILE_NAME,self.file_format)
         )
         self.testing_file_path:str=os.path.join(
-            self.data_ingestion_dir,training_pipeline.DATA_INGESTION_INGESTED_DIR,training_pipeline.TEST_FILE_NAME
+            self.data_ingestion_dir,training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            with_file_format(training_pipeline.TEST_FILE_NAME,self.file_format)
         )
 
         self.train_test_split_ration:float=training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATION
         self.collection_name: str =training_pipeline.DATA_INGESTION_COLLECTION_NAME
         self.database_name:str=training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.batch_size:int=training_pipeline.DATA_INGESTION_MONGO_BATCH_SIZE
+
+        # incremental ingestion: the merged feature store and its watermark outlive a single run
+        self.ingestion_mode:str=training_pipeline.DATA_INGESTION_MODE
+        self.watermark_strategy:str=training_pipeline.DATA_INGESTION_WATERMARK_STRATEGY
+        self.watermark_lag_seconds:int=training_pipeline.DATA_INGESTION_WATERMARK_LAG_SECONDS
+        self.persistent_feature_store_dir:str=os.path.join(
+            training_pipeline_config.artifact_name,training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR
+        )
+        self.persistent_feature_store_file_path:str=os.path.join(
+            self.persistent_feature_store_dir,with_file_format(training_pipeline.FILE_NAME,self.file_format)
+        )
+        self.watermark_file_path:str=os.path.join(
+            self.persistent_feature_store_dir,training_pipeline.DATA_INGESTION_WATERMARK_FILE_NAME
+        )
+        self.delta_file_path:str=os.path.join(
+            self.data_ingestion_dir,training_pipeline.DATA_INGESTION_DELTA_DIR,
+            with_file_format(training_pipeline.FILE_NAME,self.file_format)
+        )
 
 
 class DataValidationConfig:
@@ -75,11 +107,75 @@ class DataValidationConfig:
         self.drift_report_file_path: str = os.path.join(
             self.drift_report_dir, training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME
         )
+        self.drift_reference_file_path: str = os.path.join(
+            self.drift_report_dir, training_pipeline.DATA_VALIDATION_DRIFT_REFERENCE_FILE_NAME
+        )
+        self.drift_sketch_accuracy: float = training_pipeline.DATA_VALIDATION_DRIFT_SKETCH_ACCURACY
+        self.drift_psi_bins: int = training_pipeline.DATA_VALIDATION_DRIFT_PSI_BINS
+        self.drift_p_value_threshold: float = training_pipeline.DATA_VALIDATION_DRIFT_P_VALUE_THRESHOLD
+
+        # Per-column violation counts from the validation engine
+        self.validation_report_file_path: str = os.path.join(
+            self.data_validation_dir, training_pipeline.DATA_VALIDATION_REPORT_FILE_NAME
+        )
+        self.chunk_size: int = training_pipeline.DATA_VALIDATION_CHUNK_SIZE
+
+class DataTransformationConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig):
+        self.data_transformation_dir: str = os.path.join(
+            training_pipeline_config.artifact_dir, training_pipeline.DATA_TRANSFORMATION_DIR_NAME
+        )
+        self.transformed_train_features_file_path: str = os.path.join(
+            self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRAIN_FEATURES_FILE_NAME
+        )
+        self.transformed_train_labels_file_path: str = os.path.join(
+            self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRAIN_LABELS_FILE_NAME
+        )
+        self.transformed_test_features_file_path: str = os.path.join(
+            self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TEST_FEATURES_FILE_NAME
+        )
+        self.transformed_test_labels_file_path: str = os.path.join(
+            self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TEST_LABELS_FILE_NAME
+        )
+        self.feature_dtype: str = training_pipeline.DATA_TRANSFORMATION_FEATURE_DTYPE
+        self.output_format: str = training_pipeline.DATA_TRANSFORMATION_OUTPUT_FORMAT
+        self.compact_labels: bool = training_pipeline.DATA_TRANSFORMATION_COMPACT_LABELS
+        self.fit_mode: str = training_pipeline.DATA_TRANSFORMATION_FIT_MODE
+        self.chunk_size: int = training_pipeline.DATA_TRANSFORMATION_CHUNK_SIZE
+        self.median_sketch_accuracy: float = training_pipeline.DATA_TRANSFORMATION_MEDIAN_SKETCH_ACCURACY
+        self.transformed_object_file_path: str = os.path.join(
+            self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORM_OBJECT_NAME
+        )
+
 
 class ModelTrainerConfig:
     def __init__(self, training_pipeline_config):
         self.model_trainer_dir = os.path.join(training_pipeline_config.artifact_dir, "model_trainer")
         self.trained_model_file_path = os.path.join(self.model_trainer_dir, "model.pkl")
+        self.compiled_model_file_path = os.path.join(self.model_trainer_dir,
+                                                     training_pipeline.MODEL_TRAINER_COMPILED_MODEL_FILE_NAME)
+        self.search_strategy: str = training_pipeline.MODEL_TRAINER_SEARCH_STRATEGY
+        self.search_scoring: str = training_pipeline.MODEL_TRAINER_SEARCH_SCORING
+        self.search_cv_folds: int = training_pipeline.MODEL_TRAINER_SEARCH_CV_FOLDS
+        self.halving_factor: int = training_pipeline.MODEL_TRAINER_HALVING_FACTOR
+        self.search_n_jobs: int = training_pipeline.MODEL_TRAINER_SEARCH_N_JOBS
+        self.search_time_budget_seconds = training_pipeline.MODEL_TRAINER_SEARCH_TIME_BUDGET_SECONDS
+        # set fit_cache_dir to None to disable the cache
+        self.fit_cache_dir = os.path.join(training_pipeline_config.artifact_name,
+                                          training_pipeline.MODEL_TRAINER_FIT_CACHE_DIR_NAME)
+        self.fit_cache_max_bytes: int = training_pipeline.MODEL_TRAINER_FIT_CACHE_MAX_BYTES
+        self.training_mode: str = training_pipeline.MODEL_TRAINER_TRAINING_MODE
+        self.base_model_file_path = training_pipeline.MODEL_TRAINER_INCREMENTAL_BASE_MODEL_FILE_PATH
+        self.incremental_min_rows: int = training_pipeline.MODEL_TRAINER_INCREMENTAL_MIN_ROWS
+        self.incremental_max_updates: int = training_pipeline.MODEL_TRAINER_INCREMENTAL_MAX_UPDATES
+        self.incremental_xgb_rounds: int = training_pipeline.MODEL_TRAINER_INCREMENTAL_XGB_ROUNDS
+        self.incremental_forest_trees: int = training_pipeline.MODEL_TRAINER_INCREMENTAL_FOREST_TREES
+        self.incremental_sgd_epochs: int = training_pipeline.MODEL_TRAINER_INCREMENTAL_SGD_EPOCHS
+        self.incremental_sgd_learning_rate: float = training_pipeline.MODEL_TRAINER_INCREMENTAL_SGD_LEARNING_RATE
+        self.incremental_drift_psi_threshold: float = training_pipeline.MODEL_TRAINER_INCREMENTAL_DRIFT_PSI_THRESHOLD
+        self.incremental_max_drifted_share: float = training_pipeline.MODEL_TRAINER_INCREMENTAL_MAX_DRIFTED_SHARE
+        self.incremental_report_file_path = os.path.join(self.model_trainer_dir,
+                                                         training_pipeline.MODEL_TRAINER_INCREMENTAL_REPORT_FILE_NAME)
         os.makedirs(self.model_trainer_dir, exist_ok=True)
 
 
@@ -14,6 +14,20 @@ class NetworkSecurityException(Exception):
     def __str__(self):
         return "Error occurred in python script name [{0}] line number [{1}] error message [{2}]".format(
         self.file_name, self.lineno, str(self.error_message))
+
+    def __reduce__(self):
+        # args hold the sys module, which cannot be pickled; rebuild from the
+        # recorded location so errors can cross process boundaries
+        return (_restore_exception, (type(self), str(self.error_message), self.file_name, self.lineno))
+
+
+def _restore_exception(cls, error_message, file_name, lineno):
+    exception = cls.__new__(cls)
+    Exception.__init__(exception, error_message)
+    exception.error_message = error_message
+    exception.file_name = file_name
+    exception.lineno = lineno
+    return exception
          
         
 
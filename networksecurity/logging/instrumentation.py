@@ -0,0 +1,424 @@
+"""
+Structured timing and resource metrics of the training pipeline.
+
+Every stage (and every DAG node) is measured with measure(): wall time, CPU
+time, its own peak RSS (where the high-water mark can be reset), bytes read/written, rows in/out of its artifacts, plus the
+time spent in the @instrumented component methods it called. A run's
+metrics go to <artifact dir>/metrics.json, compared with the previous
+run's. With profiling on, each stage also gets a cProfile dump.
+
+Compare two runs from the command line (exit code 1 on a regression):
+
+    python -m networksecurity.logging.instrumentation                  # newest two runs
+    python -m networksecurity.logging.instrumentation Artifacts/<run>/metrics.json --baseline <file>
+"""
+import os
+import sys
+import glob
+import json
+import time
+import pstats
+import cProfile
+import argparse
+import dataclasses
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+# per thread: span totals of the blocks being measured, innermost last
+_local = threading.local()
+
+COMPARED_METRICS = ("wall_seconds", "cpu_seconds", "peak_rss_mb")
+
+
+def _span_stack() -> List[dict]:
+    if not hasattr(_local, "spans"):
+        _local.spans = []
+    return _local.spans
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the RSS high-water mark (VmHWM) of this process to its current RSS; Linux only.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def resource_snapshot() -> dict:
+    """
+    Counters of this process: clocks, CPU time of itself and of its finished
+    children, high-water marks of its RSS (lifetime, and since the last
+    reset_peak_rss()) and bytes passed to read()/write().
+    """
+    snapshot = {"wall": time.perf_counter(), "cpu": time.process_time(), "children_cpu": 0.0,
+                "max_rss_mb": None, "hwm_mb": None, "read_bytes": None, "write_bytes": None}
+    if resource is not None:
+        # ru_maxrss is in KB on Linux (bytes on macOS)
+        unit = 1024 * 1024 if sys.platform == "darwin" else 1024
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        snapshot["children_cpu"] = children.ru_utime + children.ru_stime
+        snapshot["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+    try:
+        with open("/proc/self/status", "r") as file:
+            hwm = next(line for line in file if line.startswith("VmHWM:"))
+        snapshot["hwm_mb"] = int(hwm.split()[1]) / 1024
+    except (OSError, StopIteration, ValueError):
+        pass
+    try:
+        with open("/proc/self/io", "r") as file:
+            counters = dict(line.split(": ", 1) for line in file.read().splitlines())
+        # rchar / wchar count page cache hits too: what the stage asked for, not what hit the disk
+        snapshot["read_bytes"], snapshot["write_bytes"] = int(counters["rchar"]), int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        pass
+    return snapshot
+
+
+def usage_between(before: dict, after: dict) -> dict:
+    usage = {
+        "wall_seconds": round(after["wall"] - before["wall"], 4),
+        "cpu_seconds": round(after["cpu"] - before["cpu"], 4),
+        "children_cpu_seconds": round(after["children_cpu"] - before["children_cpu"], 4)
+    }
+    if before.get("peak_reset") and after["hwm_mb"] is not None:
+        # the high-water mark was reset when the block started: this is the block's own peak
+        usage["peak_rss_mb"] = round(after["hwm_mb"], 1)
+    if after["max_rss_mb"] is not None:
+        # the lifetime peak of the process (e.g. a reused pool worker): a block only shows
+        # growth if it went above everything the process ran before it
+        usage["process_peak_rss_mb"] = round(after["max_rss_mb"], 1)
+        usage["peak_rss_growth_mb"] = round(after["max_rss_mb"] - before["max_rss_mb"], 1)
+    if after["read_bytes"] is not None:
+        usage["read_bytes"] = after["read_bytes"] - before["read_bytes"]
+        usage["write_bytes"] = after["write_bytes"] - before["write_bytes"]
+    return usage
+
+
+def save_profile(profiler: cProfile.Profile, file_path: str, top: int) -> dict:
+    """
+    Dump the profile (open it with pstats or snakeviz) and return its slowest functions.
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    profiler.dump_stats(file_path)
+    stats = pstats.Stats(profiler).stats
+    slowest = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return {
+        "file": file_path,
+        "top_cumulative": [
+            {"function": f"{os.path.basename(filename)}:{line}({function})", "calls": calls,
+             "self_seconds": round(self_time, 4), "cumulative_seconds": round(cumulative_time, 4)}
+            for (filename, line, function), (_, calls, self_time, cumulative_time, _) in slowest
+        ]
+    }
+
+
+@contextmanager
+def measure(profile_file_path: str = None, profile_top: int = 15, reset_peak: bool = False):
+    """
+    Resource usage of the enclosed block, filled into the yielded dict on
+    exit, with the time of the @instrumented methods it called under
+    "spans". With profile_file_path the block also runs under cProfile
+    (the calling thread only). reset_peak=True resets the RSS high-water
+    mark first, so peak_rss_mb is the block's own peak; only use it when
+    nothing else measured runs in this process at the same time.
+    """
+    record, spans = {}, {}
+    _span_stack().append(spans)
+    profiler = cProfile.Profile() if profile_file_path else None
+    peak_reset = reset_peak and reset_peak_rss()
+    before = {**resource_snapshot(), "peak_reset": peak_reset}
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # another profiler is already active in this thread, e.g. the whole run under cProfile
+            logging.warning(f"Stage not profiled: {e}")
+            profiler = None
+    try:
+        yield record
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        record.update(usage_between(before, resource_snapshot()))
+        _span_stack().pop()
+        if spans:
+            record["spans"] = {name: {key: round(value, 4) for key, value in span.items()}
+                               for name, span in spans.items()}
+        if profiler is not None:
+            try:
+                record["profile"] = save_profile(profiler, profile_file_path, profile_top)
+            except Exception as e:
+                logging.warning(f"Profile not saved to {profile_file_path}: {e}")
+
+
+def instrumented(func):
+    """
+    Adds the calls, wall and CPU time of the decorated method to the block
+    being measured in the calling thread. Free when nothing is measured.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = _span_stack()
+        if not stack:
+            return func(*args, **kwargs)
+        spans = stack[-1]
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            span = spans.setdefault(name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+            span["calls"] += 1
+            span["wall_seconds"] += time.perf_counter() - start_wall
+            span["cpu_seconds"] += time.process_time() - start_cpu
+
+    return wrapper
+
+
+def _artifact_paths(artifact, name: str = "output") -> Dict[str, str]:
+    # {field: path} of every str field (or list item) of an artifact naming an existing file
+    if isinstance(artifact, (list, tuple)):
+        paths = {}
+        for i, value in enumerate(artifact):
+            paths.update(_artifact_paths(value, f"{name}[{i}]"))
+        return paths
+    if dataclasses.is_dataclass(artifact):
+        return {field.name: getattr(artifact, field.name) for field in dataclasses.fields(artifact)
+                if isinstance(getattr(artifact, field.name), str) and os.path.isfile(getattr(artifact, field.name))}
+    return {name: artifact} if isinstance(artifact, str) and os.path.isfile(artifact) else {}
+
+
+def _file_rows(file_path: str) -> Optional[int]:
+    # only formats that store their row count; a CSV would have to be read again
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".parquet", ".feather"):
+        from networksecurity.utils.main_utils.utils import count_dataframe_rows
+        return count_dataframe_rows(file_path, chunksize=100_000)
+    if extension in (".npy", ".npz"):
+        import numpy as np
+        if extension == ".npy":
+            return int(np.load(file_path, mmap_mode="r").shape[0])
+        with np.load(file_path, allow_pickle=False) as data:
+            # scipy.sparse.save_npz stores the matrix shape
+            return int(data["shape"][0]) if "shape" in data.files else None
+    return None
+
+
+def artifact_metrics(artifacts: list) -> dict:
+    """
+    Rows per data file and total file bytes of the artifacts (dataclasses, paths or lists of them).
+    """
+    rows, total_bytes = {}, 0
+    for artifact in artifacts:
+        for name, file_path in _artifact_paths(artifact).items():
+            total_bytes += os.path.getsize(file_path)
+            try:
+                count = _file_rows(file_path)
+            except Exception:
+                count = None
+            if count is not None:
+                rows[name] = count
+    return {"rows": rows, "bytes": total_bytes}
+
+
+def _load_metrics(file_path: str) -> dict:
+    with open(file_path, "r") as file:
+        return json.load(file)
+
+
+def find_previous_metrics(file_path: str, executor: str = None) -> Optional[str]:
+    """
+    The newest metrics file of an earlier run (sibling run directories, by
+    modification time), of a run with the same executor if one is given: the
+    stages of the sequential and DAG executors do not do the same work.
+    """
+    run_dir = os.path.dirname(os.path.abspath(file_path))
+    pattern = os.path.join(os.path.dirname(run_dir), "*", os.path.basename(file_path))
+    previous = [path for path in glob.glob(pattern) if os.path.dirname(os.path.abspath(path)) != run_dir]
+    for path in sorted(previous, key=os.path.getmtime, reverse=True):
+        try:
+            if executor is None or _load_metrics(path).get("executor") == executor:
+                return path
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def compare_metrics(baseline: dict, current: dict, threshold: float = 0.2, min_seconds: float = 1.0,
+                    min_mb: float = 50.0) -> dict:
+    """
+    Per stage: wall time, CPU time and peak RSS before/after, plus the change
+    in rows out so data growth can be told apart from a slowdown. A metric
+    regresses when it grew by more than threshold (relative) and by more than
+    min_seconds / min_mb. Only stages that ran in both runs are compared.
+    """
+    stages, regressions = {}, []
+    for name, after in current.get("stages", {}).items():
+        before = baseline.get("stages", {}).get(name)
+        if before is None or before.get("status") != "completed" or after.get("status") != "completed":
+            continue
+        changes = {}
+        for metric in COMPARED_METRICS:
+            if before.get(metric) is None or after.get(metric) is None:
+                continue
+            old, new = before[metric], after[metric]
+            change = (new - old) / old if old else 0.0
+            changes[metric] = {"before": old, "after": new, "change": round(change, 4)}
+            floor = min_mb if metric.endswith("_mb") else min_seconds
+            if change > threshold and new - old > floor:
+                regressions.append(f"{name} {metric} {old} -> {new} (+{change:.0%})")
+        rows_before, rows_after = sum(before.get("rows_out", {}).values()), sum(after.get("rows_out", {}).values())
+        if rows_before and rows_after:
+            changes["rows_out_ratio"] = round(rows_after / rows_before, 4)
+        stages[name] = changes
+    return {"baseline_run": baseline.get("run"), "threshold": threshold, "stages": stages, "regressions": regressions}
+
+
+def format_comparison(comparison: dict) -> str:
+    lines = [f"Compared with run {comparison['baseline_run']} (regression above +{comparison['threshold']:.0%}):",
+             f"{'stage':<34}{'wall s':>22}{'cpu s':>22}{'peak MB':>22}{'rows x':>9}"]
+    for name, changes in comparison["stages"].items():
+        cells = []
+        for metric in COMPARED_METRICS:
+            change = changes.get(metric)
+            cells.append(f"{change['before']:>8} -> {change['after']:<8}{change['change']:+.0%}".rjust(22)
+                         if change else "-".rjust(22))
+        lines.append(f"{name:<34}{''.join(cells)}{changes.get('rows_out_ratio', '-'):>9}")
+    lines.extend(f"REGRESSION {regression}" for regression in comparison["regressions"])
+    return "\n".join(lines)
+
+
+class PipelineMetrics:
+    """
+    Collects the stage metrics of one pipeline run and writes them to
+    file_path. profile_dir turns on a cProfile dump per stage.
+    """
+
+    def __init__(self, file_path: str, run: str, executor: str, profile_dir: str = None,
+                 profile_top: int = 15, regression_threshold: float = 0.2,
+                 regression_min_seconds: float = 1.0, regression_min_mb: float = 50.0):
+        self.file_path = file_path
+        self.profile_dir = profile_dir
+        self.profile_top = profile_top
+        self.regression_threshold = regression_threshold
+        self.regression_min_seconds = regression_min_seconds
+        self.regression_min_mb = regression_min_mb
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+        self.run = run
+        self.executor = executor
+        self.stages: Dict[str, dict] = {}
+
+    def profile_file_path(self, stage_name: str) -> Optional[str]:
+        return os.path.join(self.profile_dir, f"{stage_name}.prof") if self.profile_dir else None
+
+    def add_stage(self, stage_name: str, status: str, usage: dict, inputs: list = (), output=None) -> None:
+        """
+        Record a stage measured elsewhere (e.g. a DAG node in a worker process).
+        """
+        if status == "skipped" and self.stages.get(stage_name, {}).get("status") == "completed":
+            # a second DAG pass reuses the node: keep the run that did the work
+            return
+        input_metrics, output_metrics = artifact_metrics(list(inputs)), artifact_metrics([output])
+        self.stages[stage_name] = {
+            "status": status,
+            **usage,
+            "rows_in": input_metrics["rows"],
+            "rows_out": output_metrics["rows"],
+            "output_bytes": output_metrics["bytes"]
+        }
+
+    @contextmanager
+    def stage(self, stage_name: str, inputs: list = ()):
+        """
+        Measure a stage run in this process; set record["output"] to its artifact
+        and record["status"] if it was not simply "completed".
+        """
+        record = {"status": "completed", "output": None}
+        try:
+            # stages run one at a time here, so each one gets its own RSS peak
+            with measure(self.profile_file_path(stage_name), self.profile_top, reset_peak=True) as usage:
+                yield record
+        except Exception:
+            record["status"] = "failed"
+            raise
+        finally:
+            self.add_stage(stage_name, record["status"], usage, inputs, record["output"])
+
+    def save(self) -> dict:
+        """
+        Write the metrics of the run, compared with the newest earlier run; returns them.
+        """
+        try:
+            metrics = {
+                "run": self.run,
+                "executor": self.executor,
+                "started_at": self.started_at,
+                "wall_seconds": round(time.perf_counter() - self.start, 4),
+                "profile": self.profile_dir is not None,
+                "stages": self.stages
+            }
+            previous_file_path = find_previous_metrics(self.file_path, self.executor)
+            if previous_file_path is not None:
+                comparison = compare_metrics(_load_metrics(previous_file_path), metrics, self.regression_threshold,
+                                             self.regression_min_seconds, self.regression_min_mb)
+                metrics["comparison"] = comparison
+                for regression in comparison["regressions"]:
+                    logging.warning(f"⚠️ Pipeline regression: {regression}")
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            tmp_path = self.file_path + ".tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(metrics, file, indent=2, default=str)
+            os.replace(tmp_path, self.file_path)
+            logging.info(f"📊 Pipeline metrics of {len(self.stages)} stages saved at {self.file_path}")
+            return metrics
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+if __name__ == "__main__":
+    from networksecurity.constant.training_pipeline import (
+        ARTIFACT_DIR,
+        PIPELINE_METRICS_FILE_NAME,
+        PIPELINE_REGRESSION_THRESHOLD,
+        PIPELINE_REGRESSION_MIN_SECONDS,
+        PIPELINE_REGRESSION_MIN_MB
+    )
+
+    parser = argparse.ArgumentParser(description="Compare the stage metrics of two training pipeline runs")
+    parser.add_argument("current", nargs="?", help="metrics.json of the run to check (default: the newest run)")
+    parser.add_argument("--baseline", help="metrics.json to compare with (default: the run before current)")
+    parser.add_argument("--threshold", type=float, default=PIPELINE_REGRESSION_THRESHOLD)
+    parser.add_argument("--min-seconds", type=float, default=PIPELINE_REGRESSION_MIN_SECONDS)
+    parser.add_argument("--min-mb", type=float, default=PIPELINE_REGRESSION_MIN_MB)
+    args = parser.parse_args()
+
+    runs = sorted(glob.glob(os.path.join(ARTIFACT_DIR, "*", PIPELINE_METRICS_FILE_NAME)), key=os.path.getmtime)
+    current_file_path = args.current or (runs[-1] if runs else None)
+    baseline_file_path = args.baseline or (
+        find_previous_metrics(current_file_path, _load_metrics(current_file_path).get("executor"))
+        if current_file_path else None
+    )
+    if current_file_path is None or baseline_file_path is None:
+        print(f"Need two runs with {PIPELINE_METRICS_FILE_NAME} under {ARTIFACT_DIR} (or pass the files)")
+        sys.exit(2)
+    result = compare_metrics(_load_metrics(baseline_file_path), _load_metrics(current_file_path),
+                             args.threshold, args.min_seconds, args.min_mb)
+    print(f"{current_file_path} vs {baseline_file_path}")
+    print(format_comparison(result))
+    sys.exit(1 if result["regressions"] else 0)
@@ -1,39 +1,213 @@
 import sys
 import os
+import time
+import shutil
 import pandas as pd
 import joblib
-from networksecurity.exception import NetworkSecurityException
-from networksecurity.logging import logger
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging as logger
 from networksecurity.utils.ml_utils.model.estimator import NetworkSecurityModel
+from networksecurity.constant.training_pipeline import SERVING_MODEL_FILE_PATH, BATCH_PREDICTION_CHUNK_SIZE
 
+SNIFF_ROWS = 1000
 
-def start_batch_prediction(input_file_path: str, output_file_path: str):
+
+def load_model(model_path: str = SERVING_MODEL_FILE_PATH) -> NetworkSecurityModel:
+    if not os.path.exists(model_path):
+        raise FileNotFoundError("Trained model not found. Please train the model first.")
+    return joblib.load(model_path)
+
+
+def sniff_columns(input_file_path: str) -> Tuple[List[str], List[str]]:
+    """
+    Read the header and a sample of rows once to fix the column names and which
+    columns are numeric, so every chunk (and every worker) parses the same way.
+    """
+    sample = pd.read_csv(input_file_path, nrows=SNIFF_ROWS)
+    numeric_columns = [col for col in sample.columns if pd.api.types.is_numeric_dtype(sample[col])]
+    return list(sample.columns), numeric_columns
+
+
+def read_text_chunks(source, columns: List[str], chunksize: Optional[int], has_header: bool):
+    """
+    Stream a CSV as text chunks: values are kept exactly as written in the input,
+    so the output does not depend on where the chunk boundaries fall.
+    Without chunksize the whole file is one chunk.
+    """
+    frames = pd.read_csv(
+        source,
+        header=0 if has_header else None,
+        names=columns,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunksize
+    )
+    return frames if chunksize else [frames]
+
+
+def score_chunks(model: NetworkSecurityModel, chunks, output_file_path: str, numeric_columns: List[str],
+                 write_header: bool = True, log_prefix: str = "") -> int:
+    """
+    Score an iterator of text DataFrame chunks, appending each scored chunk to the output file.
+    Only one chunk is held in memory at a time. Returns the number of rows written.
+    """
+    total_rows = 0
+    start = time.perf_counter()
+    with open(output_file_path, "w", newline="") as output_file:
+        for i, chunk in enumerate(chunks):
+            chunk_start = time.perf_counter()
+
+            features = chunk.copy()
+            for col in numeric_columns:
+                features[col] = pd.to_numeric(chunk[col], errors="coerce")
+            chunk["prediction"] = model.predict(features.values)
+            chunk.to_csv(output_file, index=False, header=write_header and i == 0)
+
+            total_rows += len(chunk)
+            chunk_seconds = time.perf_counter() - chunk_start
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"{log_prefix}Chunk {i}: {len(chunk)} rows in {chunk_seconds:.2f}s "
+                f"({len(chunk) / max(chunk_seconds, 1e-9):.0f} rows/s), "
+                f"total {total_rows} rows, {total_rows / max(elapsed, 1e-9):.0f} rows/s"
+            )
+    return total_rows
+
+
+class ByteRangeReader:
+    """
+    File-like view over [start, end) of a file, for pd.read_csv.
+    """
+
+    def __init__(self, file_path: str, start: int, end: int):
+        self.file = open(file_path, "rb")
+        self.file.seek(start)
+        self.remaining = end - start
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def compute_shards(input_file_path: str, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split the data section of a CSV into byte ranges that start and end on line boundaries.
+    Assumes no quoted field contains a newline.
+    """
+    size = os.path.getsize(input_file_path)
+    with open(input_file_path, "rb") as file:
+        file.readline()  # header
+        data_start = file.tell()
+        boundaries = [data_start]
+        for k in range(1, n_shards):
+            file.seek(data_start + k * (size - data_start) // n_shards)
+            file.readline()  # move to the start of the next full line
+            boundaries.append(max(file.tell(), boundaries[-1]))
+        boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+_worker_model = None
+
+
+def _init_worker(model_path: str) -> None:
+    # load once per worker process, reused for all of its chunks
+    global _worker_model
+    _worker_model = load_model(model_path)
+
+
+def _score_shard(shard_id: int, input_file_path: str, start: int, end: int, part_path: str,
+                 columns: List[str], numeric_columns: List[str], chunksize: int) -> int:
+    reader = ByteRangeReader(input_file_path, start, end)
+    try:
+        chunks = read_text_chunks(reader, columns, chunksize, has_header=False)
+        return score_chunks(_worker_model, chunks, part_path, numeric_columns,
+                            write_header=False, log_prefix=f"[shard {shard_id}] ")
+    finally:
+        reader.close()
+
+
+def start_parallel_batch_prediction(input_file_path: str, output_file_path: str, workers: int,
+                                    chunksize: int = BATCH_PREDICTION_CHUNK_SIZE,
+                                    model_path: str = SERVING_MODEL_FILE_PATH) -> str:
+    """
+    Split the input into one byte-range shard per worker, score the shards in
+    worker processes and concatenate their outputs in shard order. The result is
+    byte-identical to the single-process streaming path.
+    """
+    columns, numeric_columns = sniff_columns(input_file_path)
+    shards = compute_shards(input_file_path, workers)
+    part_paths = [f"{output_file_path}.part-{i:05d}" for i in range(len(shards))]
+    logger.info(f"Scoring {len(shards)} shards of {input_file_path} with {workers} workers")
+
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+            futures = [
+                pool.submit(_score_shard, i, input_file_path, shard_start, shard_end, part_path,
+                            columns, numeric_columns, chunksize)
+                for i, ((shard_start, shard_end), part_path) in enumerate(zip(shards, part_paths))
+            ]
+            total_rows = sum(future.result() for future in futures)
+
+        # Merge in shard order: header once, then each part as raw bytes
+        with open(output_file_path, "w", newline="") as output_file:
+            pd.DataFrame(columns=columns + ["prediction"]).to_csv(output_file, index=False)
+            output_file.flush()
+            for part_path in part_paths:
+                with open(part_path, "r", newline="") as part_file:
+                    shutil.copyfileobj(part_file, output_file, 16 * 1024 * 1024)
+    finally:
+        for part_path in part_paths:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Parallel batch prediction: {total_rows} rows in {elapsed:.2f}s "
+                f"({total_rows / max(elapsed, 1e-9):.0f} rows/s) with {workers} workers")
+    return output_file_path
+
+
+def start_batch_prediction(input_file_path: str, output_file_path: str, chunksize: int = None, workers: int = 1):
+    """
+    Score a CSV file. With chunksize set, the file is streamed in chunks of
+    that many rows so memory stays constant regardless of the file size.
+    With workers > 1 the file is split across that many processes.
+    """
     try:
         logger.info(f"Batch prediction started for file: {input_file_path}")
 
         if not os.path.exists(input_file_path):
             raise FileNotFoundError(f"Input file not found: {input_file_path}")
 
-        # Load CSV
-        df = pd.read_csv(input_file_path)
-        logger.info(f"Input data shape: {df.shape}")
+        output_dir = os.path.dirname(output_file_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
 
-        # Load trained model
-        model_path = "artifacts/model/trained_model.pkl"
-        if not os.path.exists(model_path):
-            raise FileNotFoundError("Trained model not found. Please train the model first.")
-
-        model: NetworkSecurityModel = joblib.load(model_path)
+        if workers and workers > 1:
+            return start_parallel_batch_prediction(
+                input_file_path, output_file_path, workers, chunksize or BATCH_PREDICTION_CHUNK_SIZE
+            )
 
-        # Predictions
-        predictions = model.predict(df.values)
-        df["prediction"] = predictions
-
-        # Save output file
-        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-        df.to_csv(output_file_path, index=False)
-        logger.info(f"Batch prediction completed. Output saved at: {output_file_path}")
+        # Load trained model
+        model: NetworkSecurityModel = load_model()
 
+        # Streaming mode with chunksize, else the whole file as one chunk: both keep the
+        # input values as written, so every mode produces the same output bytes
+        columns, numeric_columns = sniff_columns(input_file_path)
+        chunks = read_text_chunks(input_file_path, columns, chunksize, has_header=True)
+        total_rows = score_chunks(model, chunks, output_file_path, numeric_columns)
+        logger.info(f"Batch prediction completed: {total_rows} rows. Output saved at: {output_file_path}")
         return output_file_path
 
     except Exception as e:
@@ -46,8 +220,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Batch Prediction for Network Security ML Model")
     parser.add_argument("--input", required=True, help="Path to input CSV file")
     parser.add_argument("--output", required=True, help="Path to save predictions CSV")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help=f"Stream the input in chunks of this many rows (e.g. {BATCH_PREDICTION_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Score byte-range shards of the input in this many processes")
 
     args = parser.parse_args()
 
-    result_path = start_batch_prediction(args.input, args.output)
+    result_path = start_batch_prediction(args.input, args.output, args.chunksize, args.workers)
     print(f"✅ Batch prediction saved at: {result_path}")
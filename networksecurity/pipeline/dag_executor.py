@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import time
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.logging.instrumentation import PipelineMetrics, measure
+
+
+@dataclass
+class Node:
+    """
+    One step of the pipeline DAG.
+
+    func is called with args followed by the outputs of the nodes named in
+    inputs (in that order). With a process pool func and args must be
+    picklable, so use module-level functions. cache_key(*input_outputs)
+    -> fingerprint opts the node into the StageCache; artifact_type is the
+    dataclass to rebuild a cached output as (None for plain JSON values).
+    """
+    name: str
+    func: Callable
+    inputs: List[str] = field(default_factory=list)
+    args: Tuple = ()
+    cache_key: Optional[Callable] = None
+    artifact_type: Optional[type] = None
+
+
+def _timed_call(func: Callable, args: tuple, reset_peak: bool, profile_file_path: Optional[str] = None,
+                profile_top: int = 15):
+    # runs in the worker: time and measure the node where it actually executes; a process
+    # worker runs one node at a time, so its RSS high-water mark can be reset per node
+    start = time.time()
+    with measure(profile_file_path, profile_top, reset_peak=reset_peak) as usage:
+        result = func(*args)
+    return result, start, time.time(), os.getpid(), usage
+
+
+class DagExecutor:
+    """
+    Runs a DAG of Nodes, starting every node as soon as all of its inputs are
+    done, on a pool of worker processes (or threads). Records a timeline of the
+    run: per node queue wait, start/end and worker, plus the critical path and
+    how much of the pool sat idle. With metrics, each node's resource usage
+    (measured in its worker) and artifact rows are added to it.
+    """
+
+    def __init__(self, nodes: List[Node], max_workers: Optional[int] = None, use_processes: bool = True,
+                 stage_cache=None, on_event: Optional[Callable] = None, metrics: Optional[PipelineMetrics] = None):
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Node names must be unique")
+        for node in nodes:
+            for name in node.inputs:
+                if name not in self.nodes:
+                    raise ValueError(f"Node {node.name} depends on unknown node {name}")
+        self.order = self._topological_order()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.stage_cache = stage_cache
+        # on_event(node, event, duration=None), event in started / completed / skipped / failed
+        self.on_event = on_event
+        self.metrics = metrics
+
+    def _topological_order(self) -> List[str]:
+        order, state = [], {}
+
+        def visit(name: str):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Pipeline DAG has a cycle through {name}")
+            state[name] = "visiting"
+            for dependency in self.nodes[name].inputs:
+                visit(dependency)
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    def _emit(self, name: str, event: str, duration: Optional[float] = None) -> None:
+        if self.on_event is None:
+            return
+        if duration is None:
+            self.on_event(name, event)
+        else:
+            self.on_event(name, event, duration)
+
+    def run(self) -> Dict[str, object]:
+        """
+        Execute the DAG; returns {node name: output}. The timeline is left in self.timeline.
+        """
+        try:
+            outputs, records = {}, {}
+            remaining = {name: set(self.nodes[name].inputs) for name in self.order}
+            ready_at = {}
+            running = {}
+            run_start = time.time()
+
+            pool_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            with pool_class(max_workers=self.max_workers) as pool:
+
+                def finish(name: str, output, record: dict) -> None:
+                    outputs[name] = output
+                    records[name] = record
+                    for dependencies in remaining.values():
+                        dependencies.discard(name)
+
+                def schedule() -> None:
+                    # a cache hit finishes a node at once, which can make more nodes ready
+                    progressed = True
+                    while progressed:
+                        progressed = False
+                        for name in [n for n in self.order if n in remaining and not remaining[n]]:
+                            node = self.nodes[name]
+                            del remaining[name]
+                            ready_at[name] = time.time()
+                            upstream = [outputs[dependency] for dependency in node.inputs]
+
+                            fingerprint = None
+                            if self.stage_cache is not None and node.cache_key is not None:
+                                fingerprint = node.cache_key(*upstream)
+                                cached = self.stage_cache.load(name, fingerprint, node.artifact_type)
+                                if cached is not None:
+                                    logging.info(f"⏭️ Node {name} unchanged ({fingerprint[:12]}), reusing its artifact")
+                                    now = time.time()
+                                    self._emit(name, "skipped", 0.0)
+                                    if self.metrics is not None:
+                                        self.metrics.add_stage(name, "skipped", {}, upstream, cached)
+                                    finish(name, cached, {"status": "skipped", "ready": now, "start": now,
+                                                          "end": now, "pid": os.getpid()})
+                                    progressed = True
+                                    continue
+
+                            self._emit(name, "started")
+                            profile_args = () if self.metrics is None else \
+                                (self.metrics.profile_file_path(name), self.metrics.profile_top)
+                            future = pool.submit(_timed_call, node.func, tuple(node.args) + tuple(upstream),
+                                                 self.use_processes, *profile_args)
+                            running[future] = (name, fingerprint, upstream)
+
+                schedule()
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, fingerprint, upstream = running.pop(future)
+                        try:
+                            output, start, end, pid, usage = future.result()
+                        except Exception:
+                            self._emit(name, "failed", time.time() - ready_at[name])
+                            if self.metrics is not None:
+                                self.metrics.add_stage(name, "failed", {"wall_seconds": time.time() - ready_at[name]},
+                                                       upstream)
+                            for pending in running:
+                                pending.cancel()
+                            raise
+                        if fingerprint is not None:
+                            self.stage_cache.save(name, fingerprint, output)
+                        self._emit(name, "completed", end - start)
+                        if self.metrics is not None:
+                            self.metrics.add_stage(name, "completed", usage, upstream, output)
+                        finish(name, output, {"status": "completed", "ready": ready_at[name],
+                                              "start": start, "end": end, "pid": pid})
+                    schedule()
+
+            self.timeline = self._build_timeline(records, run_start, time.time())
+            return outputs
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _build_timeline(self, records: Dict[str, dict], run_start: float, run_end: float) -> dict:
+        makespan = run_end - run_start
+        nodes = {}
+        for name in self.order:
+            record = records[name]
+            nodes[name] = {
+                "status": record["status"],
+                "inputs": self.nodes[name].inputs,
+                "queued_seconds": round(record["start"] - record["ready"], 3),
+                "start": round(record["start"] - run_start, 3),
+                "end": round(record["end"] - run_start, 3),
+                "duration_seconds": round(record["end"] - record["start"], 3),
+                "worker_pid": record["pid"]
+            }
+
+        # walk back from the node that finished last, always through the input that finished last
+        critical_path = []
+        name = max(nodes, key=lambda n: nodes[n]["end"]) if nodes else None
+        while name is not None:
+            critical_path.append(name)
+            inputs = self.nodes[name].inputs
+            name = max(inputs, key=lambda n: nodes[n]["end"]) if inputs else None
+        critical_path.reverse()
+
+        busy = sum(node["duration_seconds"] for node in nodes.values())
+        capacity = self.max_workers * makespan
+        return {
+            "makespan_seconds": round(makespan, 3),
+            "workers": self.max_workers,
+            "busy_seconds": round(busy, 3),
+            "idle_worker_seconds": round(max(0.0, capacity - busy), 3),
+            "average_parallelism": round(busy / makespan, 2) if makespan else 0.0,
+            "critical_path": critical_path,
+            "critical_path_seconds": round(sum(nodes[n]["duration_seconds"] for n in critical_path), 3),
+            "nodes": nodes
+        }
+
+    def save_timeline(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            with open(file_path, "w") as file:
+                json.dump(self.timeline, file, indent=2)
+            timeline = self.timeline
+            logging.info(f"Pipeline timeline: {timeline['makespan_seconds']}s on {timeline['workers']} workers, "
+                         f"critical path {' -> '.join(timeline['critical_path'])} "
+                         f"({timeline['critical_path_seconds']}s), "
+                         f"idle {timeline['idle_worker_seconds']} worker-seconds, saved at {file_path}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import hashlib
+import inspect
+import dataclasses
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.registry import file_checksum
+
+
+def _artifact_files(artifact) -> list:
+    """
+    Paths of the files an artifact points to (every str field naming an existing file).
+    """
+    if isinstance(artifact, (list, tuple)):
+        return [path for value in artifact for path in _artifact_files(value)]
+    if isinstance(artifact, dict):
+        return [path for value in artifact.values() for path in _artifact_files(value)]
+    if not dataclasses.is_dataclass(artifact):
+        return [artifact] if isinstance(artifact, str) and os.path.isfile(artifact) else []
+    files = []
+    for field in dataclasses.fields(artifact):
+        value = getattr(artifact, field.name)
+        if isinstance(value, str) and os.path.isfile(value):
+            files.append(value)
+    return files
+
+
+def _artifact_from_dict(artifact_type, values):
+    # nested dataclasses (metric artifacts) come back from JSON as plain dicts
+    if artifact_type is None:
+        return values
+    kwargs = {}
+    for field in dataclasses.fields(artifact_type):
+        value = values.get(field.name)
+        if dataclasses.is_dataclass(field.type) and isinstance(value, dict):
+            value = _artifact_from_dict(field.type, value)
+        kwargs[field.name] = value
+    return artifact_type(**kwargs)
+
+
+class StageCache:
+    """
+    Make/DVC style memoization of pipeline stages.
+
+    A stage's fingerprint hashes everything its output depends on: its config
+    (with the per-run artifact directory masked out), the content of its input
+    files (upstream artifacts, schema), the source of the component class and
+    any extra values such as the state of the Mongo collection. After a stage
+    runs, a manifest <stage>/<fingerprint>.json records its artifact and the
+    checksum of every file the artifact points to. A later run with the same
+    fingerprint reuses that artifact, as long as its files are still intact.
+    """
+
+    def __init__(self, cache_dir: str, run_artifact_dir: str, reuse: bool = True):
+        self.cache_dir = cache_dir
+        self.run_artifact_dir = run_artifact_dir
+        # reuse=False re-runs every stage but still records fresh manifests
+        self.reuse = reuse
+        # checksums already computed in this run, keyed by (path, size, mtime)
+        self._checksums = {}
+
+    def checksum(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._checksums:
+            self._checksums[key] = file_checksum(file_path)
+        return self._checksums[key]
+
+    def _config_values(self, config) -> dict:
+        values = {}
+        for name, value in sorted(vars(config).items()):
+            if isinstance(value, str) and self.run_artifact_dir:
+                value = value.replace(self.run_artifact_dir, "<run>")
+            values[name] = value
+        return values
+
+    def fingerprint(self, stage: str, config=None, upstream: Iterable = (), files: Iterable[str] = (),
+                    code: Optional[type] = None, extra: Optional[dict] = None) -> str:
+        try:
+            inputs = {
+                "stage": stage,
+                "config": self._config_values(config) if config is not None else None,
+                "upstream": [
+                    {path: self.checksum(path) for path in _artifact_files(artifact)}
+                    for artifact in upstream
+                ],
+                "files": {path: self.checksum(path) for path in files},
+                "code": self.checksum(inspect.getsourcefile(code)) if code is not None else None,
+                "extra": extra
+            }
+            payload = json.dumps(inputs, sort_keys=True, default=str)
+            return hashlib.sha256(payload.encode()).hexdigest()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _manifest_path(self, stage: str, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{fingerprint}.json")
+
+    def load(self, stage: str, fingerprint: str, artifact_type):
+        """
+        The cached artifact for this fingerprint, or None if there is none or its files changed.
+        """
+        if not self.reuse:
+            return None
+        manifest_path = self._manifest_path(stage, fingerprint)
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, "r") as file:
+                manifest = json.load(file)
+            for path, checksum in manifest["outputs"].items():
+                if not os.path.isfile(path) or self.checksum(path) != checksum:
+                    logging.info(f"Stage {stage}: cached output {path} is missing or changed, re-running")
+                    return None
+            return _artifact_from_dict(artifact_type, manifest["artifact"])
+        except Exception as e:
+            logging.warning(f"Stage {stage}: ignoring unreadable cache manifest {manifest_path}: {e}")
+            return None
+
+    def save(self, stage: str, fingerprint: str, artifact) -> None:
+        try:
+            manifest_path = self._manifest_path(stage, fingerprint)
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            manifest = {
+                "stage": stage,
+                "fingerprint": fingerprint,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "artifact": dataclasses.asdict(artifact) if dataclasses.is_dataclass(artifact) else artifact,
+                "outputs": {path: self.checksum(path) for path in _artifact_files(artifact)}
+            }
+            tmp_path = manifest_path + ".tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(manifest, file, indent=2, default=str)
+            os.replace(tmp_path, manifest_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def run(self, stage: str, fingerprint: str, artifact_type, stage_func: Callable):
+        """
+        Returns (artifact, skipped): the cached artifact if the fingerprint matches, else stage_func().
+        """
+        artifact = self.load(stage, fingerprint, artifact_type)
+        if artifact is not None:
+            logging.info(f"⏭️ Stage {stage} unchanged ({fingerprint[:12]}), reusing its artifact")
+            return artifact, True
+        artifact = stage_func()
+        self.save(stage, fingerprint, artifact)
+        return artifact, False
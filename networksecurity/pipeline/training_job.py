@@ -0,0 +1,275 @@
+import os
+import re
+import sys
+import json
+import uuid
+import fcntl
+import argparse
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.constant.training_pipeline import TRAINING_JOBS_DIR, TRAINING_LOCK_FILE_PATH
+
+TRAINING_STAGES = ("data_ingestion", "data_validation", "data_transformation", "model_trainer")
+
+
+class TrainingInProgressError(RuntimeError):
+    """
+    Raised when a training run is submitted while another one holds the artifact lock.
+    """
+
+    def __init__(self, job_id: Optional[str]):
+        super().__init__(f"Training job {job_id} is already running")
+        self.job_id = job_id
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _pid_alive(pid: int) -> bool:
+    """
+    Whether the process exists and has not exited. An exited child stays a zombie
+    until its parent waits for it, and only the server process that started it can;
+    /proc tells a zombie apart in every process. Without /proc (macOS) a zombie
+    counts as alive until the starting process reaps it.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as file:
+            # the state follows the parenthesized command name, which may itself contain spaces
+            return file.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except (OSError, IndexError):
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    One JSON status file per job, replaced atomically on every update so
+    readers in other processes never see a half written file. The server and
+    the training process both update it: writes are serialized by an flock on
+    a <job_id>.json.lock file next to it (the status file itself is replaced,
+    so it cannot carry the lock), and each writer uses its own temporary file.
+    """
+
+    def __init__(self, jobs_dir: str = TRAINING_JOBS_DIR):
+        self.jobs_dir = jobs_dir
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+    def path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def read(self, job_id: str) -> Optional[dict]:
+        try:
+            with open(self.path(job_id), "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _locked(self, job_id: str):
+        fd = os.open(self.path(job_id) + ".lock", os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _replace(self, job: dict) -> None:
+        tmp_path = f"{self.path(job['job_id'])}.tmp{os.getpid()}"
+        with open(tmp_path, "w") as file:
+            json.dump(job, file, indent=2)
+        os.replace(tmp_path, self.path(job["job_id"]))
+
+    def write(self, job: dict) -> None:
+        with self._locked(job["job_id"]):
+            self._replace(job)
+
+    def update(self, job_id: str, expected_status: tuple = None, **fields) -> dict:
+        """
+        Read-modify-write under the job's lock. With expected_status, the fields are
+        only set if the job's status is still one of them; the current record is returned.
+        """
+        with self._locked(job_id):
+            job = self.read(job_id) or {"job_id": job_id}
+            if expected_status is not None and job.get("status") not in expected_status:
+                return job
+            job.update(fields)
+            self._replace(job)
+            return job
+
+
+class TrainingLock:
+    """
+    Exclusive lock over the artifact directory, shared by every server process.
+    It is an flock on the lock file: the kernel drops it when the last process
+    holding the open file exits, so a crashed training never leaves it behind.
+    The file itself only records the owning job id and pid, for error messages.
+    """
+
+    def __init__(self, lock_path: str = TRAINING_LOCK_FILE_PATH):
+        self.lock_path = lock_path
+        self.fd: Optional[int] = None
+
+    def owner(self) -> Optional[dict]:
+        try:
+            with open(self.lock_path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def acquire(self, job_id: str) -> None:
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            owner = self.owner()
+            raise TrainingInProgressError(owner.get("job_id") if owner else None)
+        self.fd = fd
+        self.set_owner_pid(job_id, os.getpid())
+
+    def set_owner_pid(self, job_id: str, pid: int) -> None:
+        # only written by the holder, through the locked descriptor
+        os.ftruncate(self.fd, 0)
+        os.pwrite(self.fd, json.dumps({"job_id": job_id, "pid": pid, "acquired_at": _now()}).encode(), 0)
+
+    def release(self) -> None:
+        # closing the descriptor drops this process's hold; the lock is free once no process holds it
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def _run_training_job(job_id: str, jobs_dir: str, lock_path: str, lock_fd: int) -> None:
+    """
+    Entry point of the training process: runs the pipeline and records stage progress.
+    lock_fd is the training lock's descriptor, inherited from the server process.
+    """
+    store = JobStore(jobs_dir)
+    lock = TrainingLock(lock_path)
+    lock.fd = lock_fd
+    stages = {name: {"status": "pending"} for name in TRAINING_STAGES}
+
+    def on_progress(stage: str, event: str, duration: Optional[float] = None) -> None:
+        record = stages.setdefault(stage, {"status": "pending"})
+        if event == "started":
+            record.update(status="running", started_at=_now())
+            store.update(job_id, current_stage=stage, stages=stages)
+        else:
+            record.update(status=event, finished_at=_now(), duration_seconds=round(duration or 0.0, 3))
+            store.update(job_id, stages=stages)
+
+    try:
+        lock.set_owner_pid(job_id, os.getpid())
+        store.update(job_id, status="running", started_at=_now(), pid=os.getpid(), stages=stages)
+
+        # imported here so the serving process never pays for the training stack
+        from networksecurity.pipeline.training_pipeline import TrainingPipeline
+        artifact = TrainingPipeline(progress_callback=on_progress).run_pipeline()
+
+        store.update(job_id, status="succeeded", finished_at=_now(), current_stage=None,
+                     model_path=getattr(artifact, "trained_model_file_path", None))
+        logging.info(f"Training job {job_id} finished")
+    except Exception as e:
+        store.update(job_id, status="failed", finished_at=_now(), error=str(e))
+        logging.error(f"Training job {job_id} failed: {e}")
+    finally:
+        lock.release()
+
+
+class TrainingJobManager:
+    """
+    Starts training runs in a separate process and reports their progress.
+    """
+
+    def __init__(self, jobs_dir: str = TRAINING_JOBS_DIR, lock_path: str = TRAINING_LOCK_FILE_PATH):
+        self.store = JobStore(jobs_dir)
+        self.lock_path = lock_path
+        self._processes: Dict[str, subprocess.Popen] = {}
+
+    def submit(self) -> dict:
+        """
+        Start a training job and return its initial record.
+        Raises TrainingInProgressError if another job holds the lock.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        lock = TrainingLock(self.lock_path)
+        lock.acquire(job_id)
+        try:
+            job = {
+                "job_id": job_id,
+                "status": "queued",
+                "created_at": _now(),
+                "current_stage": None,
+                "stages": {name: {"status": "pending"} for name in TRAINING_STAGES}
+            }
+            self.store.write(job)
+
+            # a fresh interpreter running this module: unlike multiprocessing's spawn, it does not
+            # re-import the server's main module (model registry, watcher and drift monitor threads)
+            process = subprocess.Popen(
+                [sys.executable, "-m", "networksecurity.pipeline.training_job", job_id,
+                 "--jobs-dir", self.store.jobs_dir, "--lock-path", self.lock_path, "--lock-fd", str(lock.fd)],
+                pass_fds=(lock.fd,)
+            )
+            self._processes[job_id] = process
+            # recorded here, so a child that dies before reporting is still detected
+            job["pid"] = process.pid
+            self.store.update(job_id, pid=process.pid)
+            lock.set_owner_pid(job_id, process.pid)
+
+            logging.info(f"🚀 Training job {job_id} started in process {process.pid}")
+            return job
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+        finally:
+            # the child holds the lock through its inherited descriptor
+            lock.release()
+
+    def _reap(self) -> None:
+        for job_id, process in list(self._processes.items()):
+            if process.poll() is not None:
+                del self._processes[job_id]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Current record of a job; a job whose process died without reporting is marked failed.
+        """
+        try:
+            if not re.fullmatch(r"[0-9a-f]{12}", job_id or ""):
+                return None
+            self._reap()  # let this process's own finished children go
+            job = self.store.read(job_id)
+            if job and job.get("status") in ("queued", "running") and job.get("pid") \
+                    and not _pid_alive(job["pid"]):
+                # the process may have recorded its result just before exiting: only a job
+                # that is still unfinished under the lock is marked failed
+                job = self.store.update(job_id, expected_status=("queued", "running"), status="failed",
+                                        finished_at=_now(), error="training process exited unexpectedly")
+            return job
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one training job (started by TrainingJobManager)")
+    parser.add_argument("job_id")
+    parser.add_argument("--jobs-dir", default=TRAINING_JOBS_DIR)
+    parser.add_argument("--lock-path", default=TRAINING_LOCK_FILE_PATH)
+    parser.add_argument("--lock-fd", type=int, required=True)
+    args = parser.parse_args()
+    _run_training_job(args.job_id, args.jobs_dir, args.lock_path, args.lock_fd)
@@ -1,6 +1,10 @@
+import os
 import sys
-from networksecurity.logging import logger
-from networksecurity.exception import NetworkSecurityException
+import time
+from typing import Callable, Optional
+from networksecurity.logging.logger import logging as logger
+from networksecurity.logging.instrumentation import PipelineMetrics
+from networksecurity.exception.exception import NetworkSecurityException
 
 from networksecurity.components.data_ingestion import DataIngestion
 from networksecurity.components.data_validation import DataValidation
@@ -17,47 +21,231 @@ from networksecurity.entity.artifact_entity import (
     ModelEvaluationArtifact,
     ModelPusherArtifact
 )
+from networksecurity.entity.config_entity import (
+    TrainingPipelineConfig,
+    DataIngestionConfig,
+    DataValidationConfig,
+    DataTransformationConfig,
+    ModelTrainerConfig
+)
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
+from networksecurity.pipeline.stage_cache import StageCache
+from networksecurity.pipeline.dag_executor import DagExecutor, Node
+from networksecurity.utils.main_utils.utils import read_yaml_file
+from networksecurity.utils.ml_utils.model.registry import publish_model
+from networksecurity.utils.ml_utils.model import search as search_module
+
+
+# DAG nodes: module-level so they can be sent to worker processes
+
+def _ingest_node(config: TrainingPipelineConfig) -> DataIngestionArtifact:
+    return DataIngestion(DataIngestionConfig(config)).initiate_data_ingestion()
+
+
+def _validation_node(config: TrainingPipelineConfig,
+                     data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
+    data_validation = DataValidation(data_ingestion_artifact, DataValidationConfig(config))
+    return data_validation.initiate_data_validation(detect_drift=False)
+
+
+def _drift_node(config: TrainingPipelineConfig, data_ingestion_artifact: DataIngestionArtifact) -> list:
+    data_validation_config = DataValidationConfig(config)
+    drift_report_file = DataValidation(data_ingestion_artifact, data_validation_config).generate_drift_report()
+    return [drift_report_file, data_validation_config.drift_reference_file_path]
+
+
+def _preprocessor_fit_node(config: TrainingPipelineConfig, data_ingestion_artifact: DataIngestionArtifact) -> str:
+    data_transformation = DataTransformation(data_ingestion_artifact, None, DataTransformationConfig(config))
+    return data_transformation.fit_preprocessor(read_yaml_file(SCHEMA_FILE_PATH))
+
+
+def _transformation_node(config: TrainingPipelineConfig, data_ingestion_artifact: DataIngestionArtifact,
+                         data_validation_artifact: DataValidationArtifact,
+                         preprocessor_file_path: str) -> DataTransformationArtifact:
+    data_transformation = DataTransformation(
+        data_ingestion_artifact, data_validation_artifact, DataTransformationConfig(config)
+    )
+    return data_transformation.transform_data(read_yaml_file(SCHEMA_FILE_PATH), preprocessor_file_path)
+
+
+def _model_search_node(config: TrainingPipelineConfig, family_name: Optional[str], n_jobs: int,
+                       data_transformation_artifact: DataTransformationArtifact) -> dict:
+    model_trainer = ModelTrainer(data_transformation_artifact, ModelTrainerConfig(config))
+    return model_trainer.search_family(family_name, n_jobs)
+
+
+def _model_trainer_node(config: TrainingPipelineConfig, data_transformation_artifact: DataTransformationArtifact,
+                        drift_files: list, *search_results: dict) -> ModelTrainerArtifact:
+    model_trainer = ModelTrainer(data_transformation_artifact, ModelTrainerConfig(config))
+    drift_report_file, drift_reference_file = drift_files
+    return model_trainer.save_best_model(list(search_results), drift_reference_file)
+
+
+def _incremental_update_node(config: TrainingPipelineConfig, data_ingestion_artifact: DataIngestionArtifact,
+                             data_validation_artifact: DataValidationArtifact) -> Optional[ModelTrainerArtifact]:
+    if not data_validation_artifact.validation_status:
+        logger.warning("Ingested data failed validation, not updating the model on it incrementally")
+        return None
+    model_trainer = ModelTrainer(None, ModelTrainerConfig(config))
+    return model_trainer.initiate_incremental_training(data_ingestion_artifact, read_yaml_file(SCHEMA_FILE_PATH))
+
 
 class TrainingPipeline:
-    def __init__(self):
+    def __init__(self, progress_callback: Optional[Callable] = None, force: bool = False):
+        """
+        progress_callback(stage, event, duration=None) is called when a stage
+        starts ("started") and ends ("completed" / "skipped" / "failed").
+        Stages whose inputs are unchanged since an earlier run are skipped;
+        force=True re-runs all of them. Stage metrics go to metrics.json in
+        the run's artifact directory.
+        """
         logger.info("Training pipeline started...")
+        self.training_pipeline_config = TrainingPipelineConfig()
+        self.progress_callback = progress_callback
+        self.stage_cache = StageCache(
+            self.training_pipeline_config.stage_cache_dir,
+            self.training_pipeline_config.artifact_dir,
+            reuse=not force
+        )
+        self.skipped_stages = set()
+        config = self.training_pipeline_config
+        self.metrics = PipelineMetrics(
+            config.metrics_file_path,
+            run=config.timestamp,
+            executor=config.executor,
+            profile_dir=config.profile_dir if config.profile else None,
+            profile_top=config.profile_top_functions,
+            regression_threshold=config.regression_threshold,
+            regression_min_seconds=config.regression_min_seconds,
+            regression_min_mb=config.regression_min_mb
+        )
+
+    def _run_stage(self, stage_name: str, stage_func: Callable, *args):
+        """Run one stage, measuring it and reporting progress"""
+        if self.progress_callback is not None:
+            self.progress_callback(stage_name, "started")
+        start = time.perf_counter()
+        try:
+            with self.metrics.stage(stage_name, inputs=list(args)) as record:
+                artifact = stage_func(*args)
+                record["output"] = artifact
+                if stage_name in self.skipped_stages:
+                    record["status"] = "skipped"
+        except Exception:
+            if self.progress_callback is not None:
+                self.progress_callback(stage_name, "failed", time.perf_counter() - start)
+            raise
+        duration = time.perf_counter() - start
+        event = "skipped" if stage_name in self.skipped_stages else "completed"
+        logger.info(f"Stage {stage_name} {event} in {duration:.2f}s")
+        if self.progress_callback is not None:
+            self.progress_callback(stage_name, event, duration)
+        return artifact
+
+    def _cached(self, stage_name: str, fingerprint: str, artifact_type, stage_func: Callable):
+        artifact, skipped = self.stage_cache.run(stage_name, fingerprint, artifact_type, stage_func)
+        if skipped:
+            self.skipped_stages.add(stage_name)
+        return artifact
 
     def start_data_ingestion(self) -> DataIngestionArtifact:
         try:
             logger.info("Starting data ingestion...")
-            data_ingestion = DataIngestion()
-            data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
-            return data_ingestion_artifact
+            data_ingestion_config = DataIngestionConfig(self.training_pipeline_config)
+            data_ingestion = DataIngestion(data_ingestion_config)
+            fingerprint = self.stage_cache.fingerprint(
+                "data_ingestion", config=data_ingestion_config, files=[SCHEMA_FILE_PATH],
+                code=DataIngestion, extra=data_ingestion.source_fingerprint()
+            )
+            return self._cached("data_ingestion", fingerprint, DataIngestionArtifact,
+                                data_ingestion.initiate_data_ingestion)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
     def start_data_validation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
         try:
             logger.info("Starting data validation...")
-            data_validation = DataValidation(data_ingestion_artifact)
-            data_validation_artifact = data_validation.initiate_data_validation()
-            return data_validation_artifact
+            data_validation_config = DataValidationConfig(self.training_pipeline_config)
+            data_validation = DataValidation(data_ingestion_artifact, data_validation_config)
+            fingerprint = self.stage_cache.fingerprint(
+                "data_validation", config=data_validation_config, upstream=[data_ingestion_artifact],
+                files=[SCHEMA_FILE_PATH], code=DataValidation
+            )
+            return self._cached("data_validation", fingerprint, DataValidationArtifact,
+                                data_validation.initiate_data_validation)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def start_data_transformation(self, data_validation_artifact: DataValidationArtifact) -> DataTransformationArtifact:
+    def start_data_transformation(self, data_ingestion_artifact: DataIngestionArtifact,
+                                  data_validation_artifact: DataValidationArtifact) -> DataTransformationArtifact:
         try:
             logger.info("Starting data transformation...")
-            data_transformation = DataTransformation(data_validation_artifact)
-            data_transformation_artifact = data_transformation.initiate_data_transformation()
-            return data_transformation_artifact
+            data_transformation_config = DataTransformationConfig(self.training_pipeline_config)
+            data_transformation = DataTransformation(
+                data_ingestion_artifact, data_validation_artifact, data_transformation_config
+            )
+            schema = read_yaml_file(SCHEMA_FILE_PATH)
+            fingerprint = self.stage_cache.fingerprint(
+                "data_transformation", config=data_transformation_config,
+                upstream=[data_ingestion_artifact, data_validation_artifact],
+                files=[SCHEMA_FILE_PATH], code=DataTransformation
+            )
+            return self._cached("data_transformation", fingerprint, DataTransformationArtifact,
+                                lambda: data_transformation.initiate_data_transformation(schema))
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact) -> ModelTrainerArtifact:
+    def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact,
+                            data_validation_artifact: DataValidationArtifact = None) -> ModelTrainerArtifact:
         try:
             logger.info("Starting model training...")
-            model_trainer = ModelTrainer(data_transformation_artifact)
-            model_trainer_artifact = model_trainer.initiate_model_trainer()
-            return model_trainer_artifact
+            model_trainer_config = ModelTrainerConfig(self.training_pipeline_config)
+            model_trainer = ModelTrainer(data_transformation_artifact, model_trainer_config)
+            drift_reference_file = getattr(data_validation_artifact, "drift_reference_file_path", None)
+            fingerprint = self.stage_cache.fingerprint(
+                "model_trainer", config=model_trainer_config,
+                upstream=[data_transformation_artifact, drift_reference_file], code=ModelTrainer
+            )
+            return self._cached("model_trainer", fingerprint, ModelTrainerArtifact,
+                                lambda: model_trainer.initiate_model_trainer(drift_reference_file))
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
+    def start_incremental_update(self, data_ingestion_artifact: DataIngestionArtifact,
+                                 data_validation_artifact: DataValidationArtifact) -> Optional[ModelTrainerArtifact]:
+        """
+        Update the previous model on the validated ingestion delta; None when a full retrain
+        is needed (or the data failed validation, which the full path then reports)
+        """
+        try:
+            logger.info("Starting incremental model update...")
+            return _incremental_update_node(self.training_pipeline_config, data_ingestion_artifact,
+                                            data_validation_artifact)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _skip_training_stages(self) -> None:
+        # the incremental update replaced them: report them as skipped rather than pending
+        for stage_name in ("data_transformation", "model_trainer"):
+            self.metrics.add_stage(stage_name, "skipped", {})
+            if self.progress_callback is not None:
+                self.progress_callback(stage_name, "skipped", 0.0)
+
+    def publish_serving_model(self, model_trainer_artifact: ModelTrainerArtifact) -> dict:
+        """Copy the trained model to the serving paths, where the model registries pick it up"""
+        try:
+            return publish_model(model_trainer_artifact.trained_model_file_path,
+                                 model_trainer_artifact.compiled_model_file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def save_metrics(self) -> None:
+        # metrics are diagnostics: failing to write them must not fail the run
+        try:
+            self.metrics.save()
+        except Exception as e:
+            logger.warning(f"Pipeline metrics not saved: {e}")
+
     def start_model_evaluation(self, data_ingestion_artifact: DataIngestionArtifact,
                                model_trainer_artifact: ModelTrainerArtifact) -> ModelEvaluationArtifact:
         try:
@@ -77,21 +265,152 @@ class TrainingPipeline:
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
+    def build_dag(self, incremental: bool = False) -> list:
+        """
+        The pipeline as a DAG. Schema checks, drift report and preprocessor fit
+        only need the ingested split; the model families are searched separately.
+        incremental=True builds only ingestion, validation and the incremental model
+        update, the same stages the sequential executor runs in that mode.
+        """
+        config = self.training_pipeline_config
+        cache = self.stage_cache
+        candidate_models = {family["name"]: {"model": repr(family["model"]), "param_grid": family["param_grid"]}
+                            for family in ModelTrainer.get_candidate_models()}
+        workers = config.max_workers or os.cpu_count() or 1
+        # one search per family only pays off with a worker per search; on one worker the
+        # per-family searches run one after another and lose the shared halving rungs
+        families = list(candidate_models) if workers > 1 else [None]
+        search_n_jobs = max(1, workers // len(families))
+
+        def ingestion_key():
+            data_ingestion_config = DataIngestionConfig(config)
+            return cache.fingerprint(
+                "data_ingestion", config=data_ingestion_config, files=[SCHEMA_FILE_PATH], code=DataIngestion,
+                extra=DataIngestion(data_ingestion_config).source_fingerprint()
+            )
+
+        def stage_key(stage, stage_config, code, files=(SCHEMA_FILE_PATH,), extra=None):
+            return lambda *upstream: cache.fingerprint(
+                stage, config=stage_config, upstream=upstream, files=files, code=code, extra=extra
+            )
+
+        def search_node(family):
+            name = f"model_search_{family}" if family else "model_search"
+            searched = {family: candidate_models[family]} if family else candidate_models
+            return Node(name, _model_search_node, inputs=["data_transformation"],
+                        args=(config, family, search_n_jobs),
+                        # the transformed arrays, the trainer config and the searched grids
+                        cache_key=stage_key(name, ModelTrainerConfig(config), ModelTrainer,
+                                            files=(search_module.__file__,), extra={"families": searched}))
+
+        ingestion = Node("data_ingestion", _ingest_node, args=(config,),
+                         cache_key=ingestion_key, artifact_type=DataIngestionArtifact)
+        validation = Node("data_validation", _validation_node, inputs=["data_ingestion"], args=(config,),
+                          cache_key=stage_key("data_validation", DataValidationConfig(config), DataValidation),
+                          artifact_type=DataValidationArtifact)
+        if incremental:
+            return [ingestion, validation,
+                    Node("incremental_update", _incremental_update_node,
+                         inputs=["data_ingestion", "data_validation"], args=(config,))]
+        return [
+            ingestion,
+            validation,
+            # the output list is built by _drift_node itself, so this module is part of the key
+            Node("drift_report", _drift_node, inputs=["data_ingestion"], args=(config,),
+                 cache_key=stage_key("drift_report", DataValidationConfig(config), DataValidation,
+                                     files=(SCHEMA_FILE_PATH, __file__))),
+            Node("preprocessor_fit", _preprocessor_fit_node, inputs=["data_ingestion"], args=(config,),
+                 cache_key=stage_key("preprocessor_fit", DataTransformationConfig(config), DataTransformation)),
+            Node("data_transformation", _transformation_node,
+                 inputs=["data_ingestion", "data_validation", "preprocessor_fit"], args=(config,),
+                 cache_key=stage_key("data_transformation", DataTransformationConfig(config), DataTransformation),
+                 artifact_type=DataTransformationArtifact),
+            *[search_node(family) for family in families],
+            Node("model_trainer", _model_trainer_node,
+                 inputs=["data_transformation", "drift_report"] + [
+                     f"model_search_{family}" if family else "model_search" for family in families],
+                 args=(config,),
+                 # the refitted estimators are keyed by what was searched, not by their pickled bytes
+                 cache_key=lambda data_transformation_artifact, drift_files, *results: cache.fingerprint(
+                     "model_trainer", config=ModelTrainerConfig(config),
+                     upstream=[data_transformation_artifact, drift_files], code=ModelTrainer,
+                     extra={"searches": [
+                         {key: result[key] for key in ("family", "best_params", "best_cv_score", "best_n_samples")}
+                         for result in results
+                     ]}
+                 ),
+                 artifact_type=ModelTrainerArtifact)
+        ]
+
+    def _run_dag(self, nodes: list) -> dict:
+        config = self.training_pipeline_config
+        executor = DagExecutor(
+            nodes,
+            max_workers=config.max_workers,
+            stage_cache=self.stage_cache,
+            on_event=self.progress_callback,
+            metrics=self.metrics
+        )
+        outputs = executor.run()
+        executor.save_timeline(config.timeline_file_path)
+        return outputs
+
+    def run_pipeline_dag(self) -> ModelTrainerArtifact:
+        try:
+            if ModelTrainerConfig(self.training_pipeline_config).training_mode == "incremental":
+                model_trainer_artifact = self._run_dag(self.build_dag(incremental=True))["incremental_update"]
+                if model_trainer_artifact is not None:
+                    self._skip_training_stages()
+                    self.publish_serving_model(model_trainer_artifact)
+                    logger.info("Training pipeline completed successfully ✅")
+                    return model_trainer_artifact
+                # full retrain: the ingestion and validation nodes are stage cache hits this time
+
+            model_trainer_artifact = self._run_dag(self.build_dag())["model_trainer"]
+            self.publish_serving_model(model_trainer_artifact)
+            logger.info("Training pipeline completed successfully ✅")
+            return model_trainer_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
     def run_pipeline(self):
         try:
+            self.metrics.executor = self.training_pipeline_config.executor
+            if self.training_pipeline_config.executor == "dag":
+                return self.run_pipeline_dag()
+
             # Sequential Execution of Pipeline
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(data_ingestion_artifact)
-            data_transformation_artifact = self.start_data_transformation(data_validation_artifact)
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifact)
-            model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact, model_trainer_artifact)
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact)
+            data_ingestion_artifact = self._run_stage("data_ingestion", self.start_data_ingestion)
+            data_validation_artifact = self._run_stage(
+                "data_validation", self.start_data_validation, data_ingestion_artifact
+            )
+            model_trainer_artifact = None
+            if ModelTrainerConfig(self.training_pipeline_config).training_mode == "incremental":
+                model_trainer_artifact = self._run_stage(
+                    "incremental_update", self.start_incremental_update,
+                    data_ingestion_artifact, data_validation_artifact
+                )
+                if model_trainer_artifact is not None:
+                    self._skip_training_stages()
+            if model_trainer_artifact is None:
+                data_transformation_artifact = self._run_stage(
+                    "data_transformation", self.start_data_transformation,
+                    data_ingestion_artifact, data_validation_artifact
+                )
+                model_trainer_artifact = self._run_stage(
+                    "model_trainer", self.start_model_trainer, data_transformation_artifact, data_validation_artifact
+                )
+            # model evaluation / pusher components are not implemented yet (see the imports above):
+            # every successful run is served
+            self.publish_serving_model(model_trainer_artifact)
 
             logger.info("Training pipeline completed successfully ✅")
-            return model_pusher_artifact
+            return model_trainer_artifact
 
         except Exception as e:
             raise NetworkSecurityException(e, sys)
+        finally:
+            self.save_metrics()
 
 if __name__ == "__main__":
     pipeline = TrainingPipeline()
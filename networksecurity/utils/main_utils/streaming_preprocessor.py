@@ -0,0 +1,265 @@
+import os
+import sys
+from collections import Counter
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import save_feature_matrix
+from networksecurity.utils.ml_utils.drift.sketch import QuantileSketch
+
+ChunkSource = Callable[[], Iterable[pd.DataFrame]]
+
+# median columns keep exact value counts up to this many distinct values, then only the sketch
+EXACT_MEDIAN_MAX_DISTINCT = 4096
+
+
+def _branch_steps(name: str, transformer) -> List[tuple]:
+    if isinstance(transformer, str):
+        if transformer in ("drop", "passthrough"):
+            return []
+        raise ValueError(f"{name}: unsupported transformer {transformer!r}")
+    steps = transformer.steps if isinstance(transformer, Pipeline) else [(name, transformer)]
+    for step_name, step in steps:
+        if not isinstance(step, (SimpleImputer, OneHotEncoder, StandardScaler)) and step != "passthrough":
+            raise ValueError(f"{name}: streaming fit does not support {type(step).__name__} ({step_name})")
+    scalers = [i for i, (_, step) in enumerate(steps) if isinstance(step, StandardScaler)]
+    if len(scalers) > 1 or (scalers and scalers[0] != len(steps) - 1):
+        raise ValueError(f"{name}: streaming fit needs at most one StandardScaler, as the last step")
+    return steps
+
+
+def _find_step(transformer, step_type):
+    steps = transformer.steps if isinstance(transformer, Pipeline) else [(None, transformer)]
+    return next((step for _, step in steps if isinstance(step, step_type)), None)
+
+
+class StreamingPreprocessorFitter:
+    """
+    Fits the imputer / one-hot / scaler ColumnTransformer of DataTransformation
+    without holding the train split in memory, in two passes over its chunks:
+
+     1. per column: a QuantileSketch for medians (exact value counts while a
+        column has few distinct values), running sums for means and value
+        counts for the most_frequent fills and the one-hot vocabularies
+     2. StandardScaler.partial_fit on every imputed (and encoded) chunk
+
+    Between the passes the ColumnTransformer is fitted on a tiny frame holding
+    every category once, which gives it the structure and categories_ of the
+    full fit, and the imputer statistics are replaced by the streamed ones.
+    The result transforms like the in-memory fit. Medians of high-cardinality
+    columns are within the sketch's relative accuracy of a data value near the
+    median; everything else is exact up to float rounding.
+    """
+
+    def __init__(self, preprocessor: ColumnTransformer, relative_accuracy: float = 0.001):
+        self.preprocessor = preprocessor
+        self.relative_accuracy = relative_accuracy
+        self.branches = []
+        for name, transformer, columns in preprocessor.transformers:
+            if not len(columns):
+                # ColumnTransformer leaves branches without columns unfitted
+                continue
+            steps = _branch_steps(name, transformer)
+            self.branches.append({
+                "name": name,
+                "columns": list(columns),
+                "imputer": _find_step(transformer, SimpleImputer) if steps else None,
+                "encoder": _find_step(transformer, OneHotEncoder) if steps else None
+            })
+
+    # ---------- pass 1 ----------
+    def _collect_statistics(self, chunks: Iterable[pd.DataFrame]) -> dict:
+        sketch_columns, mean_columns, count_columns = set(), set(), set()
+        for branch in self.branches:
+            imputer = branch["imputer"]
+            strategy = imputer.strategy if imputer is not None else None
+            if strategy == "median":
+                sketch_columns.update(branch["columns"])
+            elif strategy == "mean":
+                mean_columns.update(branch["columns"])
+            if strategy == "most_frequent" or branch["encoder"] is not None:
+                count_columns.update(branch["columns"])
+
+        stats = {"rows": 0, "columns": None, "dtypes": {},
+                 "sketches": {name: QuantileSketch(self.relative_accuracy) for name in sketch_columns},
+                 "median_counts": {name: Counter() for name in sketch_columns},
+                 "sums": {name: [0.0, 0] for name in mean_columns},
+                 "counts": {name: Counter() for name in count_columns}}
+        for chunk in chunks:
+            if stats["columns"] is None:
+                stats["columns"] = list(chunk.columns)
+            stats["rows"] += len(chunk)
+            for name in chunk.columns:
+                seen, dtype = stats["dtypes"].get(name), chunk[name].dtype
+                if seen is not None and seen != dtype:
+                    # an int column turns float in chunks with missing values, like in the full frame
+                    dtype = np.result_type(seen, dtype) if seen.kind in "biuf" and dtype.kind in "biuf" \
+                        else np.dtype(object)
+                stats["dtypes"][name] = dtype
+            for name, sketch in stats["sketches"].items():
+                values = chunk[name].to_numpy(dtype=np.float64, na_value=np.nan)
+                sketch.update(values)
+                counter = stats["median_counts"][name]
+                if counter is not None:
+                    counter.update(pd.Series(values[np.isfinite(values)]).value_counts().to_dict())
+                    if len(counter) > EXACT_MEDIAN_MAX_DISTINCT:
+                        stats["median_counts"][name] = None
+            for name, total in stats["sums"].items():
+                values = chunk[name].to_numpy(dtype=np.float64, na_value=np.nan)
+                present = ~np.isnan(values)
+                total[0] += float(values[present].sum())
+                total[1] += int(present.sum())
+            for name, counter in stats["counts"].items():
+                counter.update(chunk[name].dropna().value_counts().to_dict())
+        if not stats["rows"]:
+            raise ValueError("No rows to fit the preprocessor on")
+        return stats
+
+    @staticmethod
+    def _statistic(strategy: str, name: str, stats: dict, fill_value):
+        if strategy == "median":
+            sketch, counter = stats["sketches"][name], stats["median_counts"][name]
+            if not sketch.count:
+                return np.nan
+            if counter is None:
+                return float(np.clip(sketch.quantile(0.5), sketch.min, sketch.max))
+            # exact, like np.median: the middle value, or the mean of the two middle values
+            values = np.array(sorted(counter))
+            ends = np.cumsum([counter[value] for value in values.tolist()])
+            lower = values[np.searchsorted(ends, (sketch.count - 1) // 2, side="right")]
+            upper = values[np.searchsorted(ends, sketch.count // 2, side="right")]
+            return float((lower + upper) / 2)
+        if strategy == "mean":
+            total, count = stats["sums"][name]
+            return total / count if count else np.nan
+        if strategy == "most_frequent":
+            counter = stats["counts"][name]
+            if not counter:
+                return np.nan
+            top = max(counter.values())
+            # ties go to the smallest value, as in SimpleImputer
+            return min(value for value, count in counter.items() if count == top)
+        return fill_value
+
+    def _summary_frame(self, stats: dict) -> pd.DataFrame:
+        # every category of every encoded column at least once, other columns at their fill value
+        vocabularies = {name: sorted(counter) for name, counter in stats["counts"].items() if counter}
+        n_rows = max([2] + [len(values) for values in vocabularies.values()])
+        frame = {}
+        for name in stats["columns"]:
+            if name in vocabularies:
+                values = vocabularies[name]
+                column = [values[i % len(values)] for i in range(n_rows)]
+            else:
+                sketch = stats["sketches"].get(name)
+                column = [sketch.min if sketch is not None and sketch.count else 0] * n_rows
+            frame[name] = pd.Series(column, dtype=stats["dtypes"][name])
+        return pd.DataFrame(frame)
+
+    # ---------- pass 2 ----------
+    def _fit_scalers(self, fitted: ColumnTransformer, chunks: Iterable[pd.DataFrame]) -> None:
+        scalers = []
+        for name, transformer, columns in fitted.transformers_:
+            scaler = _find_step(transformer, StandardScaler) if not isinstance(transformer, str) else None
+            if scaler is None or not len(columns):
+                continue
+            # forget the summary frame fit: partial_fit starts over without n_samples_seen_
+            for attribute in ("n_samples_seen_", "mean_", "var_", "scale_"):
+                if hasattr(scaler, attribute):
+                    delattr(scaler, attribute)
+            before = transformer[:-1] if isinstance(transformer, Pipeline) and len(transformer.steps) > 1 else None
+            scalers.append((scaler, before, list(columns)))
+        if not scalers:
+            return
+        for chunk in chunks:
+            for scaler, before, columns in scalers:
+                values = chunk[columns]
+                scaler.partial_fit(before.transform(values) if before is not None else values)
+
+    def _set_sparse_output(self, fitted: ColumnTransformer, stats: dict) -> None:
+        # the summary frame's density says nothing about the data: recount it the way
+        # ColumnTransformer does, dense blocks in full and one non-zero per one-hot column
+        nnz, width, any_sparse = 0, 0, False
+        for branch in self.branches:
+            name = branch["name"]
+            if name not in fitted.output_indices_:
+                continue
+            indices = fitted.output_indices_[name]
+            branch_width = indices.stop - indices.start
+            width += branch_width
+            encoder = _find_step(fitted.named_transformers_[name], OneHotEncoder)
+            if encoder is not None and encoder.sparse_output:
+                any_sparse = True
+                nnz += len(branch["columns"])
+            else:
+                nnz += branch_width
+        fitted.sparse_output_ = bool(any_sparse and width and nnz / width < fitted.sparse_threshold)
+
+    def fit(self, chunk_source: ChunkSource) -> ColumnTransformer:
+        """
+        Fit on the chunks yielded by chunk_source(); it is called once per pass.
+        """
+        try:
+            stats = self._collect_statistics(chunk_source())
+            fitted = clone(self.preprocessor).fit(self._summary_frame(stats))
+
+            for branch in self.branches:
+                transformer = fitted.named_transformers_.get(branch["name"])
+                imputer = branch["imputer"]
+                if imputer is None or transformer is None:
+                    continue
+                fitted_imputer = _find_step(transformer, SimpleImputer)
+                statistics = [self._statistic(imputer.strategy, name, stats, imputer.fill_value)
+                              for name in branch["columns"]]
+                fitted_imputer.statistics_ = np.asarray(statistics, dtype=fitted_imputer.statistics_.dtype)
+
+            self._fit_scalers(fitted, chunk_source())
+            self._set_sparse_output(fitted, stats)
+            logging.info(f"Streaming preprocessor fit on {stats['rows']} rows, "
+                         f"sparse output: {fitted.sparse_output_}")
+            return fitted
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+def transform_to_disk(preprocessor: ColumnTransformer, chunks: Iterable[pd.DataFrame], n_rows: int,
+                      file_path: str, dtype=np.float32) -> str:
+    """
+    Transform chunk by chunk. Dense output is written straight into a .npy
+    memmap of n_rows rows, so memory stays at one chunk. Sparse output is
+    gathered as CSR blocks (its size is the non-zeros only) and saved as .npz.
+    Returns the path written.
+    """
+    try:
+        blocks, output, offset = [], None, 0
+        for chunk in chunks:
+            block = preprocessor.transform(chunk)
+            if sparse.issparse(block):
+                blocks.append(sparse.csr_matrix(block, dtype=dtype))
+            else:
+                if output is None:
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    output = np.lib.format.open_memmap(file_path, mode="w+", dtype=dtype,
+                                                       shape=(n_rows, block.shape[1]))
+                output[offset:offset + block.shape[0]] = block
+            offset += block.shape[0]
+        if offset == 0 or offset != n_rows:
+            raise ValueError(f"Expected {n_rows} rows, transformed {offset}")
+        if blocks:
+            return save_feature_matrix(file_path, sparse.vstack(blocks, format="csr"), dtype)
+        output.flush()
+        del output
+        logging.info(f"✅ {n_rows} transformed rows streamed to {file_path}")
+        return file_path
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
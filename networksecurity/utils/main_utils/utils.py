@@ -3,8 +3,10 @@ import sys
 import yaml
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from pymongo import MongoClient
 from dotenv import load_dotenv
+from typing import Tuple
 
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
@@ -40,46 +42,201 @@ def write_yaml_file(file_path: str, content: dict, replace: bool = False) -> Non
         raise NetworkSecurityException(e, sys)
 
 
-def save_numpy_array(file_path: str, array: np.ndarray) -> None:
+def save_numpy_array(file_path: str, array: np.ndarray, dtype=None) -> None:
     """
-    Save a NumPy array to file.
+    Save a NumPy array to file, C-contiguous (and cast to dtype if given) so it can be memory-mapped.
     """
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        np.save(file_path, array)
+        np.save(file_path, np.ascontiguousarray(array, dtype=dtype))
         logging.info(f"✅ NumPy array saved at {file_path}")
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
 
-def load_numpy_array(file_path: str) -> np.ndarray:
+def load_numpy_array(file_path: str, mmap_mode: str = None) -> np.ndarray:
     """
-    Load a NumPy array from file.
+    Load a NumPy array from file. With mmap_mode="r" the array is a read-only
+    view of the file: pages are read on demand and shared by every process mapping it.
     """
     try:
-        return np.load(file_path, allow_pickle=True)
+        return np.load(file_path, mmap_mode=mmap_mode, allow_pickle=mmap_mode is None)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def save_feature_matrix(file_path: str, matrix, dtype=None) -> str:
+    """
+    Save a feature matrix: dense as a memory-mappable .npy, sparse as an
+    uncompressed CSR .npz next to it. Returns the path actually written.
+    """
+    try:
+        if not sparse.issparse(matrix):
+            save_numpy_array(file_path, matrix, dtype)
+            return file_path
+        file_path = os.path.splitext(file_path)[0] + ".npz"
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        sparse.save_npz(file_path, sparse.csr_matrix(matrix, dtype=dtype), compressed=False)
+        logging.info(f"✅ Sparse matrix saved at {file_path}")
+        return file_path
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def load_feature_matrix(file_path: str, mmap_mode: str = None):
+    """
+    Load a matrix saved by save_feature_matrix: CSR for .npz, else a (memory-mapped) ndarray.
+    """
+    try:
+        if file_path.endswith(".npz"):
+            return sparse.load_npz(file_path).tocsr()
+        return load_numpy_array(file_path, mmap_mode)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def compact_int_dtype(values: np.ndarray) -> np.dtype:
+    """
+    Smallest signed integer dtype holding every value (int8 for -1/0/1 labels).
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+SUPPORTED_DATAFRAME_FORMATS = ("csv", "parquet", "feather")
+
+
+def get_file_format(file_path: str) -> str:
+    """
+    Artifact format from the file extension (csv, parquet or feather).
+    """
+    file_format = os.path.splitext(file_path)[1].lstrip(".").lower()
+    if file_format not in SUPPORTED_DATAFRAME_FORMATS:
+        raise ValueError(f"Unsupported dataframe format '{file_format}' for {file_path}")
+    return file_format
+
+
+def with_file_format(file_name: str, file_format: str) -> str:
+    """
+    Swap the extension of an artifact file name for the configured format.
+    """
+    if file_format not in SUPPORTED_DATAFRAME_FORMATS:
+        raise ValueError(f"Unsupported dataframe format '{file_format}'")
+    return f"{os.path.splitext(file_name)[0]}.{file_format}"
+
+
+def get_schema_dtypes(schema: dict) -> dict:
+    """
+    Map schema.yaml column dtypes (int, float, string) to pandas dtypes.
+    """
+    dtype_map = {"int": "int64", "float": "float64", "string": "object"}
+    return {col["name"]: dtype_map.get(col.get("dtype"), "object") for col in schema.get("columns", [])}
+
+
+def apply_schema_dtypes(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Cast columns to the schema dtypes so columnar artifacts are stored typed.
+    Integer columns holding missing values are stored as float64.
+    """
+    try:
+        for col, dtype in get_schema_dtypes(schema).items():
+            if col not in df.columns:
+                continue
+            if dtype in ("int64", "float64"):
+                values = pd.to_numeric(df[col], errors="coerce")
+                if dtype == "int64" and values.isna().any():
+                    dtype = "float64"
+                df[col] = values.astype(dtype)
+            elif df[col].dtype != object:
+                df[col] = df[col].astype(object)
+        return df
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
 
 def save_dataframe(file_path: str, df: pd.DataFrame) -> None:
     """
-    Save pandas DataFrame as CSV.
+    Save pandas DataFrame as CSV, Parquet or Feather, picked from the file extension.
     """
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        df.to_csv(file_path, index=False)
+        file_format = get_file_format(file_path)
+        if file_format == "parquet":
+            df.to_parquet(file_path, index=False)
+        elif file_format == "feather":
+            df.reset_index(drop=True).to_feather(file_path)
+        else:
+            df.to_csv(file_path, index=False)
         logging.info(f"✅ DataFrame saved at {file_path}")
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
 
-def load_dataframe(file_path: str) -> pd.DataFrame:
+def load_dataframe(file_path: str, schema: dict = None) -> pd.DataFrame:
+    """
+    Load a CSV, Parquet or Feather file into pandas DataFrame.
+    Columnar files carry their dtypes; for CSV the schema dtypes are applied after parsing.
+    """
+    try:
+        file_format = get_file_format(file_path)
+        if file_format == "parquet":
+            return pd.read_parquet(file_path)
+        if file_format == "feather":
+            return pd.read_feather(file_path)
+        df = pd.read_csv(file_path)
+        return apply_schema_dtypes(df, schema) if schema else df
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def count_dataframe_rows(file_path: str, chunksize: int) -> int:
+    """
+    Number of rows of a CSV / Parquet / Feather file without loading it (Parquet reads only the footer).
+    """
+    try:
+        file_format = get_file_format(file_path)
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(file_path).metadata.num_rows
+        if file_format == "feather":
+            import pyarrow.ipc as ipc
+            reader = ipc.open_file(file_path)
+            return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        return sum(len(chunk) for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=[0]))
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def iter_dataframe_chunks(file_path: str, chunksize: int, columns: list = None):
     """
-    Load CSV file into pandas DataFrame.
+    Stream a CSV, Parquet or Feather file as DataFrames of at most chunksize rows,
+    so files larger than memory can be processed.
     """
     try:
-        return pd.read_csv(file_path)
+        file_format = get_file_format(file_path)
+        if file_format == "csv":
+            yield from pd.read_csv(file_path, chunksize=chunksize, usecols=columns)
+            return
+
+        import pyarrow.parquet as pq
+        import pyarrow.ipc as ipc
+        if file_format == "parquet":
+            batches = pq.ParquetFile(file_path).iter_batches(batch_size=chunksize, columns=columns)
+            for batch in batches:
+                yield batch.to_pandas()
+            return
+
+        # Feather v2 is the Arrow IPC file format: record batches are read one at a time
+        reader = ipc.open_file(file_path)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize).to_pandas()
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
@@ -100,16 +257,99 @@ def get_mongo_client() -> MongoClient:
         raise NetworkSecurityException(e, sys)
 
 
-def get_collection_as_dataframe(database_name: str, collection_name: str, mongo_client: MongoClient) -> pd.DataFrame:
+def _typed_column(values: list, dtype: str) -> Tuple[np.ndarray, int]:
+    """
+    Turn one batch of raw BSON values into a typed array ("na" and None become NaN).
+    Also returns how many other values were not numeric and were coerced to NaN.
+    """
+    raw = pd.Series(values, dtype=object)
+    missing = (raw.isna() | (raw == "na")).to_numpy()
+    if dtype in ("int64", "float64"):
+        array = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64)
+        n_coerced = int((np.isnan(array) & ~missing).sum())
+        if dtype == "int64" and not np.isnan(array).any():
+            return array.astype(np.int64), n_coerced
+        return array, n_coerced
+    array = raw.to_numpy(dtype=object, copy=True)
+    array[missing] = np.nan
+    return array, 0
+
+
+def documents_to_dataframe(documents, dtypes: dict, batch_size: int = 10000) -> pd.DataFrame:
+    """
+    Build a DataFrame from an iterable of documents (a cursor, a change stream batch, ...)
+    one batch at a time: every batch_size documents the buffered values are converted to
+    typed column arrays, so no full list of documents is ever materialized.
+    A column that no document has is left out (and logged) instead of being filled with
+    NaN, so data validation reports it as missing; non-numeric values coerced to NaN in
+    numeric columns are counted and logged.
+    """
+    columns = list(dtypes.keys())
+    column_chunks = {col: [] for col in columns}
+    buffer = {col: [] for col in columns}
+    present = dict.fromkeys(columns, 0)
+    coerced = dict.fromkeys(columns, 0)
+    n_rows = 0
+
+    def flush():
+        for col in columns:
+            if buffer[col]:
+                array, n_coerced = _typed_column(buffer[col], dtypes[col])
+                column_chunks[col].append(array)
+                coerced[col] += n_coerced
+                buffer[col] = []
+
+    for document in documents:
+        for col in columns:
+            if col in document:
+                present[col] += 1
+            buffer[col].append(document.get(col))
+        n_rows += 1
+        if n_rows % batch_size == 0:
+            flush()
+    flush()
+
+    absent = [col for col in columns if n_rows and not present[col]]
+    if absent:
+        logging.warning(f"⚠️ Columns {absent} are in none of the {n_rows} documents, leaving them out")
+    for col, n_coerced in coerced.items():
+        if n_coerced:
+            logging.warning(f"⚠️ Column {col}: {n_coerced} non-numeric values coerced to NaN")
+
+    return pd.DataFrame({
+        col: np.concatenate(chunks) if chunks else np.array([], dtype=object)
+        for col, chunks in column_chunks.items() if col not in absent
+    })
+
+
+def get_collection_as_dataframe(database_name: str, collection_name: str, mongo_client: MongoClient,
+                                schema: dict = None, batch_size: int = 10000, query: dict = None,
+                                include_id: bool = False) -> pd.DataFrame:
     """
     Convert MongoDB collection into pandas DataFrame.
+    With a schema, only the schema columns are fetched (server-side projection, _id excluded
+    unless include_id) and the cursor is consumed batch by batch into typed column arrays.
     """
     try:
         collection = mongo_client[database_name][collection_name]
-        df = pd.DataFrame(list(collection.find()))
-        if "_id" in df.columns:
-            df.drop("_id", axis=1, inplace=True)  # drop MongoDB ObjectId field
-        logging.info(f"✅ Loaded {len(df)} records from MongoDB collection: {collection_name}")
+
+        if schema is None:
+            df = pd.DataFrame(list(collection.find(query or {}, batch_size=batch_size)))
+            if "_id" in df.columns and not include_id:
+                df.drop("_id", axis=1, inplace=True)  # drop MongoDB ObjectId field
+            logging.info(f"✅ Loaded {len(df)} records from MongoDB collection: {collection_name}")
+            return df
+
+        dtypes = get_schema_dtypes(schema)
+        if include_id:
+            dtypes = {"_id": "object", **dtypes}
+        projection = {col: 1 for col in dtypes}
+        if not include_id:
+            projection["_id"] = 0
+
+        cursor = collection.find(query or {}, projection=projection, batch_size=batch_size)
+        df = documents_to_dataframe(cursor, dtypes, batch_size)
+        logging.info(f"✅ Streamed {len(df)} records from MongoDB collection: {collection_name}")
         return df
     except Exception as e:
         raise NetworkSecurityException(e, sys)
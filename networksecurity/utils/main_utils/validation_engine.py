@@ -0,0 +1,202 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import get_schema_dtypes, iter_dataframe_chunks
+
+NUMERIC_DTYPES = ("int64", "float64")
+
+
+@dataclass
+class ColumnRules:
+    """
+    All rules of one column, compiled from schema.yaml.
+    """
+    name: str
+    dtype: str
+    domain: Optional[np.ndarray] = None
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    max_null_ratio: float = 0.0
+
+
+@dataclass
+class ColumnStats:
+    nulls: int = 0
+    dtype_violations: int = 0
+    domain_violations: int = 0
+    range_violations: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+@dataclass
+class ValidationReport:
+    """
+    Violation counts accumulated over every chunk of a file.
+    """
+    rows: int = 0
+    missing_columns: List[str] = field(default_factory=list)
+    unexpected_columns: List[str] = field(default_factory=list)
+    columns: Dict[str, ColumnStats] = field(default_factory=dict)
+    failed_rules: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failed_rules
+
+    def to_dict(self) -> dict:
+        columns = {}
+        for name, stats in self.columns.items():
+            columns[name] = {
+                "nulls": stats.nulls,
+                "null_ratio": round(stats.nulls / self.rows, 6) if self.rows else 0.0,
+                "dtype_violations": stats.dtype_violations,
+                "domain_violations": stats.domain_violations,
+                "range_violations": stats.range_violations,
+                "min": stats.min,
+                "max": stats.max
+            }
+        return {
+            "passed": self.passed,
+            "rows": self.rows,
+            "missing_columns": self.missing_columns,
+            "unexpected_columns": self.unexpected_columns,
+            "failed_rules": self.failed_rules,
+            "columns": columns
+        }
+
+
+def compile_rules(schema: dict) -> Dict[str, ColumnRules]:
+    """
+    schema.yaml -> {column: ColumnRules}: presence and dtype from `columns`,
+    allowed sets from `domain_values`, inclusive bounds from `value_ranges`
+    and null limits from `max_null_ratio` (with a `default`).
+    """
+    dtypes = get_schema_dtypes(schema)
+    domains = schema.get("domain_values") or {}
+    ranges = schema.get("value_ranges") or {}
+    null_ratios = schema.get("max_null_ratio") or {}
+    default_null_ratio = float(null_ratios.get("default", 0.0))
+
+    rules = {}
+    for name, dtype in dtypes.items():
+        bounds = ranges.get(name) or {}
+        domain = domains.get(name)
+        rules[name] = ColumnRules(
+            name=name,
+            dtype=dtype,
+            domain=np.sort(np.asarray(domain, dtype=np.float64 if dtype in NUMERIC_DTYPES else object))
+            if domain is not None else None,
+            min_value=bounds.get("min"),
+            max_value=bounds.get("max"),
+            max_null_ratio=float(null_ratios.get(name, default_null_ratio))
+        )
+    return rules
+
+
+class ValidationEngine:
+    """
+    Evaluates every schema rule in a single pass over each chunk.
+
+    Each numeric column is converted to one float array per chunk, and the
+    null, dtype, domain and range checks are boolean masks over that array,
+    so no filtered DataFrames are built. Counts add up across chunks, so a file
+    larger than memory is validated chunk by chunk. Nothing stops at the first
+    failure: the report has every violation count for every column.
+    """
+
+    def __init__(self, schema: dict):
+        self.rules = compile_rules(schema)
+
+    def _check_column(self, rules: ColumnRules, series: pd.Series, stats: ColumnStats) -> None:
+        null_mask = series.isna().to_numpy()
+        stats.nulls += int(null_mask.sum())
+
+        if rules.dtype not in NUMERIC_DTYPES:
+            if rules.domain is not None:
+                present = ~null_mask
+                stats.domain_violations += int((~np.isin(series.to_numpy()[present], rules.domain)).sum())
+            return
+
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        parsed = ~np.isnan(values)
+        # present but not a number
+        bad_type = ~null_mask & ~parsed
+        if rules.dtype == "int64":
+            bad_type |= parsed & (values != np.floor(values))
+        stats.dtype_violations += int(bad_type.sum())
+
+        valid = values[parsed]
+        if valid.size == 0:
+            return
+        if rules.domain is not None:
+            stats.domain_violations += int((~np.isin(valid, rules.domain)).sum())
+        if rules.min_value is not None or rules.max_value is not None:
+            out_of_range = np.zeros(valid.size, dtype=bool)
+            if rules.min_value is not None:
+                out_of_range |= valid < rules.min_value
+            if rules.max_value is not None:
+                out_of_range |= valid > rules.max_value
+            stats.range_violations += int(out_of_range.sum())
+        chunk_min, chunk_max = float(valid.min()), float(valid.max())
+        stats.min = chunk_min if stats.min is None else min(stats.min, chunk_min)
+        stats.max = chunk_max if stats.max is None else max(stats.max, chunk_max)
+
+    def update(self, report: ValidationReport, chunk: pd.DataFrame) -> None:
+        """
+        Add one chunk's counts to the report.
+        """
+        if report.rows == 0 and not report.columns:
+            report.missing_columns = [name for name in self.rules if name not in chunk.columns]
+            report.unexpected_columns = [name for name in chunk.columns if name not in self.rules]
+            report.columns = {name: ColumnStats() for name in self.rules if name in chunk.columns}
+        report.rows += len(chunk)
+        for name, stats in report.columns.items():
+            self._check_column(self.rules[name], chunk[name], stats)
+
+    def finalize(self, report: ValidationReport) -> ValidationReport:
+        failed = [f"missing column {name}" for name in report.missing_columns]
+        for name, stats in report.columns.items():
+            rules = self.rules[name]
+            null_ratio = stats.nulls / report.rows if report.rows else 0.0
+            if null_ratio > rules.max_null_ratio:
+                failed.append(f"{name}: {stats.nulls} nulls, ratio {null_ratio:.6f} > {rules.max_null_ratio}")
+            if stats.dtype_violations:
+                failed.append(f"{name}: {stats.dtype_violations} values are not {rules.dtype}")
+            if stats.domain_violations:
+                failed.append(f"{name}: {stats.domain_violations} values outside the allowed set")
+            if stats.range_violations:
+                failed.append(f"{name}: {stats.range_violations} values outside "
+                              f"[{rules.min_value}, {rules.max_value}]")
+        report.failed_rules = failed
+        return report
+
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame]) -> ValidationReport:
+        try:
+            report = ValidationReport()
+            for chunk in chunks:
+                self.update(report, chunk)
+            return self.finalize(report)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def validate_file(self, file_path: str, chunksize: int) -> ValidationReport:
+        """
+        Stream a CSV / Parquet / Feather file in chunks of chunksize rows and validate it.
+        """
+        try:
+            report = self.validate_chunks(iter_dataframe_chunks(file_path, chunksize))
+            logging.info(f"Validated {report.rows} rows of {file_path}: "
+                         f"{'passed' if report.passed else f'{len(report.failed_rules)} failed rules'}")
+            return report
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
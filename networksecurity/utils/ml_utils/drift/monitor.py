@@ -0,0 +1,319 @@
+import sys
+import time
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.drift.sketch import (
+    QuantileSketch,
+    jensen_shannon_divergence,
+    ks_test,
+    population_stability_index
+)
+from networksecurity.constant.training_pipeline import (
+    DRIFT_MONITOR_BINS,
+    DRIFT_MONITOR_FLUSH_INTERVAL_SECONDS,
+    DRIFT_MONITOR_WINDOW_FLUSHES,
+    DRIFT_MONITOR_MIN_ROWS,
+    DRIFT_MONITOR_PSI_THRESHOLD,
+    DRIFT_MONITOR_BUFFER_ROWS,
+    DRIFT_MONITOR_SHARDS
+)
+
+# rows up to which one broadcast comparison beats a searchsorted per feature
+_BROADCAST_MAX_ROWS = 64
+
+
+class _Layout:
+    """
+    Fixed bins of every monitored feature, built once per model from its drift reference.
+    """
+
+    def __init__(self, reference: dict, feature_names: List[str], bins: int):
+        self.n_inputs = len(feature_names)
+        self.features, self.positions, self.reference_counts = [], [], []
+        edges, probabilities = [], []
+        for position, name in enumerate(feature_names):
+            if name not in reference:
+                continue
+            sketch = QuantileSketch.from_dict(reference[name])
+            if sketch.count == 0:
+                continue
+            feature_edges, feature_probabilities = sketch.binned(bins)
+            self.features.append(name)
+            self.positions.append(position)
+            self.reference_counts.append(sketch.count)
+            edges.append(feature_edges)
+            probabilities.append(feature_probabilities)
+
+        self.positions = np.asarray(self.positions, dtype=np.intp)
+        n_features = len(self.features)
+        width = max((e.size for e in edges), default=0)
+        # padding with +inf keeps the bin of a finite value unchanged
+        self.edges = np.full((n_features, width), np.inf)
+        # slots 0..width hold bins and overflow, the last slot counts missing values
+        self.slots = width + 2
+        self.missing_slot = width + 1
+        self.probabilities = np.zeros((n_features, width + 1))
+        for i, (feature_edges, feature_probabilities) in enumerate(zip(edges, probabilities)):
+            self.edges[i, :feature_edges.size] = feature_edges
+            self.probabilities[i, :feature_probabilities.size] = feature_probabilities
+        self.offsets = (np.arange(n_features) * self.slots)[None, :]
+
+    def bin_indices(self, values: np.ndarray) -> np.ndarray:
+        if values.shape[0] <= _BROADCAST_MAX_ROWS:
+            # count the edges below each value: one vectorized comparison for the whole batch
+            index = (values[:, :, None] > self.edges[None, :, :]).sum(axis=2)
+        else:
+            index = np.empty(values.shape, dtype=np.intp)
+            for i in range(values.shape[1]):
+                index[:, i] = np.searchsorted(self.edges[i], values[:, i])
+        index[np.isnan(values)] = self.missing_slot
+        return index
+
+    def count(self, batches: List[np.ndarray]) -> np.ndarray:
+        """
+        Bin counts (features x slots) of a list of row batches.
+        """
+        values = np.concatenate(batches).astype(np.float64, copy=False)[:, self.positions]
+        index = self.bin_indices(values)
+        flat = (index + self.offsets).ravel()
+        return np.bincount(flat, minlength=len(self.features) * self.slots).reshape(-1, self.slots)
+
+
+class _Shard:
+    """
+    Counters shared by the request threads assigned to it. The lock is only
+    held to buffer rows and to add binned counts; binning runs outside it.
+    """
+
+    def __init__(self, layout: _Layout):
+        self.layout = layout
+        self.counts = np.zeros((len(layout.features), layout.slots), dtype=np.int64)
+        self.lock = threading.Lock()
+        self.pending: List[np.ndarray] = []
+        self.pending_rows = 0
+        self.rows = 0
+        self.seconds = 0.0
+
+
+class DriftMonitor:
+    """
+    Online drift monitor for the prediction endpoints.
+
+    The model carries the drift reference saved at training time: one
+    QuantileSketch per feature. The monitor coarsens each sketch into a few
+    bins of equal reference mass. observe() buffers the incoming rows in one
+    of a fixed number of shards (each thread is assigned one, round robin)
+    and bins them in vectorized batches, so request threads rarely contend.
+    A background thread periodically sums the shards, keeps a sliding
+    window of the last window_flushes flushes, and scores the window against
+    the reference: PSI, JS divergence and KS (p-value in NumPy, no scipy).
+
+    Counters live per process; behind a pre-forking launcher each worker
+    reports the traffic it served.
+    """
+
+    def __init__(self,
+                 model_provider: Callable,
+                 bins: int = DRIFT_MONITOR_BINS,
+                 flush_interval: float = DRIFT_MONITOR_FLUSH_INTERVAL_SECONDS,
+                 window_flushes: int = DRIFT_MONITOR_WINDOW_FLUSHES,
+                 min_rows: int = DRIFT_MONITOR_MIN_ROWS,
+                 psi_threshold: float = DRIFT_MONITOR_PSI_THRESHOLD,
+                 buffer_rows: int = DRIFT_MONITOR_BUFFER_ROWS,
+                 n_shards: int = DRIFT_MONITOR_SHARDS):
+        self.model_provider = model_provider
+        self.bins = bins
+        self.buffer_rows = buffer_rows
+        self.n_shards = n_shards
+        self.flush_interval = flush_interval
+        self.min_rows = min_rows
+        self.psi_threshold = psi_threshold
+
+        self._layout: Optional[_Layout] = None
+        self._model = None
+        self._disabled_reason: Optional[str] = "no model loaded"
+        # a thread keeps its shard slot for life; the shards themselves are rebuilt with the layout
+        self._local = threading.local()
+        self._next_slot = itertools.count()
+        self._shards: List[_Shard] = []
+
+        self._flushed_counts = None
+        self._previous_total = None
+        self._window = deque(maxlen=window_flushes)
+        self._report: dict = {}
+        self._flush_lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def _bind(self, model) -> None:
+        # (re)build the bins when the registry swaps in another model
+        self._model = model
+        reference = getattr(model, "drift_reference", None)
+        feature_names = getattr(model, "feature_names", None)
+        layout = None
+        if model is None:
+            self._disabled_reason = "no model loaded"
+        elif not reference:
+            self._disabled_reason = "model has no drift reference"
+        elif not feature_names:
+            self._disabled_reason = "model has no feature names"
+        else:
+            layout = _Layout(reference, feature_names, self.bins)
+            self._disabled_reason = None if layout.features else "no reference for any model feature"
+        self._previous_total = None
+        self._window.clear()
+        self._layout = None
+        if layout is not None and layout.features:
+            self._flushed_counts = np.zeros((len(layout.features), layout.slots), dtype=np.int64)
+            self._shards = [_Shard(layout) for _ in range(self.n_shards)]
+            self._layout = layout
+            logging.info(f"Drift monitor tracking {len(self._layout.features)} features")
+
+    def observe(self, rows: np.ndarray) -> None:
+        """
+        Count a batch of raw feature rows (2-D, in the model's feature order).
+        Rows are buffered per shard and binned buffer_rows at a time, which
+        spreads numpy's fixed per-call cost over many single-row requests.
+        Never raises: monitoring must not fail a prediction.
+        """
+        layout, shards = self._layout, self._shards
+        if layout is None or rows.ndim != 2 or rows.shape[1] != layout.n_inputs or rows.dtype.kind not in "biuf":
+            return
+        try:
+            start = time.perf_counter()
+            slot = getattr(self._local, "slot", None)
+            if slot is None:
+                slot = self._local.slot = next(self._next_slot)
+            shard = shards[slot % len(shards)]
+            if shard.layout is not layout:
+                return  # rebound to another model meanwhile
+
+            pending = None
+            with shard.lock:
+                shard.pending.append(rows)
+                shard.pending_rows += rows.shape[0]
+                if shard.pending_rows >= self.buffer_rows:
+                    pending, shard.pending, shard.pending_rows = shard.pending, [], 0
+            counts = layout.count(pending) if pending is not None else None
+            with shard.lock:
+                if counts is not None:
+                    shard.counts += counts
+                shard.rows += rows.shape[0]
+                shard.seconds += time.perf_counter() - start
+        except Exception as e:
+            logging.debug(f"Drift monitor skipped a batch: {e}")
+
+    def flush(self) -> dict:
+        """
+        Merge the shards into the window and rescore it; returns the new report.
+        """
+        try:
+            with self._flush_lock:
+                model = self.model_provider()
+                if model is not self._model:
+                    self._bind(model)
+                layout = self._layout
+                if layout is None:
+                    self._report = {"enabled": False, "reason": self._disabled_reason}
+                    return self._report
+
+                # rows still buffered in a shard are binned here, into the flusher's own counts;
+                # shards keep counting while they are read, so a batch lands in this flush or the next
+                rows, seconds = 0, 0.0
+                for shard in self._shards:
+                    with shard.lock:
+                        pending, shard.pending, shard.pending_rows = shard.pending, [], 0
+                    if pending:
+                        self._flushed_counts += layout.count(pending)
+                total = self._flushed_counts.copy()
+                for shard in self._shards:
+                    with shard.lock:
+                        total += shard.counts
+                        rows += shard.rows
+                        seconds += shard.seconds
+                delta = total if self._previous_total is None else total - self._previous_total
+                self._previous_total = total
+                self._window.append(delta)
+                self._report = self._score(layout, sum(self._window), rows, seconds)
+                return self._report
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _score(self, layout: _Layout, window: np.ndarray, rows: int, seconds: float) -> dict:
+        features, drifted = {}, []
+        for i, name in enumerate(layout.features):
+            counts = window[i, :layout.missing_slot].astype(np.float64)
+            missing = int(window[i, layout.missing_slot])
+            observed = int(counts.sum())
+            result = {"rows": observed, "missing": missing}
+            if observed >= self.min_rows:
+                p = layout.probabilities[i]
+                q = counts / observed
+                keep = (p > 0) | (q > 0)
+                ks_statistic, p_value = ks_test(p, q, layout.reference_counts[i], observed, exact=False)
+                psi = population_stability_index(p[keep], q[keep])
+                result.update({
+                    "psi": round(psi, 6),
+                    "js_divergence": round(jensen_shannon_divergence(p, q), 6),
+                    "ks_statistic": round(ks_statistic, 6),
+                    "p_value": p_value,
+                    "above_reference_max": round(float(q[-1]), 6),
+                    "drift_detected": bool(psi > self.psi_threshold)
+                })
+                if result["drift_detected"]:
+                    drifted.append(name)
+            features[name] = result
+
+        window_rows = int(window[:, :layout.missing_slot].sum(axis=1).max()) if len(layout.features) else 0
+        if drifted:
+            logging.warning(f"Drift detected on live traffic for {len(drifted)} features: {drifted}")
+        return {
+            "enabled": True,
+            "flushed_at": datetime.now().isoformat(timespec="seconds"),
+            "window_seconds": round(len(self._window) * self.flush_interval, 1),
+            "window_rows": window_rows,
+            "rows_observed": rows,
+            "mean_overhead_us_per_row": round(1e6 * seconds / rows, 3) if rows else 0.0,
+            "psi_threshold": self.psi_threshold,
+            "min_rows": self.min_rows,
+            "drifted_features": drifted,
+            "features": features
+        }
+
+    def report(self) -> dict:
+        """
+        Latest drift scores; flushes first if there is no report yet.
+        """
+        return self._report or self.flush()
+
+    def start(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+        self._worker.start()
+        logging.info(f"Drift monitor flushing every {self.flush_interval}s")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join(timeout=1)
+            self._worker = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Drift monitor flush failed: {e}")
+            if self._stop_event.wait(self.flush_interval):
+                break
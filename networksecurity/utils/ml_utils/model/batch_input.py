@@ -0,0 +1,167 @@
+import io
+import sys
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.constant.training_pipeline import PREDICTION_BATCH_MAX_ROWS
+
+NPY_CONTENT_TYPES = ("application/x-npy", "application/octet-stream")
+
+
+class BatchInputError(ValueError):
+    """
+    Request-level problem with a batch payload (bad shape, too many rows, ...).
+    Reported to the client as a 4xx instead of a server error.
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def rows_from_json(payload, feature_names: Optional[List[str]] = None) -> list:
+    """
+    Accepts the JSON batch layouts:
+     - [[...], [...]]                    row-major list of feature lists
+     - {"rows": [[...], [...]]}          same, wrapped
+     - {"columns": {"name": [...], ...}} columnar, ordered by the model's feature names
+    """
+    if isinstance(payload, list):
+        return payload
+
+    if isinstance(payload, dict) and "rows" in payload:
+        rows = payload["rows"]
+        if not isinstance(rows, list):
+            raise BatchInputError("'rows' must be a list of feature lists")
+        return rows
+
+    if isinstance(payload, dict) and "columns" in payload:
+        columns = payload["columns"]
+        if not isinstance(columns, dict) or not columns:
+            raise BatchInputError("'columns' must map feature names to value lists")
+        names = feature_names or list(columns.keys())
+        missing = [name for name in names if name not in columns]
+        if missing:
+            raise BatchInputError(f"Missing columns: {missing}")
+        not_lists = [name for name in names if not isinstance(columns[name], list)]
+        if not_lists:
+            raise BatchInputError(f"Columns must be lists of values: {not_lists}")
+        lengths = {len(columns[name]) for name in names}
+        if len(lengths) != 1:
+            raise BatchInputError("All columns must have the same number of values")
+        return [list(row) for row in zip(*(columns[name] for name in names))]
+
+    raise BatchInputError("Expected a list of rows, {'rows': [...]} or {'columns': {...}}")
+
+
+def matrix_from_npy(body: bytes) -> np.ndarray:
+    """
+    Decode a binary .npy body (np.save format, no pickles) into a 2-D float matrix.
+    """
+    try:
+        matrix = np.load(io.BytesIO(body), allow_pickle=False)
+    except Exception as e:
+        raise BatchInputError(f"Body is not a valid .npy array: {e}")
+    if matrix.ndim != 2:
+        raise BatchInputError(f"Expected a 2-D array, got shape {matrix.shape}")
+    try:
+        return np.ascontiguousarray(matrix, dtype=np.float64)
+    except Exception as e:
+        raise BatchInputError(f"Array is not numeric: {e}")
+
+
+def check_batch_size(n_rows: int, max_rows: int = PREDICTION_BATCH_MAX_ROWS) -> None:
+    if n_rows == 0:
+        raise BatchInputError("No rows provided")
+    if n_rows > max_rows:
+        raise BatchInputError(f"Batch of {n_rows} rows exceeds the limit of {max_rows}", status_code=413)
+
+
+def build_matrix(rows: list, n_features: Optional[int]) -> Tuple[np.ndarray, List[int], List[dict]]:
+    """
+    Convert JSON rows to one float matrix.
+    Returns the matrix of valid rows, their positions in the request and per-row errors.
+    """
+    try:
+        expected = n_features
+        if expected is None:
+            first = next((row for row in rows if isinstance(row, list)), None)
+            expected = len(first) if first is not None else 0
+
+        # Fast path: the whole batch converts in one shot (None becomes NaN for the imputer)
+        try:
+            matrix = np.array(rows, dtype=np.float64)
+            if matrix.ndim == 2 and matrix.shape[1] == expected:
+                return matrix, list(range(len(rows))), []
+        except (TypeError, ValueError):
+            pass
+
+        # Slow path: find the offending rows, keep the good ones
+        valid_rows, valid_index, errors = [], [], []
+        for i, row in enumerate(rows):
+            if not isinstance(row, list):
+                errors.append({"row": i, "error": "row must be a list of feature values"})
+                continue
+            if len(row) != expected:
+                errors.append({"row": i, "error": f"expected {expected} features, got {len(row)}"})
+                continue
+            try:
+                valid_rows.append(np.array(row, dtype=np.float64))
+                valid_index.append(i)
+            except (TypeError, ValueError) as e:
+                errors.append({"row": i, "error": f"non-numeric feature value: {e}"})
+
+        matrix = np.vstack(valid_rows) if valid_rows else np.empty((0, expected), dtype=np.float64)
+        return matrix, valid_index, errors
+
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def batch_from_npy(body: bytes, n_features: Optional[int]) -> Tuple[np.ndarray, List[int], List[dict], int]:
+    """
+    Decode and check a binary batch. Returns (matrix, valid_index, errors, n_rows).
+    """
+    matrix = matrix_from_npy(body)
+    check_batch_size(matrix.shape[0])
+    if n_features is not None and matrix.shape[1] != n_features:
+        raise BatchInputError(f"Expected {n_features} features per row, got {matrix.shape[1]}")
+    return matrix, list(range(matrix.shape[0])), [], matrix.shape[0]
+
+
+def batch_from_json(payload, n_features: Optional[int],
+                    feature_names: Optional[List[str]] = None) -> Tuple[np.ndarray, List[int], List[dict], int]:
+    """
+    Decode and check a JSON batch. Returns (matrix, valid_index, errors, n_rows).
+    """
+    rows = rows_from_json(payload, feature_names)
+    check_batch_size(len(rows))
+    matrix, valid_index, errors = build_matrix(rows, n_features)
+    return matrix, valid_index, errors, len(rows)
+
+
+def score_batch(model, matrix: np.ndarray, valid_index: List[int], n_rows: int, errors: List[dict]) -> dict:
+    """
+    Run all valid rows through the model in one call and lay the results back
+    out in request order, with None for rows that failed validation.
+    """
+    try:
+        predictions = [None] * n_rows
+        if len(valid_index):
+            scored = model.predict(matrix)
+            for position, value in zip(valid_index, scored.tolist()):
+                predictions[position] = int(value)
+
+        logging.info(f"🔮 Batch scored: {len(valid_index)}/{n_rows} rows, {len(errors)} rejected")
+        return {
+            "status": "success" if not errors else "partial",
+            "n_rows": n_rows,
+            "n_scored": len(valid_index),
+            "predictions": predictions,
+            "errors": errors
+        }
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+from typing import List, Optional
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+COMPILED_MODEL_EXTENSION = ".npz"
+COMPILED_MODEL_FORMAT_VERSION = 1
+
+
+class CompiledPredictor:
+    """
+    Serving form of a NetworkSecurityModel that needs nothing but NumPy.
+
+    Preprocessing is folded into vectors. Numeric columns use
+    x -> (x if present else fill) * scale + shift. Each categorical column
+    becomes a sorted category array plus the one-hot value per category.
+    The estimator is either a linear model or a tree ensemble flattened
+    into node arrays. All trees are evaluated together, one depth level per
+    step. Leaves point to themselves, so rows that reach a leaf early just
+    stay there.
+
+    Everything is saved in a single .npz (metadata as embedded JSON), so
+    replacing the file swaps the whole model atomically.
+    """
+
+    def __init__(self, arrays: dict, meta: dict):
+        self.arrays = arrays
+        self.meta = meta
+        self.estimator_kind = meta["estimator"]["kind"]
+
+    # ---------- metadata ----------
+    @property
+    def feature_names(self) -> Optional[List[str]]:
+        return self.meta.get("feature_names")
+
+    @property
+    def n_features(self) -> int:
+        return self.meta["n_features"]
+
+    @property
+    def classes(self) -> Optional[np.ndarray]:
+        return self.arrays.get("classes")
+
+    @property
+    def drift_reference(self) -> Optional[dict]:
+        return self.meta.get("drift_reference")
+
+    # ---------- preprocessing ----------
+    def transform(self, X) -> np.ndarray:
+        """
+        Raw feature rows (2-D, in feature_names order) -> model input matrix.
+        """
+        if hasattr(X, "columns"):
+            # DataFrame: select the training columns by name
+            X = X[self.feature_names].to_numpy()
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features per row, got {X.shape[1]}")
+
+        a = self.arrays
+        out = np.zeros((X.shape[0], self.meta["n_outputs"]), dtype=np.float64)
+        if a["num_input"].size:
+            values = X[:, a["num_input"]]
+            if values.dtype != np.float64:
+                values = values.astype(np.float64)
+            values = np.where(np.isnan(values), a["num_fill"], values)
+            out[:, a["num_output"]] = values * a["num_scale"] + a["num_shift"]
+
+        for i, column in enumerate(self.meta["categorical"]):
+            categories = a[f"cat_categories_{i}"]
+            values = X[:, column["input"]]
+            if column["numeric"]:
+                values = values.astype(np.float64)
+                missing = np.isnan(values)
+            else:
+                # like SimpleImputer on object columns: only NaN is missing, None encodes as unknown
+                missing = np.array([v != v for v in values.tolist()], dtype=bool)
+                values = values.astype(str)
+            if missing.any():
+                values = np.where(missing, column["fill"], values)
+            position = np.minimum(np.searchsorted(categories, values), categories.size - 1)
+            # unknown categories encode as all zeros (handle_unknown="ignore")
+            known = np.flatnonzero(categories[position] == values)
+            out[known, column["output"] + position[known]] = a[f"cat_values_{i}"][position[known]]
+        return out
+
+    # ---------- estimator ----------
+    def _tree_leaves(self, X: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        if self.meta["estimator"]["float32"]:
+            # both sklearn trees and XGBoost compare float32 features with the thresholds
+            X = X.astype(np.float32).astype(np.float64)
+        if self.meta["estimator"]["zero_is_missing"]:
+            # XGBoost trained on a sparse matrix treats absent (zero) entries as missing
+            X = np.where(X == 0, np.nan, X)
+        n_rows, width = X.shape
+        flat = X.ravel()
+        row_offset = (np.arange(n_rows) * width)[:, None]
+        node = np.broadcast_to(a["roots"], (n_rows, a["roots"].size)).copy()
+        strict = self.meta["estimator"]["strict"]
+        for _ in range(self.meta["estimator"]["max_depth"]):
+            x = flat[row_offset + a["feature"][node]]
+            threshold = a["threshold"][node]
+            go_left = x < threshold if strict else x <= threshold
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, a["default_left"][node], go_left)
+            node = np.where(go_left, a["left"][node], a["right"][node])
+        return node
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """
+        Per-class scores of the estimator on preprocessed rows: class
+        probabilities (forest), margins (boosting) or the linear decision function.
+        """
+        a = self.arrays
+        kind = self.estimator_kind
+        if kind == "linear":
+            return X @ a["coef"].T + a["intercept"]
+        leaves = self._tree_leaves(X)
+        if kind == "forest":
+            return a["leaf_value"][leaves].mean(axis=1)
+        # boosting: sum of leaf values per output group, plus the base margin
+        return a["leaf_value"][leaves] @ a["tree_group"] + a["base_margin"]
+
+    def predict_preprocessed(self, X: np.ndarray) -> np.ndarray:
+        """
+        Estimator labels (before the classes mapping) for preprocessed rows.
+        """
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            # binary margin / linear decision: positive means the second class
+            index = (scores[:, 0] > 0).astype(np.int64)
+        else:
+            index = scores.argmax(axis=1)
+        return self.arrays["estimator_classes"][index]
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Raw feature rows in, original class labels out (like NetworkSecurityModel.predict).
+        """
+        try:
+            labels = self.predict_preprocessed(self.transform(X))
+            if self.classes is not None:
+                labels = self.classes[labels.astype(np.int64)]
+            return labels
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    # ---------- persistence ----------
+    def save(self, file_path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            meta = {**self.meta, "format_version": COMPILED_MODEL_FORMAT_VERSION}
+            tmp_path = f"{file_path}.tmp{COMPILED_MODEL_EXTENSION}"
+            np.savez(tmp_path, __meta__=np.array(json.dumps(meta)), **self.arrays)
+            os.replace(tmp_path, file_path)
+            logging.info(f"✅ Compiled model saved at {file_path}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @classmethod
+    def load(cls, file_path: str) -> "CompiledPredictor":
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files if name != "__meta__"}
+                meta = json.loads(str(data["__meta__"]))
+            if meta.get("format_version") != COMPILED_MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported compiled model format {meta.get('format_version')}")
+            return cls(arrays, meta)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
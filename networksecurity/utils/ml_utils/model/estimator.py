@@ -3,6 +3,7 @@ import sys
 import joblib
 import numpy as np
 import pandas as pd
+from typing import Union
 
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
@@ -46,7 +47,7 @@ class NetworkSecurityEstimator:
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def predict(self, X: pd.DataFrame | np.ndarray):
+    def predict(self, X: Union[pd.DataFrame, np.ndarray]):
         """
         Generate predictions using the trained model.
         """
@@ -58,3 +59,72 @@ class NetworkSecurityEstimator:
             return preds
         except Exception as e:
             raise NetworkSecurityException(e, sys)
+
+
+class NetworkSecurityModel:
+    """
+    Serving wrapper that bundles the fitted preprocessor with the estimator:
+     - raw feature rows in, class labels out
+     - the preprocessor is pickled together with the model
+     - classes maps encoded predictions (0..k-1) back to the original labels
+     - drift_reference holds the training sketches ({column: sketch dict})
+       that the serving drift monitor compares live traffic against
+     - incremental_updates counts the updates on new rows since the last full retrain
+    """
+
+    def __init__(self, model, preprocessor=None, preprocessor_path: str = None, classes=None,
+                 drift_reference: dict = None, incremental_updates: int = 0):
+        try:
+            if preprocessor is None and preprocessor_path is not None:
+                preprocessor = joblib.load(preprocessor_path)
+            self.model = model
+            self.preprocessor = preprocessor
+            self.classes = None if classes is None else np.asarray(classes)
+            self.drift_reference = drift_reference
+            self.incremental_updates = incremental_updates
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @property
+    def feature_names(self):
+        """
+        Raw input column names the preprocessor was fitted on, if known.
+        """
+        names = getattr(self.preprocessor, "feature_names_in_", None)
+        return list(names) if names is not None else None
+
+    @property
+    def n_features(self):
+        """
+        Number of raw input features expected per row, if known.
+        """
+        if self.feature_names is not None:
+            return len(self.feature_names)
+        source = self.preprocessor if self.preprocessor is not None else self.model
+        return getattr(source, "n_features_in_", None)
+
+    def transform(self, X):
+        """
+        Apply the preprocessor to a 2-D matrix (or DataFrame) of raw features.
+        """
+        try:
+            if self.preprocessor is None:
+                return X
+            if isinstance(X, np.ndarray) and self.feature_names is not None:
+                # the ColumnTransformer selects columns by name
+                X = pd.DataFrame(X, columns=self.feature_names)
+            return self.preprocessor.transform(X)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def predict(self, X):
+        """
+        Score a whole matrix of rows in one vectorized call.
+        """
+        try:
+            predictions = self.model.predict(self.transform(X))
+            if getattr(self, "classes", None) is not None:
+                predictions = self.classes[np.asarray(predictions, dtype=np.int64)]
+            return predictions
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
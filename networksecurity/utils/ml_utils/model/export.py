@@ -0,0 +1,344 @@
+import sys
+import json
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from xgboost import XGBClassifier
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.compiled import CompiledPredictor
+from networksecurity.utils.ml_utils.model.estimator import NetworkSecurityModel
+
+
+class UnsupportedModelError(NotImplementedError):
+    """The model uses a step the compiled predictor cannot reproduce exactly."""
+
+
+def _column_positions(columns, feature_names: List[str]) -> List[int]:
+    positions = {name: i for i, name in enumerate(feature_names)}
+    if isinstance(columns, slice) or (hasattr(columns, "dtype") and columns.dtype == bool):
+        return list(np.arange(len(feature_names))[columns])
+    return [positions[column] if isinstance(column, str) else int(column) for column in columns]
+
+
+def _compile_preprocessor(preprocessor, feature_names: List[str]):
+    """
+    Fold a fitted ColumnTransformer of imputer / scaler / one-hot pipelines into
+    numeric (fill, scale, shift) vectors and per-column one-hot tables.
+    """
+    numeric = {"input": [], "output": [], "fill": [], "scale": [], "shift": []}
+    categorical, arrays = [], {}
+    n_outputs = 0
+
+    if preprocessor is None:
+        transformers = [("identity", "passthrough", list(range(len(feature_names))))]
+    elif isinstance(preprocessor, ColumnTransformer):
+        transformers = preprocessor.transformers_
+    else:
+        raise UnsupportedModelError(f"Unsupported preprocessor {type(preprocessor).__name__}")
+
+    for name, transformer, columns in transformers:
+        if isinstance(transformer, str) and transformer == "drop":
+            continue
+        positions = _column_positions(columns, feature_names)
+        if not positions:
+            continue
+        steps = [transformer] if isinstance(transformer, str) else (
+            [step for _, step in transformer.steps] if isinstance(transformer, Pipeline) else [transformer]
+        )
+
+        fill = np.full(len(positions), np.nan, dtype=object)
+        scale = np.ones(len(positions))
+        shift = np.zeros(len(positions))
+        encoder, one_hot_scale = None, None
+        for step in steps:
+            if isinstance(step, str) and step == "passthrough":
+                continue
+            if isinstance(step, SimpleImputer):
+                if encoder is not None or step.add_indicator or not (
+                        isinstance(step.missing_values, float) and np.isnan(step.missing_values)):
+                    raise UnsupportedModelError(f"{name}: unsupported SimpleImputer settings")
+                statistics = step.statistics_
+                if any(value is None or (isinstance(value, float) and np.isnan(value)) for value in statistics):
+                    # sklearn drops all-missing columns, which changes the output width
+                    raise UnsupportedModelError(f"{name}: imputer has an all-missing column")
+                fill = np.asarray(statistics, dtype=object)
+            elif isinstance(step, StandardScaler):
+                mean = step.mean_ if step.with_mean else 0.0
+                std = step.scale_ if step.with_std else 1.0
+                if encoder is None:
+                    # y = x * scale + shift, then (y - mean) / std
+                    scale, shift = scale / std, (shift - mean) / std
+                elif step.with_mean:
+                    raise UnsupportedModelError(f"{name}: centering after one-hot encoding")
+                else:
+                    one_hot_scale = one_hot_scale / np.broadcast_to(std, one_hot_scale.shape)
+            elif isinstance(step, OneHotEncoder):
+                if encoder is not None or step.drop_idx_ is not None or step.handle_unknown != "ignore" \
+                        or getattr(step, "_infrequent_enabled", False):
+                    raise UnsupportedModelError(f"{name}: unsupported OneHotEncoder settings")
+                if np.any(scale != 1.0) or np.any(shift != 0.0):
+                    raise UnsupportedModelError(f"{name}: scaling before one-hot encoding")
+                encoder = step
+                one_hot_scale = np.ones(sum(len(categories) for categories in step.categories_))
+            else:
+                raise UnsupportedModelError(f"{name}: unsupported step {type(step).__name__}")
+
+        if encoder is None:
+            if any(not isinstance(value, (int, float, np.number)) and value == value for value in fill):
+                raise UnsupportedModelError(f"{name}: non-numeric fill value for a numeric column")
+            numeric["input"] += positions
+            numeric["output"] += list(range(n_outputs, n_outputs + len(positions)))
+            numeric["fill"] += [float(value) for value in fill]
+            numeric["scale"] += list(scale)
+            numeric["shift"] += list(shift)
+            n_outputs += len(positions)
+            continue
+
+        offset = 0
+        for position, column_fill, categories in zip(positions, fill, encoder.categories_):
+            # a mixed-dtype ColumnTransformer hands the encoder object arrays of numbers
+            is_numeric = categories.dtype.kind in "biuf" or all(
+                isinstance(value, (int, float, np.number)) and not isinstance(value, bool) for value in categories)
+            index = len(categorical)
+            arrays[f"cat_categories_{index}"] = (np.asarray(categories, dtype=np.float64) if is_numeric
+                                                 else np.asarray(categories).astype(str))
+            arrays[f"cat_values_{index}"] = np.asarray(one_hot_scale[offset:offset + len(categories)],
+                                                       dtype=np.float64)
+            if column_fill is None or (isinstance(column_fill, float) and np.isnan(column_fill)):
+                column_fill = np.nan if is_numeric else ""
+            categorical.append({
+                "input": position,
+                "output": n_outputs + offset,
+                "numeric": bool(is_numeric),
+                "fill": float(column_fill) if is_numeric else str(column_fill)
+            })
+            offset += len(categories)
+        n_outputs += offset
+
+    arrays["num_input"] = np.asarray(numeric["input"], dtype=np.intp)
+    arrays["num_output"] = np.asarray(numeric["output"], dtype=np.intp)
+    arrays["num_fill"] = np.asarray(numeric["fill"], dtype=np.float64)
+    arrays["num_scale"] = np.asarray(numeric["scale"], dtype=np.float64)
+    arrays["num_shift"] = np.asarray(numeric["shift"], dtype=np.float64)
+    return arrays, {"categorical": categorical, "n_outputs": n_outputs}
+
+
+def _flatten_trees(trees: List[dict]) -> dict:
+    """
+    Concatenate trees given as {left, right, feature, threshold, default_left,
+    value} node arrays (-1 children for leaves) into one flat node table.
+    Leaves loop back to themselves.
+    """
+    roots, max_depth, offset = [], 0, 0
+    columns = {key: [] for key in ("left", "right", "feature", "threshold", "default_left", "leaf_value")}
+    for tree in trees:
+        n_nodes = len(tree["left"])
+        left = np.asarray(tree["left"], dtype=np.int64)
+        right = np.asarray(tree["right"], dtype=np.int64)
+        is_leaf = left < 0
+        own = np.arange(n_nodes)
+        columns["left"].append(np.where(is_leaf, own, left) + offset)
+        columns["right"].append(np.where(is_leaf, own, right) + offset)
+        columns["feature"].append(np.where(is_leaf, 0, tree["feature"]))
+        columns["threshold"].append(np.asarray(tree["threshold"], dtype=np.float64))
+        columns["default_left"].append(np.asarray(tree["default_left"], dtype=bool))
+        columns["leaf_value"].append(np.asarray(tree["value"], dtype=np.float64))
+
+        depth = np.zeros(n_nodes, dtype=np.int64)
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not is_leaf[node]:
+                for child in (left[node], right[node]):
+                    depth[child] = depth[node] + 1
+                    stack.append(child)
+        max_depth = max(max_depth, int(depth.max()))
+        roots.append(offset)
+        offset += n_nodes
+
+    arrays = {key: np.concatenate(values) for key, values in columns.items()}
+    arrays["left"] = arrays["left"].astype(np.intp)
+    arrays["right"] = arrays["right"].astype(np.intp)
+    arrays["feature"] = arrays["feature"].astype(np.intp)
+    arrays["roots"] = np.asarray(roots, dtype=np.intp)
+    return arrays, max_depth
+
+
+def _compile_forest(model) -> tuple:
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        if tree.n_outputs != 1:
+            raise UnsupportedModelError("multi-output forests are not supported")
+        value = tree.value[:, 0, :]
+        totals = value.sum(axis=1, keepdims=True)
+        trees.append({
+            "left": tree.children_left,
+            "right": tree.children_right,
+            "feature": tree.feature,
+            "threshold": tree.threshold,
+            "default_left": getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=bool)),
+            "value": value / np.where(totals > 0, totals, 1.0)
+        })
+    arrays, max_depth = _flatten_trees(trees)
+    meta = {"kind": "forest", "max_depth": max_depth, "strict": False, "float32": True}
+    return arrays, meta
+
+
+def _parse_base_score(value: str) -> np.ndarray:
+    # "[5.3E-1]" or "5.3E-1" (one value per class for multi-class models)
+    return np.asarray([float(v) for v in value.strip("[]").split(",")], dtype=np.float64)
+
+
+def _compile_xgboost(model: XGBClassifier) -> tuple:
+    learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    booster = learner["gradient_booster"]
+    if booster["name"] != "gbtree":
+        raise UnsupportedModelError(f"XGBoost booster {booster['name']} is not supported")
+
+    n_groups = max(1, int(learner["learner_model_param"]["num_class"]))
+    base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+    if objective == "binary:logistic":
+        base_margin = np.log(base_score / (1 - base_score))
+    elif objective in ("multi:softprob", "multi:softmax"):
+        base_margin = base_score
+    else:
+        raise UnsupportedModelError(f"XGBoost objective {objective} is not supported")
+
+    trees = []
+    for tree in booster["model"]["trees"]:
+        if any(tree["split_type"]):
+            raise UnsupportedModelError("categorical XGBoost splits are not supported")
+        # the JSON holds float32 values as short decimals: round them back to the exact float32
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32).astype(np.float64)
+        trees.append({
+            "left": tree["left_children"],
+            "right": tree["right_children"],
+            "feature": tree["split_indices"],
+            "threshold": conditions,
+            "default_left": tree["default_left"],
+            # leaves store their weight in split_conditions
+            "value": conditions
+        })
+    arrays, max_depth = _flatten_trees(trees)
+    tree_info = np.asarray(booster["model"]["tree_info"], dtype=np.intp)
+    arrays["tree_group"] = np.eye(n_groups)[tree_info]
+    arrays["base_margin"] = np.broadcast_to(base_margin, (n_groups,)).astype(np.float64)
+    meta = {"kind": "boosting", "max_depth": max_depth, "strict": True, "float32": True}
+    return arrays, meta
+
+
+def _compile_estimator(model, sparse_input: bool) -> tuple:
+    if isinstance(model, XGBClassifier):
+        arrays, meta = _compile_xgboost(model)
+        meta["zero_is_missing"] = bool(sparse_input)
+    elif isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        arrays, meta = _compile_forest(model)
+        meta["zero_is_missing"] = False
+    elif isinstance(model, (LogisticRegression, SGDClassifier)):
+        # SGDClassifier: a linear model continued by incremental training
+        arrays = {"coef": np.asarray(model.coef_, dtype=np.float64),
+                  "intercept": np.asarray(model.intercept_, dtype=np.float64)}
+        meta = {"kind": "linear", "max_depth": 0, "strict": False, "float32": False, "zero_is_missing": False}
+    else:
+        raise UnsupportedModelError(f"Unsupported estimator {type(model).__name__}")
+    arrays["estimator_classes"] = np.asarray(model.classes_)
+    return arrays, meta
+
+
+def compile_model(model: NetworkSecurityModel) -> CompiledPredictor:
+    """
+    Build the NumPy-only serving predictor of a fitted NetworkSecurityModel.
+    Raises UnsupportedModelError for steps it cannot reproduce exactly.
+    """
+    feature_names = model.feature_names or [str(i) for i in range(model.n_features)]
+    arrays, meta = _compile_preprocessor(model.preprocessor, feature_names)
+    sparse_input = bool(getattr(model.preprocessor, "sparse_output_", False))
+    estimator_arrays, estimator_meta = _compile_estimator(model.model, sparse_input)
+    arrays.update(estimator_arrays)
+    if getattr(model, "classes", None) is not None:
+        arrays["classes"] = np.asarray(model.classes)
+    meta.update({
+        "feature_names": feature_names,
+        "n_features": len(feature_names),
+        "estimator": estimator_meta,
+        "estimator_type": type(model.model).__name__,
+        "drift_reference": getattr(model, "drift_reference", None)
+    })
+    return CompiledPredictor(arrays, meta)
+
+
+def _synthetic_rows(compiled: CompiledPredictor, n_rows: int, seed: int = 42) -> pd.DataFrame:
+    # raw rows around the fitted statistics, with missing values and unseen categories mixed in
+    rng = np.random.default_rng(seed)
+    a = compiled.arrays
+    columns = {}
+    for position, fill, scale in zip(a["num_input"], a["num_fill"], a["num_scale"]):
+        values = fill + rng.normal(size=n_rows) / scale
+        values[rng.random(n_rows) < 0.05] = np.nan
+        columns[position] = values
+    for i, column in enumerate(compiled.meta["categorical"]):
+        categories = a[f"cat_categories_{i}"]
+        values = categories[rng.integers(0, categories.size, n_rows)].astype(object)
+        values[rng.random(n_rows) < 0.05] = -999.0 if column["numeric"] else "<unseen>"
+        values[rng.random(n_rows) < 0.05] = np.nan if column["numeric"] else None
+        columns[column["input"]] = values
+    names = compiled.feature_names
+    return pd.DataFrame({names[position]: columns.get(position, np.zeros(n_rows))
+                         for position in range(len(names))})
+
+
+def check_parity(model: NetworkSecurityModel, compiled: CompiledPredictor,
+                 X_transformed: Optional[np.ndarray] = None, n_synthetic: int = 2000) -> dict:
+    """
+    Compare the compiled predictor with the sklearn/XGBoost model: the
+    preprocessing on synthetic raw rows, and the estimator on those rows
+    plus X_transformed (e.g. the transformed test split).
+    """
+    raw = _synthetic_rows(compiled, n_synthetic)
+    expected = model.transform(raw) if model.preprocessor is not None else raw.to_numpy(dtype=np.float64)
+    if sparse.issparse(expected):
+        expected = expected.toarray()
+    transformed = compiled.transform(raw.to_numpy(dtype=object))
+    preprocessing_error = float(np.max(np.abs(transformed - expected))) if expected.size else 0.0
+
+    if sparse.issparse(X_transformed):
+        X_transformed = X_transformed.toarray()
+    rows = expected if X_transformed is None else np.vstack([np.asarray(X_transformed, dtype=np.float64), expected])
+    # score the way NetworkSecurityModel does: a sparse preprocessor output stays sparse
+    model_input = sparse.csr_matrix(rows) if sparse.issparse(model.transform(raw.head(1))) else rows
+    mismatches = int(np.sum(compiled.predict_preprocessed(rows) != model.model.predict(model_input)))
+    return {
+        "rows_checked": int(rows.shape[0]),
+        "preprocessing_max_abs_error": preprocessing_error,
+        "prediction_mismatches": mismatches
+    }
+
+
+def export_for_serving(model: NetworkSecurityModel, file_path: str,
+                       X_transformed: Optional[np.ndarray] = None) -> dict:
+    """
+    Compile the model, check it against the original and save it. Returns
+    the parity report; raises if the compiled predictor disagrees.
+    """
+    try:
+        compiled = compile_model(model)
+        report = check_parity(model, compiled, X_transformed)
+        if report["preprocessing_max_abs_error"] > 1e-9 or report["prediction_mismatches"]:
+            raise ValueError(f"Compiled predictor does not match the model: {report}")
+        compiled.save(file_path)
+        logging.info(f"Compiled {compiled.meta['estimator_type']} for serving, parity {report}")
+        return {"compiled_model_file_path": file_path, **report}
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
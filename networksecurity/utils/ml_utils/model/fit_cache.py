@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+from typing import Any
+
+import joblib
+import numpy as np
+from scipy import sparse
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+_MISSING = object()
+
+
+def array_fingerprint(*arrays: np.ndarray) -> str:
+    """
+    sha256 over dtype, shape and raw bytes of the arrays (CSR: of its data, indices and indptr).
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        if sparse.issparse(array):
+            matrix = sparse.csr_matrix(array)
+            digest.update(f"csr{matrix.shape}".encode())
+            for part in (matrix.data, matrix.indices, matrix.indptr):
+                part = np.ascontiguousarray(part)
+                digest.update(f"{part.dtype.str}{part.shape}".encode())
+                digest.update(memoryview(part).cast("B"))
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def make_cache_key(**parts) -> str:
+    """
+    Stable key for any JSON-able description (values that are not JSON are repr'd).
+    """
+    payload = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class FitCache:
+    """
+    Content-addressed on-disk cache of search results (CV scores, fitted estimators).
+
+    One joblib file per key. A hit refreshes the file's mtime, and after each
+    write the least recently used files are deleted until the directory is
+    below max_bytes. Writes go through a temp file + rename, so concurrent
+    readers (threads or other training processes) never see partial entries.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.joblib")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+            os.utime(path)
+        except FileNotFoundError:
+            value = _MISSING
+        except Exception as e:
+            # a corrupt entry is just a miss
+            logging.warning(f"Dropping unreadable fit cache entry {key[:12]}: {e}")
+            self._remove(path)
+            value = _MISSING
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        try:
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            joblib.dump(value, tmp_path)
+            os.replace(tmp_path, path)
+            self.evict()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".joblib"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(os.path.join(self.cache_dir, name))
+                total -= size
+                removed += 1
+            if removed:
+                logging.info(f"Fit cache evicted {removed} entries, {total / 1e6:.1f} MB left")
+            return removed
+
+    def stats(self) -> dict:
+        return {"cache_dir": self.cache_dir, "hits": self.hits, "misses": self.misses}
+
@@ -0,0 +1,145 @@
+import sys
+import copy
+from typing import Dict, Tuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from xgboost import XGBClassifier
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.drift.sketch import QuantileSketch, drift_report, sketch_chunks
+
+INCREMENTAL_MODEL_TYPES = (XGBClassifier, RandomForestClassifier, LogisticRegression, SGDClassifier)
+
+
+def supports_incremental(model) -> bool:
+    return isinstance(model, INCREMENTAL_MODEL_TYPES)
+
+
+def _sgd_penalty(model: LogisticRegression) -> Tuple[object, float]:
+    # LogisticRegression's penalty is deprecated in favour of l1_ratio in recent sklearn
+    penalty = model.get_params().get("penalty")
+    l1_ratio = model.l1_ratio if model.l1_ratio is not None else 0.0
+    if penalty in ("l1", "l2", "elasticnet"):
+        return penalty, l1_ratio
+    if penalty is None or penalty == "none" or not np.isfinite(model.C):
+        return None, 0.0
+    if l1_ratio == 0:
+        return "l2", 0.0
+    return ("l1", 1.0) if l1_ratio == 1 else ("elasticnet", l1_ratio)
+
+
+def _continue_xgboost(model: XGBClassifier, X, y, rounds: int):
+    updated = clone(model).set_params(n_estimators=rounds)
+    # boosting resumes from the previous booster: its trees are kept, new ones fit the residuals
+    updated.fit(X, y, xgb_model=model.get_booster())
+    total = updated.get_booster().num_boosted_rounds()
+    return updated, {"method": "xgb_model", "added": rounds, "size_before": total - rounds, "size_after": total}
+
+
+def _continue_forest(model: RandomForestClassifier, X, y, trees: int):
+    updated = copy.deepcopy(model)
+    before = len(updated.estimators_)
+    # warm_start keeps the fitted trees and only grows the extra ones, on the new rows
+    updated.set_params(warm_start=True, n_estimators=before + trees)
+    updated.fit(X, y)
+    updated.set_params(warm_start=False)
+    return updated, {"method": "warm_start", "added": trees, "size_before": before,
+                     "size_after": len(updated.estimators_)}
+
+
+def _continue_linear(model, X, y, classes: np.ndarray, epochs: int, learning_rate: float):
+    if isinstance(model, SGDClassifier):
+        updated = copy.deepcopy(model)
+        for _ in range(epochs):
+            updated.partial_fit(X, y, classes=classes)
+        return updated, {"method": "partial_fit", "added": epochs}
+
+    # LogisticRegression has no partial_fit: continue as a log-loss SGDClassifier that starts
+    # from its weights. C * sum(loss) + R(w) is mean(loss) + R(w) / (C * n), hence alpha = 1 / (C * n)
+    penalty, l1_ratio = _sgd_penalty(model)
+    updated = SGDClassifier(
+        loss="log_loss",
+        penalty=penalty,
+        alpha=1.0 / (model.C * len(y)) if np.isfinite(model.C) else 0.0001,
+        l1_ratio=l1_ratio,
+        fit_intercept=model.fit_intercept,
+        class_weight=model.class_weight,
+        learning_rate="constant",
+        eta0=learning_rate,
+        max_iter=epochs,
+        tol=None,
+        random_state=42
+    )
+    updated.fit(X, y, coef_init=model.coef_, intercept_init=model.intercept_)
+    return updated, {"method": "sgd", "added": epochs}
+
+
+def continue_training(model, X, y, classes: np.ndarray, xgb_rounds: int, forest_trees: int,
+                      sgd_epochs: int, sgd_learning_rate: float) -> Tuple[object, dict]:
+    """
+    Train a fitted model further on new rows only; the given model is left as it is.
+     - XGBoost: xgb_rounds more boosting rounds on top of the previous booster
+     - RandomForest: forest_trees more trees grown with warm_start
+     - LogisticRegression / SGDClassifier: sgd_epochs SGD epochs from the current weights
+    y must be encoded like the model's training labels and hold every class in classes.
+    Returns (updated model, report).
+    """
+    try:
+        missing = np.setdiff1d(classes, np.unique(y))
+        if missing.size:
+            raise ValueError(f"New rows hold no examples of classes {missing.tolist()}")
+        if isinstance(model, XGBClassifier):
+            updated, report = _continue_xgboost(model, X, y, xgb_rounds)
+        elif isinstance(model, RandomForestClassifier):
+            updated, report = _continue_forest(model, X, y, forest_trees)
+        elif isinstance(model, (LogisticRegression, SGDClassifier)):
+            updated, report = _continue_linear(model, X, y, classes, sgd_epochs, sgd_learning_rate)
+        else:
+            raise ValueError(f"{type(model).__name__} cannot be trained incrementally")
+        report = {"estimator": type(model).__name__, "rows": int(X.shape[0]), **report}
+        logging.info(f"🔁 Incremental update: {report}")
+        return updated, report
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def drift_guard(reference: Dict[str, dict], frame, psi_threshold: float, max_drifted_share: float) -> dict:
+    """
+    PSI of every column of the new rows against the model's training sketches
+    ({column: sketch dict}). exceeded is True when more than max_drifted_share
+    of the columns have a PSI above psi_threshold.
+    """
+    try:
+        sketches = {name: QuantileSketch.from_dict(values) for name, values in reference.items()}
+        accuracy = next(iter(sketches.values())).relative_accuracy if sketches else 0.01
+        current = sketch_chunks([frame], list(sketches), accuracy)
+        report = drift_report(sketches, current)
+        drifted = sorted(name for name, result in report.items() if result["psi"] > psi_threshold)
+        share = len(drifted) / len(report) if report else 0.0
+        return {
+            "columns": len(report),
+            "drifted_columns": drifted,
+            "drifted_share": round(share, 4),
+            "max_psi": max((result["psi"] for result in report.values()), default=0.0),
+            "exceeded": share > max_drifted_share
+        }
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def merge_drift_reference(reference: Dict[str, dict], frame) -> Dict[str, dict]:
+    """
+    Training sketches of the updated model: the previous ones plus the new rows.
+    """
+    try:
+        sketches = {name: QuantileSketch.from_dict(values) for name, values in reference.items()}
+        accuracy = next(iter(sketches.values())).relative_accuracy if sketches else 0.01
+        for name, sketch in sketch_chunks([frame], list(sketches), accuracy).items():
+            sketches[name].merge(sketch)
+        return {name: sketch.to_dict() for name, sketch in sketches.items()}
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
@@ -0,0 +1,252 @@
+import sys
+import time
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.constant.training_pipeline import (
+    MICRO_BATCH_MAX_ROWS,
+    MICRO_BATCH_MAX_WAIT_MS,
+    MICRO_BATCH_MAX_QUEUE_DEPTH,
+    MICRO_BATCH_TIMEOUT_SECONDS
+)
+
+# Upper bounds of the batch size / queue depth histogram buckets
+HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class _Histogram:
+    """
+    Non-cumulative bucket counter, buckets keyed by their upper bound.
+    """
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value: int) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0
+        }
+
+
+class MicroBatcherUnavailableError(RuntimeError):
+    """
+    The batcher cannot take or answer a row in time (queue full, timeout).
+    Reported to the client as a 503.
+    """
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into one vectorized model.predict call.
+
+    A background thread takes the first queued row, then keeps collecting rows
+    until max_batch_rows is reached or max_wait_ms has passed. The wait is
+    adaptive: while traffic is sequential (recent batches of one row) rows are
+    flushed immediately, so a lone client never pays the window.
+
+    Callers wait at most timeout seconds for their row. A worker thread that
+    died is restarted by the next submit().
+    """
+
+    def __init__(self,
+                 model_provider: Callable,
+                 max_batch_rows: int = MICRO_BATCH_MAX_ROWS,
+                 max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+                 max_queue_depth: int = MICRO_BATCH_MAX_QUEUE_DEPTH,
+                 timeout: float = MICRO_BATCH_TIMEOUT_SECONDS):
+        self.model_provider = model_provider
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self._queue: "queue.Queue[Tuple[np.ndarray, Future, float]]" = queue.Queue(maxsize=max_queue_depth)
+
+        self._batch_sizes = _Histogram()
+        self._queue_depths = _Histogram()
+        self._avg_batch = 1.0
+        self._rows = 0
+        self._batches = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+        self._restarts = 0
+        self._stats_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop_event.clear()
+            self._worker = threading.Thread(target=self._run, name="prediction-micro-batcher", daemon=True)
+            self._worker.start()
+        logging.info(
+            f"Micro-batcher started (max {self.max_batch_rows} rows, {self.max_wait * 1000:.1f} ms window)"
+        )
+
+    def _ensure_running(self) -> None:
+        # health check on the request path: a dead worker would leave every caller waiting
+        worker = self._worker
+        if worker is not None and not worker.is_alive() and not self._stop_event.is_set():
+            logging.warning("Micro-batcher thread died, restarting it")
+            with self._stats_lock:
+                self._restarts += 1
+            self.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join(timeout=1)
+            self._worker = None
+
+    def submit(self, row) -> Future:
+        """
+        Queue one feature row; the returned future resolves to its prediction.
+        A caller that gives up on it should cancel() it, so it is not scored.
+        """
+        self._ensure_running()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((np.asarray(row, dtype=np.float64).ravel(), future, time.perf_counter()))
+        except queue.Full:
+            future.set_exception(MicroBatcherUnavailableError("Prediction queue is full"))
+        return future
+
+    def timed_out(self, future: Future) -> MicroBatcherUnavailableError:
+        """
+        Give up on a submitted row: cancel it and return the error to report.
+        """
+        future.cancel()
+        with self._stats_lock:
+            self._timeouts += 1
+        return MicroBatcherUnavailableError(f"No prediction within {self.timeout}s")
+
+    def predict(self, row, timeout: Optional[float] = None):
+        future = self.submit(row)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            raise self.timed_out(future)
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future, float]]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        # Drain whatever is already waiting, without blocking
+        while len(batch) < self.max_batch_rows:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Only hold the batch open when recent traffic shows concurrency
+        if len(batch) < self.max_batch_rows and (len(batch) > 1 or self._avg_batch >= 1.5):
+            deadline = batch[0][2] + self.max_wait
+            while len(batch) < self.max_batch_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                batch = self._collect()
+                if batch:
+                    self._flush(batch)
+            except Exception as e:
+                logging.error(f"Micro-batcher loop error: {e}")
+
+    def _flush(self, batch: List[Tuple[np.ndarray, Future, float]]) -> None:
+        started = time.perf_counter()
+        depth = self._queue.qsize()
+        # rows whose caller timed out are dropped; the others can no longer be cancelled
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        futures = [future for _, future, _ in batch]
+        try:
+            model = self.model_provider()
+            if model is None:
+                raise RuntimeError("Model not loaded")
+            try:
+                matrix = np.vstack([row for row, _, _ in batch])
+            except ValueError:
+                # rows of different widths: score them one by one so each caller gets its own error
+                for row, future, _ in batch:
+                    self._score_single(model, row, future)
+            else:
+                predictions = model.predict(matrix)
+                for future, value in zip(futures, predictions.tolist()):
+                    future.set_result(value)
+        except Exception as e:
+            logging.error(f"Micro-batch of {len(batch)} rows failed: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+        with self._stats_lock:
+            self._batch_sizes.observe(len(batch))
+            self._queue_depths.observe(depth)
+            self._avg_batch = 0.9 * self._avg_batch + 0.1 * len(batch)
+            self._rows += len(batch)
+            self._batches += 1
+            self._wait_seconds += sum(started - enqueued for _, _, enqueued in batch)
+
+    @staticmethod
+    def _score_single(model, row: np.ndarray, future: Future) -> None:
+        try:
+            future.set_result(model.predict(row.reshape(1, -1)).tolist()[0])
+        except Exception as e:
+            future.set_exception(e)
+
+    def stats(self) -> dict:
+        """
+        Queue depth and batch size histograms for the metrics endpoint.
+        """
+        try:
+            with self._stats_lock:
+                return {
+                    "running": self._worker is not None and self._worker.is_alive(),
+                    "max_batch_rows": self.max_batch_rows,
+                    "max_wait_ms": self.max_wait * 1000,
+                    "queue_depth": self._queue.qsize(),
+                    "rows": self._rows,
+                    "batches": self._batches,
+                    "mean_queue_wait_ms": round(1000 * self._wait_seconds / self._rows, 3) if self._rows else 0.0,
+                    "timeouts": self._timeouts,
+                    "restarts": self._restarts,
+                    "batch_size_histogram": self._batch_sizes.to_dict(),
+                    "queue_depth_histogram": self._queue_depths.to_dict()
+                }
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -0,0 +1,251 @@
+import os
+import sys
+import time
+import shutil
+import hashlib
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.compiled import CompiledPredictor, COMPILED_MODEL_EXTENSION
+from networksecurity.constant.training_pipeline import (
+    SERVING_MODEL_FILE_PATH,
+    SERVING_COMPILED_MODEL_FILE_PATH,
+    SERVING_MODEL_PATH_ENV_KEY,
+    MODEL_REGISTRY_POLL_INTERVAL_SECONDS
+)
+
+
+def file_checksum(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute the sha256 checksum of a file without reading it into memory at once.
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def resolve_serving_model_path() -> str:
+    """
+    Model artifact to serve: $SERVING_MODEL_PATH if set, else the compiled
+    export when it exists, else the pickled NetworkSecurityModel.
+    """
+    model_path = os.getenv(SERVING_MODEL_PATH_ENV_KEY)
+    if model_path:
+        return model_path
+    if os.path.exists(SERVING_COMPILED_MODEL_FILE_PATH):
+        return SERVING_COMPILED_MODEL_FILE_PATH
+    return SERVING_MODEL_FILE_PATH
+
+
+def _copy_atomic(source_path: str, destination_path: str) -> None:
+    # copy next to the destination, then rename over it: readers never see a half-written file
+    os.makedirs(os.path.dirname(destination_path) or ".", exist_ok=True)
+    tmp_path = f"{destination_path}.tmp{os.getpid()}"
+    try:
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, destination_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def publish_model(model_file_path: str, compiled_model_file_path: Optional[str] = None,
+                  serving_model_file_path: str = SERVING_MODEL_FILE_PATH,
+                  serving_compiled_model_file_path: str = SERVING_COMPILED_MODEL_FILE_PATH) -> dict:
+    """
+    Copy a trained model (and its compiled export) to the serving paths the
+    registries and batch prediction read. Each file is replaced atomically.
+    Without a compiled export, a stale one is removed so the pickle is served.
+    """
+    try:
+        _copy_atomic(model_file_path, serving_model_file_path)
+        if compiled_model_file_path and os.path.exists(compiled_model_file_path):
+            _copy_atomic(compiled_model_file_path, serving_compiled_model_file_path)
+        else:
+            compiled_model_file_path = None
+            if os.path.exists(serving_compiled_model_file_path):
+                os.remove(serving_compiled_model_file_path)
+        logging.info(f"📦 Model published to {serving_model_file_path}"
+                     + (f" and {serving_compiled_model_file_path}" if compiled_model_file_path else ""))
+        return {
+            "model_file_path": serving_model_file_path,
+            "compiled_model_file_path": serving_compiled_model_file_path if compiled_model_file_path else None
+        }
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def load_model_artifact(file_path: str):
+    """
+    Load a compiled .npz predictor with NumPy alone, anything else with joblib.
+    joblib (and with it sklearn/xgboost) is only imported for pickles.
+    """
+    if file_path.endswith(COMPILED_MODEL_EXTENSION):
+        return CompiledPredictor.load(file_path)
+    import joblib
+    return joblib.load(file_path)
+
+
+class ModelRegistry:
+    """
+    Process-wide holder of the serving model.
+     - loads the model artifact once
+     - watches the artifact file (mtime, then checksum) in a background thread
+     - swaps a freshly loaded model in atomically
+
+    Requests grab a reference with get_model(); a reload only rebinds the
+    reference, so in-flight requests keep scoring with the model they started with.
+    Without a model_path, the serving path is resolved again on every poll, so a
+    compiled export published after startup replaces the pickle.
+    """
+
+    def __init__(self,
+                 model_path: Optional[str] = None,
+                 poll_interval: float = MODEL_REGISTRY_POLL_INTERVAL_SECONDS,
+                 loader: Callable = load_model_artifact):
+        self._fixed_model_path = model_path
+        self.poll_interval = poll_interval
+        self.loader = loader
+
+        self._model = None
+        self._version: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._loaded_path: Optional[str] = None
+        # (path, mtime) of an artifact that failed to load: not retried until the file changes
+        self._failed: Optional[tuple] = None
+        self._loaded_at: Optional[str] = None
+        self._load_time_seconds: Optional[float] = None
+        self._reload_count = 0
+        self._last_error: Optional[str] = None
+
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def model_path(self) -> str:
+        return self._fixed_model_path or resolve_serving_model_path()
+
+    def load(self) -> bool:
+        """
+        Load the artifact if it changed since the last load. Returns True when a new model was swapped in.
+        """
+        with self._reload_lock:
+            model_path, mtime = self.model_path, None
+            try:
+                if not os.path.exists(model_path):
+                    return False
+
+                mtime = os.path.getmtime(model_path)
+                same_path = model_path == self._loaded_path
+                if self._model is not None and same_path and mtime == self._mtime:
+                    return False
+                if (model_path, mtime) == self._failed:
+                    return False
+
+                checksum = file_checksum(model_path)
+                if self._model is not None and same_path and checksum == self._version:
+                    # touched but identical content, nothing to reload
+                    self._mtime = mtime
+                    return False
+
+                start = time.perf_counter()
+                model = self.loader(model_path)
+                load_time = time.perf_counter() - start
+
+                # single reference assignment: readers see either the old or the new model
+                self._model = model
+                if self._version is not None:
+                    self._reload_count += 1
+                self._version = checksum
+                self._mtime = mtime
+                self._loaded_path = model_path
+                self._loaded_at = datetime.now().isoformat(timespec="seconds")
+                self._load_time_seconds = round(load_time, 6)
+                self._last_error = None
+                self._failed = None
+
+                logging.info(f"✅ Model {checksum[:12]} loaded from {model_path} in {load_time:.3f}s")
+                return True
+
+            except Exception as e:
+                # keep serving the previous model if the new artifact is broken or half written
+                self._last_error = str(e)
+                self._failed = (model_path, mtime)
+                logging.error(f"Model reload from {model_path} failed: {e}")
+                if self._model is None:
+                    raise NetworkSecurityException(e, sys)
+                return False
+
+    def get_model(self):
+        """
+        Return the current model, loading it on first use; None while there
+        is no loadable model (the error is in status()).
+        """
+        if self._model is None:
+            try:
+                self.load()
+            except NetworkSecurityException:
+                pass
+        return self._model
+
+    @property
+    def current_model(self):
+        """
+        The model in place, without ever loading one: for callers that must not
+        block (an event loop). The watcher thread does the loading.
+        """
+        return self._model
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def start_watching(self) -> None:
+        """
+        Start the background thread that polls the artifact for changes.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+        self._watcher.start()
+        logging.info(f"Watching {self.model_path} every {self.poll_interval}s for model updates")
+
+    def stop_watching(self) -> None:
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.load()
+            except Exception as e:
+                logging.error(f"Model watcher error: {e}")
+
+    def status(self) -> dict:
+        """
+        Snapshot of the registry state for the status endpoint.
+        """
+        return {
+            "model_path": self._loaded_path or self.model_path,
+            "loaded": self.is_loaded,
+            "version": self._version[:12] if self._version else None,
+            "checksum": self._version,
+            "loaded_at": self._loaded_at,
+            "load_time_seconds": self._load_time_seconds,
+            "reload_count": self._reload_count,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            "poll_interval_seconds": self.poll_interval,
+            "last_error": self._last_error
+        }
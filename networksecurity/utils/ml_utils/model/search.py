@@ -0,0 +1,282 @@
+import os
+import sys
+import math
+import time
+import itertools
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.fit_cache import FitCache, array_fingerprint, make_cache_key
+
+SEARCH_STRATEGIES = ("halving", "grid")
+
+
+@dataclass(eq=False)
+class Candidate:
+    """
+    One hyperparameter combination of one model family.
+    """
+    family: str
+    estimator: object
+    params: dict
+    scores: Dict[int, float] = field(default_factory=dict)  # n_samples -> mean CV score
+
+    def build(self):
+        model = clone(self.estimator).set_params(**self.params)
+        # the search parallelizes across candidates, so every fit is single threaded
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=1)
+        return model
+
+    def cache_key(self, data_fingerprint: str, **context) -> str:
+        """
+        Key of this grid cell on this data: estimator class + all of its params.
+        """
+        estimator = clone(self.estimator).set_params(**self.params)
+        estimator_class = f"{type(estimator).__module__}.{type(estimator).__qualname__}"
+        params = {name: value for name, value in estimator.get_params().items() if name != "n_jobs"}
+        return make_cache_key(data=data_fingerprint, estimator=estimator_class, params=params, **context)
+
+
+def expand_grid(families: List[dict]) -> List[Candidate]:
+    """
+    [{"name", "model", "param_grid"}, ...] -> one Candidate per grid point.
+    """
+    candidates = []
+    for family in families:
+        grid = family["param_grid"]
+        keys = sorted(grid)
+        for values in itertools.product(*(grid[key] for key in keys)):
+            candidates.append(Candidate(family["name"], family["model"], dict(zip(keys, values))))
+    return candidates
+
+
+def _fit_and_score(candidate: Candidate, X, y, train_index, test_index, scorer) -> float:
+    model = candidate.build()
+    model.fit(X[train_index], y[train_index])
+    return scorer(model, X[test_index], y[test_index])
+
+
+def score_on_all_rows(estimator, X, y, scoring: str = "f1_macro", cv: int = 3, random_state: int = 42) -> float:
+    """
+    Mean CV score of estimator on all rows, with the same folds as the last rung of a
+    HyperparameterSearch, so it is comparable to a best_score_ reached on all rows.
+    """
+    scorer = get_scorer(scoring)
+    folds = StratifiedKFold(cv, shuffle=True, random_state=random_state).split(np.arange(len(y)), y)
+    return float(np.mean([
+        scorer(clone(estimator).fit(X[train_index], y[train_index]), X[test_index], y[test_index])
+        for train_index, test_index in folds
+    ]))
+
+
+class HyperparameterSearch:
+    """
+    Searches every candidate family at once over one shared worker pool.
+
+    strategy="halving": successive halving with the number of training rows as
+    the budget. All candidates start on a small stratified subsample; after each
+    rung only the best 1/factor (plus the best of every family, so no family is
+    eliminated on a tiny sample) move on to a factor times larger sample. The
+    last rung uses all rows.
+    strategy="grid": every candidate is cross-validated on all rows, like
+    GridSearchCV, but the fits of all families share the pool.
+
+    With time_budget_seconds set, no fit is started after the deadline, the
+    fits still running are not waited for and their results are dropped; the
+    best candidate scored so far wins (then it is refitted on all rows).
+
+    With a FitCache, CV scores of every (data, estimator, params, rung) cell and
+    the refitted winner are reused across runs, so only new grid points are fitted.
+    """
+
+    def __init__(self, families: List[dict], strategy: str = "halving", scoring: str = "f1_macro",
+                 cv: int = 3, factor: int = 3, min_resources: Optional[int] = None, n_jobs: int = -1,
+                 time_budget_seconds: Optional[float] = None, random_state: int = 42,
+                 cache: Optional[FitCache] = None):
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy {strategy!r}, expected one of {SEARCH_STRATEGIES}")
+        self.families = families
+        self.strategy = strategy
+        self.scoring = scoring
+        self.cv = cv
+        self.factor = factor
+        self.min_resources = min_resources
+        self.n_jobs = n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1)
+        self.time_budget_seconds = time_budget_seconds
+        self.random_state = random_state
+        self.cache = cache
+
+    def _resource_schedule(self, n_candidates: int, n_samples: int, n_classes: int) -> List[int]:
+        if self.strategy == "grid":
+            return [n_samples]
+        n_rungs = max(1, math.ceil(math.log(n_candidates, self.factor))) if n_candidates > 1 else 1
+        min_resources = self.min_resources or 2 * self.cv * n_classes * 10
+        schedule = [max(min_resources, n_samples // self.factor ** (n_rungs - 1 - rung)) for rung in range(n_rungs)]
+        # no point repeating a rung once the data runs out
+        return sorted(set(min(n, n_samples) for n in schedule))
+
+    def _survivors(self, ranked: List[Candidate]) -> List[Candidate]:
+        keep = ranked[:max(1, math.ceil(len(ranked) / self.factor))]
+        for family in {candidate.family for candidate in ranked}:
+            best_of_family = next(candidate for candidate in ranked if candidate.family == family)
+            if best_of_family not in keep:
+                keep.append(best_of_family)
+        return keep
+
+    def _run_rung(self, pool: ThreadPoolExecutor, candidates: List[Candidate], X, y, subset: np.ndarray,
+                  scorer, deadline: Optional[float]) -> List[Candidate]:
+        """
+        Cross-validate every candidate on X[subset]; returns the candidates whose folds all finished.
+        """
+        n_samples = len(subset)
+        folds = list(StratifiedKFold(self.cv, shuffle=True, random_state=self.random_state)
+                     .split(subset, y[subset]))
+        keys, cached = {}, {}
+        if self.cache is not None:
+            for candidate in candidates:
+                keys[id(candidate)] = candidate.cache_key(
+                    self.data_fingerprint_, kind="cv", n_samples=n_samples, cv=self.cv,
+                    scoring=self.scoring, random_state=self.random_state)
+                fold_scores = self.cache.get(keys[id(candidate)])
+                if fold_scores is not None:
+                    cached[id(candidate)] = fold_scores
+
+        # fits are submitted only as workers free up, so none is started after the deadline
+        # and at most n_jobs of them are still running when it passes
+        cells = ((candidate, train_index, test_index)
+                 for candidate in candidates if id(candidate) not in cached
+                 for train_index, test_index in folds)
+        pending = {}
+
+        def submit_next() -> bool:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            cell = next(cells, None)
+            if cell is None:
+                return False
+            candidate, train_index, test_index = cell
+            future = pool.submit(_fit_and_score, candidate, X, y, subset[train_index], subset[test_index], scorer)
+            pending[future] = candidate
+            return True
+
+        while len(pending) < self.n_jobs and submit_next():
+            pass
+        fold_scores = {id(candidate): list(cached.get(id(candidate), [])) for candidate in candidates}
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # running fits cannot be interrupted: leave them to finish in the background
+                logging.warning(f"Search time budget reached, dropping {len(pending)} unfinished fits")
+                break
+            for future in done:
+                candidate = pending.pop(future)
+                fold_scores[id(candidate)].append(future.result())
+                submit_next()
+
+        finished = []
+        for candidate in candidates:
+            scores = fold_scores[id(candidate)]
+            if len(scores) == len(folds):
+                candidate.scores[n_samples] = float(np.mean(scores))
+                finished.append(candidate)
+                if self.cache is not None and id(candidate) not in cached:
+                    self.cache.put(keys[id(candidate)], scores)
+        self.cached_cells_ += len(cached)
+        return finished
+
+    def fit(self, X, y):
+        try:
+            start = time.perf_counter()
+            deadline = None if self.time_budget_seconds is None else start + self.time_budget_seconds
+            scorer = get_scorer(self.scoring)
+            # CSR input stays sparse: folds slice rows and every candidate family accepts it
+            X = X.tocsr() if sparse.issparse(X) else np.asarray(X)
+            y = np.asarray(y)
+            self.data_fingerprint_ = array_fingerprint(X, y) if self.cache is not None else None
+            self.cached_cells_ = 0
+
+            candidates = expand_grid(self.families)
+            schedule = self._resource_schedule(len(candidates), len(y), len(np.unique(y)))
+            # one fixed shuffled order, so each rung's sample contains the previous one
+            order = np.random.RandomState(self.random_state).permutation(len(y))
+            logging.info(f"{self.strategy} search over {len(candidates)} candidates, "
+                         f"rungs {schedule}, {self.n_jobs} workers")
+
+            self.history_ = []
+            best_ranked = []
+            pool = ThreadPoolExecutor(max_workers=self.n_jobs, thread_name_prefix="search")
+            try:
+                for rung, n_samples in enumerate(schedule):
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        logging.warning(f"Search time budget reached before rung {rung}")
+                        break
+                    rung_start = time.perf_counter()
+                    cached_before = self.cached_cells_
+                    finished = self._run_rung(pool, candidates, X, y, np.sort(order[:n_samples]),
+                                              scorer, deadline)
+                    if not finished:
+                        break
+                    ranked = sorted(finished, key=lambda c: c.scores[n_samples], reverse=True)
+                    best_ranked = [(candidate, n_samples) for candidate in ranked]
+                    self.history_.append({
+                        "rung": rung,
+                        "n_samples": n_samples,
+                        "n_candidates": len(candidates),
+                        "n_cached": self.cached_cells_ - cached_before,
+                        "seconds": round(time.perf_counter() - rung_start, 3),
+                        "best_family": ranked[0].family,
+                        "best_params": ranked[0].params,
+                        "best_score": ranked[0].scores[n_samples]
+                    })
+                    logging.info(f"Rung {rung}: {len(finished)}/{len(candidates)} candidates on "
+                                 f"{n_samples} rows in {self.history_[-1]['seconds']}s, best "
+                                 f"{ranked[0].family} {ranked[0].params} = {ranked[0].scores[n_samples]:.4f}")
+                    candidates = self._survivors(ranked)
+            finally:
+                # no waiting on fits still running past the deadline
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            if not best_ranked:
+                raise RuntimeError("Hyperparameter search finished no candidate within the time budget")
+
+            best, n_samples = best_ranked[0]
+            self.best_family_ = best.family
+            self.best_params_ = best.params
+            self.best_score_ = best.scores[n_samples]
+            # below n_samples_ when the time budget stopped the search before the last rung
+            self.best_n_samples_ = n_samples
+            self.n_samples_ = len(y)
+            self.best_per_family_ = {}
+            for candidate, _ in best_ranked:
+                self.best_per_family_.setdefault(candidate.family, candidate)
+
+            # refit the winner on all rows
+            refit_key = None
+            self.best_estimator_ = None
+            if self.cache is not None:
+                refit_key = best.cache_key(self.data_fingerprint_, kind="refit")
+                self.best_estimator_ = self.cache.get(refit_key)
+            if self.best_estimator_ is None:
+                self.best_estimator_ = best.build().set_params(
+                    **({"n_jobs": self.n_jobs} if "n_jobs" in best.estimator.get_params() else {}))
+                self.best_estimator_.fit(X, y)
+                if refit_key is not None:
+                    self.cache.put(refit_key, self.best_estimator_)
+            self.search_seconds_ = round(time.perf_counter() - start, 3)
+            logging.info(f"✅ Search finished in {self.search_seconds_}s: {self.best_family_} "
+                         f"{self.best_params_} ({self.scoring} {self.best_score_:.4f} on {n_samples} rows), "
+                         f"{self.cached_cells_} cells from cache")
+            return self
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
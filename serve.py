@@ -0,0 +1,106 @@
+"""
+Multi-worker launcher for the ASGI app.
+
+The parent process imports asgi_app (which loads the model once), binds the
+listening socket and then fork()s the workers. Each worker inherits the already
+unpickled model through copy-on-write pages instead of loading its own copy,
+and all workers accept connections from the shared socket. A worker that
+dies is replaced by a fresh fork of the parent.
+
+    python serve.py --workers 4 --port 8080
+"""
+import os
+import gc
+import sys
+import time
+import signal
+import socket
+import argparse
+
+import uvicorn
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.constant.training_pipeline import SERVING_HOST, SERVING_PORT
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket) -> None:
+    config = uvicorn.Config(app, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def serve(workers: int, host: str = SERVING_HOST, port: int = SERVING_PORT) -> None:
+    try:
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Pre-fork serving needs os.fork(); run `python asgi_app.py` on this platform")
+
+        from asgi_app import app, model_registry
+        logging.info(f"Model preloaded in parent {os.getpid()}: {model_registry.status()['version']}")
+
+        sock = bind_socket(host, port)
+
+        # Move everything allocated so far out of the collector's reach, so GC passes
+        # in the workers do not touch (and thereby copy) the shared model pages
+        gc.freeze()
+
+        def spawn() -> int:
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                run_worker(app, sock)
+                os._exit(0)
+            return pid
+
+        children = {spawn(): time.monotonic() for _ in range(workers)}
+        stopping = False
+
+        logging.info(f"🚀 Serving on http://{host}:{port} with {workers} workers: {list(children)}")
+
+        def terminate(signum, frame):
+            nonlocal stopping
+            stopping = True
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGTERM, terminate)
+        signal.signal(signal.SIGINT, terminate)
+
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = children.pop(pid, None)
+            if started is None or stopping:
+                continue
+            logging.warning(f"Worker {pid} exited (status {status}), starting a replacement")
+            if time.monotonic() - started < 1.0:
+                time.sleep(1.0)  # a worker that dies at once would otherwise be re-forked in a tight loop
+            children[spawn()] = time.monotonic()
+
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-fork multi-worker server for the NetworkSecurity ASGI app")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--host", default=SERVING_HOST)
+    parser.add_argument("--port", type=int, default=SERVING_PORT)
+    args = parser.parse_args()
+
+    serve(args.workers, args.host, args.port)
@@ -0,0 +1,44 @@
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.components.data_transformation import DataTransformation
+
+NUMERICAL_COLUMNS = ["url_length", "age_of_domain", "page_rank"]
+CATEGORICAL_COLUMNS = ["protocol", "ssl_final_state"]
+
+
+def make_raw_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw feature rows shaped like the phishing data, with missing values mixed in"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "url_length": rng.lognormal(3.5, 0.6, n_rows),
+        "age_of_domain": rng.normal(0, 1, n_rows),
+        "page_rank": rng.integers(-1, 2, n_rows).astype(np.float64),
+        "protocol": rng.choice(["http", "https", "ftp"], n_rows).astype(object),
+        "ssl_final_state": rng.choice([-1.0, 0.0, 1.0], n_rows)
+    })
+    for column in frame.columns:
+        frame.loc[rng.random(n_rows) < 0.05, column] = np.nan
+    return frame
+
+
+def make_labels(frame: pd.DataFrame, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    score = (frame["url_length"].fillna(30) / 30 + frame["age_of_domain"].fillna(0)
+             + (frame["protocol"] == "https") - (frame["ssl_final_state"] == -1))
+    return (score + rng.normal(0, 0.5, len(frame)) > 1.2).astype(np.int64).to_numpy()
+
+
+def make_preprocessor(output_format: str = "dense"):
+    """The ColumnTransformer DataTransformation builds, unfitted"""
+    config = types.SimpleNamespace(output_format=output_format)
+    schema = {"numerical_columns": NUMERICAL_COLUMNS, "categorical_columns": CATEGORICAL_COLUMNS}
+    return DataTransformation(None, None, config).get_data_transformer_object(schema)
+
+
+@pytest.fixture(scope="session")
+def raw_frame() -> pd.DataFrame:
+    return make_raw_frame(3000)
@@ -0,0 +1,73 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import asgi_app
+from networksecurity.utils.ml_utils.model.batch_input import score_batch
+
+
+class SumModel:
+    """Predicts 1 when the features add up to more than 0"""
+    n_features = 3
+    feature_names = None
+
+    def predict(self, X):
+        return (np.asarray(X, dtype=np.float64).sum(axis=1) > 0).astype(np.int64)
+
+
+class StaticRegistry:
+    current_model = SumModel()
+
+    def get_model(self):
+        return self.current_model
+
+    def start_watching(self):
+        pass
+
+    def stop_watching(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(asgi_app, "model_registry", StaticRegistry())
+    monkeypatch.setattr(asgi_app, "monitor_and_score", score_batch)
+    monkeypatch.setattr(asgi_app, "PREDICTION_BATCH_MAX_BYTES", 1000)
+    with TestClient(asgi_app.app) as client:
+        yield client
+
+
+def test_json_and_npy_batches_are_scored(client):
+    response = client.post("/predict_batch", json=[[1, 2, 3], [-1, -2, -3], [1, 2]])
+    assert response.status_code == 200
+    assert response.json()["predictions"] == [1, 0, None]
+
+    buffer = io.BytesIO()
+    np.save(buffer, np.array([[1.0, 1.0, 1.0], [-5.0, 0.0, 0.0]]))
+    response = client.post("/predict_batch", content=buffer.getvalue(),
+                           headers={"content-type": "application/x-npy"})
+    assert response.status_code == 200
+    assert response.json()["predictions"] == [1, 0]
+
+
+def test_declared_oversized_body_is_refused(client):
+    response = client.post("/predict_batch", content=json.dumps([[1, 2, 3]] * 200))
+    assert response.status_code == 413
+
+
+def test_chunked_oversized_body_is_refused_without_content_length(client):
+    def chunks():
+        for _ in range(100):
+            yield b"[1, 2, 3], " * 10
+
+    response = client.post("/predict_batch", content=chunks())
+    assert response.status_code == 413
+
+
+def test_malformed_json_is_a_client_error(client):
+    response = client.post("/predict_batch", content=b"{not json")
+    assert response.status_code == 400
+    assert client.post("/predict", content=b"{not json").status_code == 400
@@ -0,0 +1,69 @@
+import io
+
+import numpy as np
+import pytest
+
+from networksecurity.constant.training_pipeline import PREDICTION_BATCH_MAX_ROWS
+from networksecurity.utils.ml_utils.model.batch_input import (
+    BatchInputError,
+    batch_from_json,
+    batch_from_npy,
+    score_batch
+)
+
+
+class SumModel:
+    def predict(self, matrix):
+        return (np.nansum(matrix, axis=1) > 0).astype(int)
+
+
+def npy(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+def test_json_layouts_decode_to_the_same_matrix():
+    rows = [[1, -1, None], [0, 2, 3]]
+    expected, _, _, _ = batch_from_json(rows, 3)
+    wrapped, _, _, _ = batch_from_json({"rows": rows}, 3)
+    columnar, _, _, _ = batch_from_json({"columns": {"c": [None, 3], "a": [1, 0], "b": [-1, 2]}}, 3,
+                                        feature_names=["a", "b", "c"])
+    np.testing.assert_array_equal(wrapped, expected)
+    np.testing.assert_array_equal(columnar, expected)
+    assert np.isnan(expected[0, 2])
+
+
+def test_bad_rows_are_reported_and_the_rest_scored_in_order():
+    rows = [[1, 1], [1], "row", [1, "x"], [-1, -1]]
+    matrix, valid_index, errors, n_rows = batch_from_json(rows, 2)
+    assert valid_index == [0, 4] and [error["row"] for error in errors] == [1, 2, 3]
+    result = score_batch(SumModel(), matrix, valid_index, n_rows, errors)
+    assert result["status"] == "partial" and result["predictions"] == [1, None, None, None, 0]
+
+
+@pytest.mark.parametrize("payload, message", [
+    ({"rows": "x"}, "'rows' must be a list"),
+    ({"columns": {"a": [1], "b": [1, 2]}}, "same number of values"),
+    ({"columns": {"a": [1]}}, "Missing columns"),
+    ({"values": []}, "Expected a list of rows"),
+    ([], "No rows provided")
+])
+def test_malformed_json_batches_are_client_errors(payload, message):
+    with pytest.raises(BatchInputError, match=message) as error:
+        batch_from_json(payload, 2, feature_names=["a", "b"])
+    assert error.value.status_code == 400
+
+
+def test_npy_batches():
+    matrix, valid_index, errors, n_rows = batch_from_npy(npy(np.ones((3, 2), dtype=np.float32)), 2)
+    assert matrix.dtype == np.float64 and valid_index == [0, 1, 2] and n_rows == 3
+    with pytest.raises(BatchInputError, match="2-D"):
+        batch_from_npy(npy(np.ones(3)), 2)
+    with pytest.raises(BatchInputError, match="Expected 2 features"):
+        batch_from_npy(npy(np.ones((3, 4))), 2)
+    with pytest.raises(BatchInputError, match="not a valid .npy"):
+        batch_from_npy(npy(np.array([{"a": 1}], dtype=object)), 2)
+    with pytest.raises(BatchInputError) as error:
+        batch_from_npy(npy(np.ones((PREDICTION_BATCH_MAX_ROWS + 1, 2))), 2)
+    assert error.value.status_code == 413
@@ -0,0 +1,60 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from networksecurity.constant.training_pipeline import SERVING_MODEL_FILE_PATH
+from networksecurity.pipeline.batch_prediction import compute_shards, start_batch_prediction
+from networksecurity.utils.ml_utils.model.estimator import NetworkSecurityModel
+from tests.conftest import make_labels, make_preprocessor, make_raw_frame
+
+
+@pytest.fixture
+def input_file(tmp_path, monkeypatch):
+    """A served model under the working directory and a CSV of raw rows to score"""
+    monkeypatch.chdir(tmp_path)
+    train = make_raw_frame(1000)
+    preprocessor = make_preprocessor().fit(train)
+    model = NetworkSecurityModel(LogisticRegression(max_iter=500).fit(preprocessor.transform(train),
+                                                                      make_labels(train)),
+                                 preprocessor=preprocessor)
+    os.makedirs(os.path.dirname(SERVING_MODEL_FILE_PATH), exist_ok=True)
+    joblib.dump(model, SERVING_MODEL_FILE_PATH)
+
+    frame = make_raw_frame(503, seed=3)
+    frame["protocol"] = frame["protocol"].fillna("http")
+    frame.to_csv("input.csv", index=False)
+    # values as a client would write them: padded decimals must come back unchanged
+    with open("input.csv", "a") as file:
+        file.write("31.50,0.250,1.0,https,-1.0\n")
+    return os.path.abspath("input.csv"), model
+
+
+def test_every_mode_writes_the_same_bytes(input_file, tmp_path):
+    input_file_path, model = input_file
+    outputs = {
+        "whole": start_batch_prediction(input_file_path, str(tmp_path / "whole.csv")),
+        "chunked": start_batch_prediction(input_file_path, str(tmp_path / "chunked.csv"), chunksize=37),
+        "parallel": start_batch_prediction(input_file_path, str(tmp_path / "parallel.csv"), chunksize=37, workers=3)
+    }
+    contents = {mode: open(path, "rb").read() for mode, path in outputs.items()}
+    assert contents["chunked"] == contents["whole"]
+    assert contents["parallel"] == contents["whole"]
+    assert contents["whole"].splitlines()[-1].startswith(b"31.50,0.250,1.0,https,-1.0,")
+
+    scored = pd.read_csv(outputs["whole"])
+    expected = model.predict(pd.read_csv(input_file_path))
+    np.testing.assert_array_equal(scored["prediction"].to_numpy(), expected)
+
+
+def test_shards_cover_the_data_rows_on_line_boundaries(input_file):
+    input_file_path, _ = input_file
+    data = open(input_file_path, "rb").read()
+    header_end = data.index(b"\n") + 1
+    shards = compute_shards(input_file_path, 4)
+    assert shards[0][0] == header_end and shards[-1][1] == len(data)
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start and data[start - 1:start] == b"\n"
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.pipeline.dag_executor import DagExecutor, Node
+from networksecurity.pipeline.stage_cache import StageCache
+
+
+def step(label, delay, *inputs):
+    time.sleep(delay)
+    return "+".join([label, *inputs])
+
+
+def fail():
+    raise RuntimeError("stage failed")
+
+
+def diamond(fast=0.05, slow=0.4):
+    # source -> (fast, slow) -> sink: the slow branch is the critical path
+    return [
+        Node("source", step, args=("source", 0.05)),
+        Node("fast", step, inputs=["source"], args=("fast", fast)),
+        Node("slow", step, inputs=["source"], args=("slow", slow)),
+        Node("sink", step, inputs=["fast", "slow"], args=("sink", 0.05))
+    ]
+
+
+@pytest.mark.parametrize("use_processes", [True, False])
+def test_independent_nodes_run_concurrently_and_the_timeline_finds_the_critical_path(use_processes):
+    executor = DagExecutor(diamond(fast=0.3, slow=0.5), max_workers=2, use_processes=use_processes)
+    outputs = executor.run()
+    assert outputs["sink"] == "sink+fast+source+slow+source"
+
+    timeline = executor.timeline
+    nodes = timeline["nodes"]
+    assert nodes["fast"]["start"] < nodes["slow"]["end"] and nodes["slow"]["start"] < nodes["fast"]["end"]
+    assert nodes["sink"]["start"] >= max(nodes["fast"]["end"], nodes["slow"]["end"])
+    assert timeline["critical_path"] == ["source", "slow", "sink"]
+    assert timeline["critical_path_seconds"] <= timeline["makespan_seconds"]
+    # the makespan is the critical path, not the sum of every node
+    assert timeline["makespan_seconds"] < timeline["busy_seconds"]
+    assert timeline["idle_worker_seconds"] > 0
+
+
+def test_nodes_wait_for_a_free_worker():
+    executor = DagExecutor(diamond(fast=0.3, slow=0.3), max_workers=1, use_processes=False)
+    executor.run()
+    nodes = executor.timeline["nodes"]
+    later = max(("fast", "slow"), key=lambda name: nodes[name]["start"])
+    assert nodes[later]["queued_seconds"] >= 0.25
+    assert executor.timeline["average_parallelism"] <= 1.0
+
+
+def test_failure_is_raised_and_reported():
+    events = []
+    nodes = [Node("source", step, args=("source", 0.0)), Node("broken", fail, inputs=[]),
+             Node("sink", step, inputs=["source", "broken"], args=("sink", 0.0))]
+    executor = DagExecutor(nodes, max_workers=2, use_processes=False,
+                           on_event=lambda name, event, *duration: events.append((name, event)))
+    with pytest.raises(NetworkSecurityException):
+        executor.run()
+    assert ("broken", "failed") in events and ("sink", "started") not in events
+
+
+def test_cached_nodes_are_skipped_without_a_worker(tmp_path):
+    def run():
+        events = []
+        nodes = [Node(node.name, node.func, node.inputs, node.args,
+                      cache_key=lambda *upstream, name=node.name: f"{name}:{upstream}") for node in diamond()]
+        executor = DagExecutor(nodes, max_workers=2, use_processes=False,
+                               stage_cache=StageCache(str(tmp_path), None),
+                               on_event=lambda name, event, *duration: events.append((name, event)))
+        return executor, executor.run(), events
+
+    _, first, _ = run()
+    executor, second, events = run()
+    assert second == first
+    assert [event for _, event in events] == ["skipped"] * 4
+    assert all(node["status"] == "skipped" for node in executor.timeline["nodes"].values())
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        DagExecutor([Node("a", step, inputs=["missing"])])
+    with pytest.raises(ValueError, match="cycle"):
+        DagExecutor([Node("a", step, inputs=["b"]), Node("b", step, inputs=["a"])])
+    with pytest.raises(ValueError, match="unique"):
+        DagExecutor([Node("a", step), Node("a", step)])
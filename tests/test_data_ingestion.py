@@ -0,0 +1,74 @@
+import os
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.utils.main_utils.utils import load_dataframe
+
+
+def documents(ids, url_length=10):
+    return pd.DataFrame({"_id": [f"id{i}" for i in ids], "id": list(ids),
+                         "url_length": [url_length]*len(ids), "label": [1]*len(ids)})
+
+
+@pytest.fixture
+def ingestion(tmp_path):
+    ingestion=DataIngestion(SimpleNamespace(
+        ingestion_mode="incremental", watermark_strategy="object_id",
+        persistent_feature_store_file_path=str(tmp_path/"store"/"data.parquet"),
+        watermark_file_path=str(tmp_path/"store"/"watermark.json"),
+        delta_file_path=str(tmp_path/"run"/"delta"/"data.parquet"),
+        feature_store_file_path=str(tmp_path/"run"/"feature_store"/"data.parquet"),
+        training_file_path=str(tmp_path/"run"/"ingested"/"train.parquet"),
+        testing_file_path=str(tmp_path/"run"/"ingested"/"test.parquet"),
+        train_test_split_ration=0.2
+    ))
+    return ingestion
+
+
+def test_merge_upserts_on_id_and_reports_only_unseen_rows(ingestion):
+    merged,new_rows=ingestion.merge_into_feature_store(documents(range(5)),replace=True)
+    assert len(merged)==5 and len(new_rows)==5
+
+    # the lag window re-reads id3/id4, one of them changed in place
+    delta=documents([3,4,5,6])
+    delta.loc[delta["_id"]=="id4","url_length"]=99
+    merged,new_rows=ingestion.merge_into_feature_store(delta,deleted_ids=["id0"])
+
+    assert list(new_rows["_id"])==["id5","id6"]
+    assert sorted(merged["_id"])==["id1","id2","id3","id4","id5","id6"]
+    assert merged.set_index("_id").loc["id4","url_length"]==99
+    stored=load_dataframe(ingestion.data_ingestion_config.persistent_feature_store_file_path)
+    pd.testing.assert_frame_equal(stored,merged)
+
+
+def test_incremental_run_writes_only_new_rows_to_the_delta(ingestion, monkeypatch):
+    monkeypatch.setattr(ingestion,"export_full_with_watermark",
+                        lambda: (documents(range(10)),{"last_timestamp": "2026-01-01T00:00:00+00:00"}))
+    ingestion.initiate_data_ingestion()
+    assert ingestion.read_watermark()["last_timestamp"]=="2026-01-01T00:00:00+00:00"
+
+    monkeypatch.setattr(ingestion,"export_collection_delta",
+                        lambda watermark: (documents(range(8,13)),[],{"last_timestamp": "2026-01-02T00:00:00+00:00"}))
+    artifact=ingestion.initiate_data_ingestion()
+
+    delta=load_dataframe(artifact.delta_file_path)
+    assert list(delta["id"])==[10,11,12] and "_id" not in delta.columns
+    feature_store=load_dataframe(ingestion.data_ingestion_config.feature_store_file_path)
+    assert sorted(feature_store["id"])==list(range(13))
+    assert ingestion.read_watermark()["last_timestamp"]=="2026-01-02T00:00:00+00:00"
+
+
+def test_watermark_from_another_strategy_forces_a_full_export(ingestion):
+    ingestion.merge_into_feature_store(documents(range(3)),replace=True)
+    ingestion.write_watermark({"last_timestamp": "2026-01-01T00:00:00+00:00"})
+    assert ingestion.read_watermark() is not None
+
+    ingestion.data_ingestion_config.watermark_strategy="change_stream"
+    assert ingestion.read_watermark() is None
+    # without the store the watermark means nothing either
+    ingestion.data_ingestion_config.watermark_strategy="object_id"
+    os.remove(ingestion.data_ingestion_config.persistent_feature_store_file_path)
+    assert ingestion.read_watermark() is None
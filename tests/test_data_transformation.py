@@ -0,0 +1,95 @@
+import types
+
+import joblib
+import numpy as np
+import pytest
+from scipy import sparse
+
+from networksecurity.components.data_transformation import DataTransformation
+from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.utils.main_utils.utils import (
+    apply_schema_dtypes,
+    compact_int_dtype,
+    load_feature_matrix,
+    load_numpy_array,
+    save_dataframe
+)
+from tests.conftest import CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS, make_labels, make_preprocessor, make_raw_frame
+
+SCHEMA = {
+    "columns": [{"name": name, "dtype": "float"} for name in NUMERICAL_COLUMNS]
+               + [{"name": "protocol", "dtype": "string"}, {"name": "ssl_final_state", "dtype": "float"},
+                  {"name": "label", "dtype": "int"}],
+    "numerical_columns": NUMERICAL_COLUMNS,
+    "categorical_columns": CATEGORICAL_COLUMNS,
+    "target_column": "label"
+}
+
+
+def config(tmp_path, output_format, compact_labels=True):
+    directory = tmp_path / output_format
+    return types.SimpleNamespace(
+        output_format=output_format, compact_labels=compact_labels, fit_mode="memory", feature_dtype="float32",
+        transformed_train_features_file_path=str(directory / "train_features.npy"),
+        transformed_train_labels_file_path=str(directory / "train_labels.npy"),
+        transformed_test_features_file_path=str(directory / "test_features.npy"),
+        transformed_test_labels_file_path=str(directory / "test_labels.npy")
+    )
+
+
+@pytest.fixture
+def ingestion_artifact(tmp_path):
+    paths = {}
+    for split, seed in (("train", 0), ("test", 1)):
+        frame = make_raw_frame(400, seed=seed)
+        frame["label"] = make_labels(frame, seed=seed)
+        paths[split] = str(tmp_path / f"{split}.parquet")
+        save_dataframe(paths[split], frame)
+    return DataIngestionArtifact(trained_file_path=paths["train"], test_file_path=paths["test"])
+
+
+def transform(tmp_path, ingestion_artifact, output_format):
+    preprocessor_file_path = str(tmp_path / f"preprocessor_{output_format}.pkl")
+    train = make_raw_frame(400, seed=0)
+    joblib.dump(make_preprocessor(output_format).fit(train), preprocessor_file_path)
+    transformation = DataTransformation(ingestion_artifact, None, config(tmp_path, output_format))
+    return transformation.transform_data(SCHEMA, preprocessor_file_path)
+
+
+def test_sparse_output_is_saved_as_csr_with_the_same_values(tmp_path, ingestion_artifact):
+    dense = transform(tmp_path, ingestion_artifact, "dense")
+    csr = transform(tmp_path, ingestion_artifact, "sparse")
+
+    assert dense.transformed_train_features_file_path.endswith(".npy")
+    assert csr.transformed_train_features_file_path.endswith(".npz")
+    dense_features = load_feature_matrix(dense.transformed_train_features_file_path, mmap_mode="r")
+    sparse_features = load_feature_matrix(csr.transformed_train_features_file_path)
+    assert sparse.isspmatrix_csr(sparse_features)
+    assert dense_features.dtype == sparse_features.dtype == np.float32
+    np.testing.assert_array_equal(sparse_features.toarray(), dense_features)
+
+
+def test_int_labels_are_stored_compact(tmp_path, ingestion_artifact):
+    artifact = transform(tmp_path, ingestion_artifact, "dense")
+    labels = load_numpy_array(artifact.transformed_train_labels_file_path)
+    assert labels.dtype == np.int8
+    np.testing.assert_array_equal(labels, make_labels(make_raw_frame(400, seed=0), seed=0))
+
+
+def test_labels_that_are_not_whole_numbers_are_left_alone(tmp_path):
+    schema = {"columns": [{"name": "label", "dtype": "int"}], "target_column": "label"}
+    transformation = DataTransformation(None, None, config(tmp_path, "dense"))
+    assert transformation.label_array(np.array([0.0, 1.0, np.nan]), schema).dtype == np.float64
+    assert transformation.label_array(np.array([0.0, 1.5]), schema).dtype == np.float64
+    assert transformation.label_array(np.array([-1.0, 1.0]), schema).dtype == np.int8
+    transformation.data_transformation_config.compact_labels = False
+    assert transformation.label_array(np.array([0, 1]), schema).dtype == np.int64
+
+
+def test_schema_dtypes_and_compact_int_dtype():
+    frame = apply_schema_dtypes(make_raw_frame(50).assign(label=["1"] * 49 + [None]), SCHEMA)
+    # an int column with missing values is stored as float64
+    assert frame["label"].dtype == np.float64 and frame["protocol"].dtype == object
+    assert compact_int_dtype(np.array([-1, 1])) == np.int8
+    assert compact_int_dtype(np.array([0, 40000])) == np.int32
+    assert compact_int_dtype(np.array([2 ** 40])) == np.int64
@@ -0,0 +1,115 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from networksecurity.utils.ml_utils.drift.monitor import DriftMonitor, _Layout
+from networksecurity.utils.ml_utils.drift.sketch import QuantileSketch
+
+FEATURES = ["a", "unmonitored", "b"]
+
+
+def traffic(n_rows, seed, shift=0.0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.normal(10 + shift, 2, n_rows), rng.normal(0, 1, n_rows),
+                            rng.lognormal(1, 0.5, n_rows)])
+
+
+def make_model():
+    reference = traffic(20000, seed=0)
+    return SimpleNamespace(feature_names=FEATURES, drift_reference={
+        "a": QuantileSketch().update(reference[:, 0]).to_dict(),
+        "b": QuantileSketch().update(reference[:, 2]).to_dict()
+    })
+
+
+def make_monitor(model, **kwargs):
+    options = dict(bins=10, flush_interval=60, window_flushes=3, min_rows=200, psi_threshold=0.2,
+                   buffer_rows=256, n_shards=4)
+    options.update(kwargs)
+    monitor = DriftMonitor(lambda: model, **options)
+    # the first flush binds the model; rows observed before it are not counted
+    monitor.flush()
+    return monitor
+
+
+def observe_in_batches(monitor, rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        monitor.observe(rows[start:start + batch_size])
+
+
+def test_matching_traffic_is_not_drift_and_every_row_is_counted():
+    monitor = make_monitor(make_model())
+    rows = traffic(3000, seed=1)
+    observe_in_batches(monitor, rows[:1000], 1)
+    observe_in_batches(monitor, rows[1000:], 500)
+    report = monitor.flush()
+    assert report["enabled"] and report["drifted_features"] == []
+    assert set(report["features"]) == {"a", "b"}
+    assert report["rows_observed"] == report["window_rows"] == 3000
+    assert report["features"]["a"]["psi"] < 0.05 and report["features"]["a"]["p_value"] > 0.01
+
+
+def test_shifted_feature_is_flagged():
+    monitor = make_monitor(make_model())
+    monitor.observe(traffic(2000, seed=2, shift=3.0))
+    report = monitor.flush()
+    assert report["drifted_features"] == ["a"]
+    assert report["features"]["a"]["psi"] > 0.2 and report["features"]["a"]["p_value"] < 1e-6
+
+
+def test_window_slides_and_missing_values_are_counted_apart():
+    monitor = make_monitor(make_model(), window_flushes=2)
+    rows = traffic(500, seed=3)
+    rows[:50, 0] = np.nan
+    monitor.observe(rows)
+    first = monitor.flush()
+    assert first["features"]["a"]["missing"] == 50 and first["features"]["a"]["rows"] == 450
+    assert monitor.flush()["window_rows"] == 500
+    # the flush holding the traffic has left the window
+    report = monitor.flush()
+    assert report["window_rows"] == 0 and "psi" not in report["features"]["a"]
+
+
+def test_concurrent_observers_lose_no_rows():
+    monitor = make_monitor(make_model(), buffer_rows=64, n_shards=2)
+    rows = traffic(400, seed=4)
+
+    def worker():
+        observe_in_batches(monitor, rows, 3)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert monitor.flush()["window_rows"] == 8 * 400
+
+
+def test_broadcast_and_searchsorted_binning_agree():
+    model = make_model()
+    layout = _Layout(model.drift_reference, FEATURES, bins=10)
+    values = traffic(65, seed=5)[:, layout.positions]
+    values[3, 1] = np.nan
+    np.testing.assert_array_equal(layout.bin_indices(values[:64]), layout.bin_indices(values)[:64])
+
+
+def test_unusable_input_and_models_disable_monitoring_quietly():
+    model = make_model()
+    monitor = make_monitor(model)
+    monitor.observe(np.zeros((2, 2)))
+    monitor.observe(np.array([["x", "y", "z"]]))
+    assert monitor.flush()["rows_observed"] == 0
+
+    assert make_monitor(None).flush() == {"enabled": False, "reason": "no model loaded"}
+    no_reference = SimpleNamespace(feature_names=FEATURES, drift_reference=None)
+    assert make_monitor(no_reference).flush()["reason"] == "model has no drift reference"
+
+    # a new model from the registry rebinds the monitor and restarts the window
+    models = [model]
+    monitor = DriftMonitor(lambda: models[0], min_rows=1)
+    monitor.flush()
+    monitor.observe(traffic(10, seed=6))
+    models[0] = make_model()
+    assert monitor.flush()["window_rows"] == 0
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+from networksecurity.utils.ml_utils.model.estimator import NetworkSecurityModel
+from networksecurity.utils.ml_utils.model.export import check_parity, compile_model
+from networksecurity.utils.ml_utils.model.compiled import CompiledPredictor
+from tests.conftest import make_labels, make_preprocessor, make_raw_frame
+
+ESTIMATORS = {
+    "RandomForest": lambda: RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0),
+    "XGBoost": lambda: XGBClassifier(n_estimators=30, max_depth=4, eval_metric="logloss"),
+    "LogisticRegression": lambda: LogisticRegression(max_iter=500)
+}
+
+
+def fit_model(raw_frame, estimator_name: str, output_format: str) -> NetworkSecurityModel:
+    preprocessor = make_preprocessor(output_format).fit(raw_frame)
+    estimator = ESTIMATORS[estimator_name]().fit(preprocessor.transform(raw_frame), make_labels(raw_frame))
+    return NetworkSecurityModel(estimator, preprocessor=preprocessor, classes=np.array([-1, 1]))
+
+
+def scoring_frame():
+    # fresh rows plus unseen categories and whole rows of missing values
+    frame = make_raw_frame(500, seed=1)
+    frame.loc[:49, "protocol"] = "gopher"
+    frame.loc[50:99, "ssl_final_state"] = 7.0
+    frame.loc[100:109, :] = np.nan
+    return frame
+
+
+@pytest.mark.parametrize("output_format", ["dense", "sparse"])
+@pytest.mark.parametrize("estimator_name", list(ESTIMATORS))
+def test_compiled_model_matches_original(raw_frame, estimator_name, output_format):
+    model = fit_model(raw_frame, estimator_name, output_format)
+    compiled = compile_model(model)
+    frame = scoring_frame()
+
+    expected = model.transform(frame)
+    expected = expected.toarray() if hasattr(expected, "toarray") else expected
+    np.testing.assert_allclose(compiled.transform(frame.to_numpy(dtype=object)), expected, atol=1e-9)
+    np.testing.assert_array_equal(compiled.predict(frame), model.predict(frame))
+
+    report = check_parity(model, compiled)
+    assert report["preprocessing_max_abs_error"] <= 1e-9
+    assert report["prediction_mismatches"] == 0
+
+
+def test_compiled_model_round_trips(raw_frame, tmp_path):
+    model = fit_model(raw_frame, "XGBoost", "dense")
+    file_path = str(tmp_path / "model_compiled.npz")
+    compile_model(model).save(file_path)
+    frame = scoring_frame()
+    np.testing.assert_array_equal(CompiledPredictor.load(file_path).predict(frame), model.predict(frame))
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.datasets import make_classification
+
+from networksecurity.utils.ml_utils.model.fit_cache import FitCache, array_fingerprint, make_cache_key
+from networksecurity.utils.ml_utils.model.search import HyperparameterSearch
+
+
+class CountingClassifier(ClassifierMixin, BaseEstimator):
+    """Majority-class classifier counting its fits across clones"""
+    fits = 0
+
+    def __init__(self, shift=0):
+        self.shift = shift
+
+    def fit(self, X, y):
+        CountingClassifier.fits += 1
+        self.classes_, counts = np.unique(y, return_counts=True)
+        self.majority_ = self.classes_[np.argmax(counts)]
+        return self
+
+    def predict(self, X):
+        return np.full(X.shape[0], self.majority_)
+
+
+def test_second_search_on_the_same_data_fits_only_new_grid_points(tmp_path):
+    X, y = make_classification(n_samples=300, random_state=0)
+    cache = FitCache(str(tmp_path), max_bytes=10**8)
+
+    def search(shifts):
+        families = [{"name": "Counting", "model": CountingClassifier(), "param_grid": {"shift": shifts}}]
+        CountingClassifier.fits = 0
+        return HyperparameterSearch(families, strategy="grid", cv=3, n_jobs=2, cache=cache).fit(X, y)
+
+    first = search([0, 1])
+    assert CountingClassifier.fits == 2 * 3 + 1 and first.cached_cells_ == 0
+    second = search([0, 1, 2])
+    # only the new point's folds; the winner's refit comes from the cache
+    assert CountingClassifier.fits == 3 and second.cached_cells_ == 2
+    assert second.best_params_ == first.best_params_
+
+    # other data, other keys
+    CountingClassifier.fits = 0
+    families = [{"name": "Counting", "model": CountingClassifier(), "param_grid": {"shift": [0]}}]
+    HyperparameterSearch(families, strategy="grid", cv=3, n_jobs=1, cache=cache).fit(X[:200], y[:200])
+    assert CountingClassifier.fits == 4
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    cache = FitCache(str(tmp_path), max_bytes=10**8)
+    payload = np.zeros(10_000)
+    for index, key in enumerate("abc"):
+        cache.put(key, payload)
+        os.utime(cache._path(key), (1000 + index, 1000 + index))
+    entry_size = os.path.getsize(cache._path("a"))
+
+    assert cache.get("a") is not None  # refreshes a
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_corrupt_entry_is_a_miss_and_is_removed(tmp_path):
+    cache = FitCache(str(tmp_path), max_bytes=10**8)
+    with open(cache._path("broken"), "wb") as file:
+        file.write(b"not a joblib file")
+    assert cache.get("broken", default="missing") == "missing"
+    assert not os.path.exists(cache._path("broken"))
+
+
+def test_fingerprints_and_keys_follow_content():
+    X = np.arange(12, dtype=float).reshape(4, 3)
+    assert array_fingerprint(X) == array_fingerprint(X.copy())
+    assert array_fingerprint(X) != array_fingerprint(X.astype(np.float32))
+    assert array_fingerprint(X) != array_fingerprint(X.reshape(3, 4))
+    assert array_fingerprint(sparse.csr_matrix(X)) == array_fingerprint(sparse.csc_matrix(X))
+    assert make_cache_key(a=1, b=[1, 2]) == make_cache_key(b=[1, 2], a=1) != make_cache_key(a=1, b=[2, 1])
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.tree import DecisionTreeClassifier
+from xgboost import XGBClassifier
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.ml_utils.drift.sketch import QuantileSketch
+from networksecurity.utils.ml_utils.model.incremental import continue_training, drift_guard, merge_drift_reference
+
+CLASSES = np.array([0, 1])
+
+
+@pytest.fixture(scope="module")
+def data():
+    X, y = make_classification(n_samples=1200, n_features=10, n_informative=6, random_state=0)
+    return (X[:800], y[:800]), (X[800:], y[800:])
+
+
+def update(model, X, y):
+    return continue_training(model, X, y, CLASSES, xgb_rounds=7, forest_trees=5,
+                             sgd_epochs=3, sgd_learning_rate=0.01)
+
+
+def test_xgboost_keeps_its_trees_and_adds_rounds(data):
+    (X_old, y_old), (X_new, y_new) = data
+    model = XGBClassifier(n_estimators=20, max_depth=3).fit(X_old, y_old)
+    before = model.predict_proba(X_new)
+    updated, report = update(model, X_new, y_new)
+    assert (report["method"], report["size_before"], report["size_after"]) == ("xgb_model", 20, 27)
+    assert updated.get_booster().num_boosted_rounds() == 27
+    # the previous model is untouched
+    assert model.get_booster().num_boosted_rounds() == 20
+    np.testing.assert_array_equal(model.predict_proba(X_new), before)
+
+
+def test_forest_grows_new_trees_next_to_the_old_ones(data):
+    (X_old, y_old), (X_new, y_new) = data
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X_old, y_old)
+    updated, report = update(model, X_new, y_new)
+    assert (report["method"], report["size_before"], report["size_after"]) == ("warm_start", 10, 15)
+    for kept, original in zip(updated.estimators_[:10], model.estimators_):
+        np.testing.assert_array_equal(kept.tree_.threshold, original.tree_.threshold)
+    assert len(model.estimators_) == 10 and not updated.warm_start
+
+
+def test_logistic_regression_continues_from_its_weights(data):
+    (X_old, y_old), (X_new, y_new) = data
+    model = LogisticRegression(C=1.0, max_iter=1000).fit(X_old, y_old)
+    updated, report = update(model, X_new, y_new)
+    assert isinstance(updated, SGDClassifier) and report["method"] == "sgd"
+    # a few small steps from the fitted weights stay close to them and keep the accuracy
+    assert np.linalg.norm(updated.coef_ - model.coef_) < 0.5 * np.linalg.norm(model.coef_)
+    assert updated.score(X_new, y_new) >= model.score(X_new, y_new) - 0.05
+
+
+def test_sgd_uses_partial_fit(data):
+    (X_old, y_old), (X_new, y_new) = data
+    model = SGDClassifier(loss="log_loss", random_state=0).fit(X_old, y_old)
+    updated, report = update(model, X_new, y_new)
+    assert report == {"estimator": "SGDClassifier", "rows": len(y_new), "method": "partial_fit", "added": 3}
+    assert updated is not model and not np.array_equal(updated.coef_, model.coef_)
+
+
+def test_unsupported_model_or_missing_class_is_rejected(data):
+    (X_old, y_old), (X_new, y_new) = data
+    with pytest.raises(NetworkSecurityException):
+        update(DecisionTreeClassifier().fit(X_old, y_old), X_new, y_new)
+    with pytest.raises(NetworkSecurityException, match="no examples"):
+        update(SGDClassifier().fit(X_old, y_old), X_new[y_new == 1], y_new[y_new == 1])
+
+
+def test_drift_guard_and_reference_merge():
+    rng = np.random.default_rng(0)
+    old = pd.DataFrame({"a": rng.normal(10, 1, 5000), "b": rng.normal(0, 1, 5000)})
+    reference = {name: QuantileSketch().update(old[name]).to_dict() for name in old}
+
+    same = pd.DataFrame({"a": rng.normal(10, 1, 2000), "b": rng.normal(0, 1, 2000)})
+    assert not drift_guard(reference, same, psi_threshold=0.2, max_drifted_share=0.3)["exceeded"]
+    shifted = same.assign(a=same["a"] + 3)
+    guard = drift_guard(reference, shifted, psi_threshold=0.2, max_drifted_share=0.3)
+    assert guard["drifted_columns"] == ["a"] and guard["exceeded"]
+
+    merged = merge_drift_reference(reference, same)
+    assert QuantileSketch.from_dict(merged["a"]).count == 7000
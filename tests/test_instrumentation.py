@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from networksecurity.logging.instrumentation import (
+    PipelineMetrics,
+    compare_metrics,
+    find_previous_metrics,
+    format_comparison,
+    instrumented,
+    measure
+)
+
+
+class Stage:
+    @instrumented
+    def work(self, seconds):
+        time.sleep(seconds)
+
+
+def stage(wall, peak=100.0, rows=1000, status="completed"):
+    return {"status": status, "wall_seconds": wall, "cpu_seconds": wall, "peak_rss_mb": peak,
+            "rows_out": {"features": rows}}
+
+
+def test_measure_records_usage_and_instrumented_spans():
+    with measure() as usage:
+        Stage().work(0.02)
+        Stage().work(0.02)
+    assert usage["wall_seconds"] >= 0.04
+    span = usage["spans"]["Stage.work"]
+    assert span["calls"] == 2 and span["wall_seconds"] >= 0.04
+    # outside a measured block the decorator is a plain call
+    Stage().work(0.0)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RSS high-water mark reset is Linux only")
+def test_reset_peak_gives_each_block_its_own_peak():
+    with measure(reset_peak=True) as big:
+        block = np.ones(60 * 1024 * 1024 // 8)
+        del block
+    with measure(reset_peak=True) as small:
+        pass
+    with measure() as unreset:
+        pass
+    if "peak_rss_mb" not in big:
+        pytest.skip("/proc/self/clear_refs is not writable here")
+    assert big["peak_rss_mb"] - small["peak_rss_mb"] > 40
+    assert "peak_rss_mb" not in unreset and "process_peak_rss_mb" in unreset
+
+
+def test_only_large_relative_and_absolute_growth_regresses():
+    baseline = {"run": "r1", "stages": {"ingestion": stage(10.0), "training": stage(0.2),
+                                        "validation": stage(5.0), "skipped": stage(1.0)}}
+    current = {"run": "r2", "stages": {"ingestion": stage(15.0, rows=2000), "training": stage(0.5),
+                                       "validation": stage(5.5, peak=300.0), "skipped": stage(0.0, status="skipped"),
+                                       "new": stage(1.0)}}
+    comparison = compare_metrics(baseline, current, threshold=0.2, min_seconds=1.0, min_mb=50.0)
+    assert set(comparison["stages"]) == {"ingestion", "training", "validation"}
+    assert comparison["stages"]["ingestion"]["rows_out_ratio"] == 2.0
+    # training grew 150% but by 0.3s only
+    assert comparison["regressions"] == ["ingestion wall_seconds 10.0 -> 15.0 (+50%)",
+                                         "ingestion cpu_seconds 10.0 -> 15.0 (+50%)",
+                                         "validation peak_rss_mb 100.0 -> 300.0 (+200%)"]
+    assert "REGRESSION ingestion wall_seconds" in format_comparison(comparison)
+
+
+def test_saved_metrics_are_compared_with_the_previous_run_of_the_same_executor(tmp_path):
+    def run(name, executor, seconds):
+        metrics = PipelineMetrics(str(tmp_path / name / "metrics.json"), run=name, executor=executor,
+                                  regression_min_seconds=0.05)
+        with metrics.stage("ingestion") as record:
+            time.sleep(seconds)
+            record["output"] = None
+        saved = metrics.save()
+        os.utime(metrics.file_path, (time.time() + len(os.listdir(tmp_path)),) * 2)
+        return saved
+
+    assert "comparison" not in run("r1", "sequential", 0.01)
+    run("r2", "dag", 0.3)
+    third = run("r3", "sequential", 0.2)
+    assert third["comparison"]["baseline_run"] == "r1"
+    assert third["comparison"]["regressions"][0].startswith("ingestion wall_seconds")
+    assert find_previous_metrics(str(tmp_path / "r3" / "metrics.json"), "dag").endswith(os.path.join("r2", "metrics.json"))
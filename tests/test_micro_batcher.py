@@ -0,0 +1,118 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from networksecurity.utils.ml_utils.model.micro_batcher import MicroBatcher, MicroBatcherUnavailableError
+
+
+class RecordingModel:
+    """Predicts the row sum, remembering the size of every predict call"""
+    def __init__(self, delay=0.0, n_features=None):
+        self.delay = delay
+        self.n_features = n_features
+        self.calls = []
+
+    def predict(self, matrix):
+        if self.n_features is not None and matrix.shape[1] != self.n_features:
+            raise ValueError(f"expected {self.n_features} features")
+        time.sleep(self.delay)
+        self.calls.append(matrix.shape[0])
+        return matrix.sum(axis=1)
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(model, **kwargs):
+        options = dict(max_batch_rows=64, max_wait_ms=50, max_queue_depth=256, timeout=5)
+        options.update(kwargs)
+        batcher = MicroBatcher(lambda: model, **options)
+        batcher.start()
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+    for batcher in batchers:
+        batcher.stop()
+
+
+def test_concurrent_rows_share_predict_calls(make_batcher):
+    model = RecordingModel(delay=0.01)
+    batcher = make_batcher(model)
+    results = {}
+    barrier = threading.Barrier(32)
+
+    def client(i):
+        barrier.wait()
+        results[i] = batcher.predict([i, 1.0])
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: i + 1.0 for i in range(32)}
+    assert sum(model.calls) == 32 and len(model.calls) < 32
+    stats = batcher.stats()
+    assert stats["rows"] == 32 and stats["batches"] == len(model.calls)
+
+
+def test_sequential_rows_are_not_held_for_the_window(make_batcher):
+    model = RecordingModel()
+    batcher = make_batcher(model, max_wait_ms=200)
+    start = time.perf_counter()
+    for i in range(5):
+        assert batcher.predict([i]) == i
+    assert time.perf_counter() - start < 0.2
+    assert model.calls == [1] * 5
+
+
+def test_rows_of_another_width_fail_alone(make_batcher):
+    model = RecordingModel(n_features=2)
+    batcher = make_batcher(model)
+    futures = [batcher.submit(row) for row in ([1, 2], [1, 2, 3], [3, 4])]
+    assert futures[0].result(timeout=5) == 3 and futures[2].result(timeout=5) == 7
+    with pytest.raises(ValueError, match="expected 2 features"):
+        futures[1].result(timeout=5)
+
+
+def test_timed_out_rows_are_not_scored(make_batcher):
+    model = RecordingModel(delay=0.3)
+    batcher = make_batcher(model, timeout=0.1)
+    blocker = batcher.submit([1])
+    time.sleep(0.05)  # the worker is busy with the first row
+    with pytest.raises(MicroBatcherUnavailableError):
+        batcher.predict([2])
+    assert blocker.result(timeout=5) == 1
+    time.sleep(0.1)
+    assert model.calls == [1] and batcher.stats()["timeouts"] == 1
+
+
+def test_full_queue_is_rejected_at_once(make_batcher):
+    model = RecordingModel(delay=0.3)
+    batcher = make_batcher(model, max_queue_depth=1, max_batch_rows=1)
+    batcher.submit([1])
+    time.sleep(0.05)
+    batcher.submit([2])
+    with pytest.raises(MicroBatcherUnavailableError, match="full"):
+        batcher.submit([3]).result(timeout=1)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_dead_worker_is_restarted_by_the_next_request(make_batcher, monkeypatch):
+    batcher = make_batcher(RecordingModel())
+    collect = batcher._collect
+
+    def die_once():
+        monkeypatch.setattr(batcher, "_collect", collect)
+        raise SystemExit
+
+    monkeypatch.setattr(batcher, "_collect", die_once)
+    batcher._worker.join(timeout=1)
+    assert not batcher._worker.is_alive()
+    assert batcher.predict([2, 3]) == 5
+    assert batcher.stats()["restarts"] == 1 and batcher.stats()["running"]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.entity.artifact_entity import DataTransformationArtifact
+from networksecurity.utils.main_utils.utils import save_feature_matrix, save_numpy_array
+
+
+def transformation_artifact(tmp_path, X_train, X_test, y_train, y_test):
+    paths = {}
+    for name, matrix in (("train", X_train), ("test", X_test)):
+        paths[name] = save_feature_matrix(str(tmp_path / f"{name}_features.npy"), matrix, "float32")
+    for name, labels in (("train", y_train), ("test", y_test)):
+        save_numpy_array(str(tmp_path / f"{name}_labels.npy"), labels)
+    return DataTransformationArtifact(
+        transformed_train_features_file_path=paths["train"],
+        transformed_train_labels_file_path=str(tmp_path / "train_labels.npy"),
+        transformed_test_features_file_path=paths["test"],
+        transformed_test_labels_file_path=str(tmp_path / "test_labels.npy"),
+        transformed_object_file_path=None
+    )
+
+
+@pytest.fixture
+def arrays():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 6))
+    y = np.where(X[:, 0] > 0, 1, -1).astype(np.int8)
+    return X[:200], X[200:], y[:200], y[200:]
+
+
+def test_dense_features_are_memory_mapped_float32(tmp_path, arrays):
+    X_train, X_test, y_train, y_test = arrays
+    trainer = ModelTrainer(transformation_artifact(tmp_path, *arrays), None)
+    X, y, X_eval, y_eval, classes = trainer.load_arrays()
+
+    assert isinstance(X, np.memmap) and not X.flags.writeable and X.flags.c_contiguous
+    assert X.dtype == np.float32
+    np.testing.assert_array_equal(X, X_train.astype(np.float32))
+    # -1/1 labels are encoded 0..k-1, the classes map predictions back
+    assert classes.tolist() == [-1, 1] and set(np.unique(y)) == {0, 1}
+    np.testing.assert_array_equal(classes[y_eval], y_test)
+    report = trainer.data_load_report
+    assert report["mmap"] and report["label_dtype"] == "int8"
+    assert report["train_shape"] == [200, 6] and report["feature_bytes"] == 300 * 6 * 4
+
+
+def test_sparse_features_load_as_csr(tmp_path, arrays):
+    X_train, X_test, y_train, y_test = arrays
+    X_train, X_test = np.where(X_train > 1, X_train, 0), np.where(X_test > 1, X_test, 0)
+    artifact = transformation_artifact(tmp_path, sparse.csr_matrix(X_train), sparse.csr_matrix(X_test),
+                                       y_train, y_test)
+    trainer = ModelTrainer(artifact, None)
+    X, _, _, _, _ = trainer.load_arrays()
+    assert sparse.isspmatrix_csr(X) and X.dtype == np.float32
+    np.testing.assert_array_equal(X.toarray(), X_train.astype(np.float32))
+    assert not trainer.data_load_report["mmap"] and trainer.data_load_report["density"] < 0.3
@@ -0,0 +1,101 @@
+import threading
+
+import pandas as pd
+import pytest
+from pymongo.errors import BulkWriteError
+
+from networksecurity.exception.exception import NetworkSecurityException
+from push_data import DUPLICATE_KEY_ERROR, LOAD_KEY_FIELD, LoadCheckpoint, NetworkDataExtract
+
+
+class FakeCollection():
+    """insert_many with a unique LOAD_KEY_FIELD index, failing once the budget of calls is spent"""
+    def __init__(self, fail_after=None):
+        self.documents={}
+        self.fail_after=fail_after
+        self.calls=0
+        self.lock=threading.Lock()
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def insert_many(self, records, ordered=True):
+        with self.lock:
+            self.calls+=1
+            if self.fail_after is not None and self.calls>self.fail_after:
+                raise ConnectionError("connection lost")
+            errors=[]
+            for index,record in enumerate(records):
+                if record[LOAD_KEY_FIELD] in self.documents:
+                    errors.append({"index": index, "code": DUPLICATE_KEY_ERROR})
+                else:
+                    self.documents[record[LOAD_KEY_FIELD]]=dict(record)
+            if errors:
+                raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": []})
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path=tmp_path/"data.csv"
+    pd.DataFrame({"a": range(95), "b": [None if i%10==0 else i/2 for i in range(95)]}).to_csv(path,index=False)
+    return str(path)
+
+
+def load(monkeypatch, collection, csv_file, checkpoint_path, chunksize=10, workers=3):
+    extractor=NetworkDataExtract(mongo_db_url="mongodb://unused")
+    monkeypatch.setattr(extractor,"get_client",lambda: {"db": {"coll": collection}})
+    return extractor.bulk_load(csv_file,"db","coll",chunksize=chunksize,workers=workers,
+                               checkpoint_path=checkpoint_path)
+
+
+def test_interrupted_load_resumes_without_duplicates(monkeypatch, csv_file, tmp_path):
+    checkpoint_path=str(tmp_path/"load.json")
+    collection=FakeCollection(fail_after=4)
+    # one writer: the chunks before the failure are checkpointed before it surfaces
+    with pytest.raises(NetworkSecurityException):
+        load(monkeypatch,collection,csv_file,checkpoint_path,workers=1)
+    assert 0<len(collection.documents)<95
+    assert LoadCheckpoint(checkpoint_path,csv_file,10).completed
+    loaded=len(collection.documents)
+
+    # chunks written but not yet checkpointed are replayed and rejected as duplicates
+    collection.fail_after=None
+    written=load(monkeypatch,collection,csv_file,checkpoint_path)
+    assert written==95-loaded
+    assert sorted(document["a"] for document in collection.documents.values())==list(range(95))
+    assert collection.documents[next(iter(collection.documents))]["b"] is None
+    # a finished load leaves no checkpoint behind
+    assert not LoadCheckpoint(checkpoint_path,csv_file,10).completed
+
+
+def test_replayed_rows_count_as_already_loaded(monkeypatch, csv_file, tmp_path):
+    collection=FakeCollection()
+    assert load(monkeypatch,collection,csv_file,None)==95
+    assert load(monkeypatch,collection,csv_file,None)==0
+    assert len(collection.documents)==95
+    # the row keys depend on the file, not on how it was chunked
+    assert load(monkeypatch,collection,csv_file,None,chunksize=7)==0
+
+
+def test_checkpoint_is_ignored_for_another_chunk_size(csv_file, tmp_path):
+    checkpoint_path=str(tmp_path/"load.json")
+    checkpoint=LoadCheckpoint(checkpoint_path,csv_file,10)
+    for chunk_index in (0,1,3):
+        checkpoint.mark_done(chunk_index,10)
+    resumed=LoadCheckpoint(checkpoint_path,csv_file,10)
+    assert resumed.completed_prefix()==2 and resumed.rows==30
+    assert not LoadCheckpoint(checkpoint_path,csv_file,20).completed
+
+    batches=NetworkDataExtract().iter_record_batches(csv_file,10,skip_chunks=2,is_done=resumed.is_done)
+    chunks=[(chunk_index,first_row,records[0]["a"]) for chunk_index,first_row,records in batches]
+    assert chunks[:2]==[(2,20,20),(4,40,40)]
+
+
+def test_write_concern_errors_are_not_treated_as_duplicates():
+    class Collection():
+        def insert_many(self, records, ordered=True):
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": DUPLICATE_KEY_ERROR}],
+                                  "writeConcernErrors": [{"code": 64, "errmsg": "waiting for replication timed out"}]})
+
+    with pytest.raises(BulkWriteError):
+        NetworkDataExtract().write_batch(Collection(),[{"a": 1}])
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from networksecurity.utils.ml_utils.model import registry
+from networksecurity.utils.ml_utils.model.registry import ModelRegistry, publish_model
+
+
+@pytest.fixture
+def serving_paths(tmp_path, monkeypatch):
+    model_file_path = str(tmp_path / "serving" / "model.pkl")
+    compiled_model_file_path = str(tmp_path / "serving" / "model_compiled.npz")
+    monkeypatch.delenv(registry.SERVING_MODEL_PATH_ENV_KEY, raising=False)
+    monkeypatch.setattr(registry, "SERVING_MODEL_FILE_PATH", model_file_path)
+    monkeypatch.setattr(registry, "SERVING_COMPILED_MODEL_FILE_PATH", compiled_model_file_path)
+    return model_file_path, compiled_model_file_path
+
+
+def write(file_path, content: str) -> str:
+    with open(file_path, "w") as file:
+        file.write(content)
+    return file_path
+
+
+def test_compiled_model_published_after_startup_is_picked_up(tmp_path, serving_paths):
+    model_file_path, compiled_model_file_path = serving_paths
+    model_registry = ModelRegistry(loader=lambda path: open(path).read())
+    publish_model(write(tmp_path / "model.pkl", "pickle"), None, model_file_path, compiled_model_file_path)
+    assert model_registry.load()
+    assert model_registry.get_model() == "pickle"
+
+    publish_model(write(tmp_path / "model.pkl", "pickle"), write(tmp_path / "model.npz", "compiled"),
+                  model_file_path, compiled_model_file_path)
+    assert model_registry.load()
+    assert model_registry.get_model() == "compiled"
+    assert model_registry.status()["model_path"] == compiled_model_file_path
+
+    # a model without a compiled export removes the stale one, and the pickle is served again
+    publish_model(write(tmp_path / "model.pkl", "pickle"), None, model_file_path, compiled_model_file_path)
+    assert model_registry.load()
+    assert model_registry.get_model() == "pickle"
+    assert not model_registry.load()
+
+
+def test_broken_artifact_keeps_previous_model(tmp_path, serving_paths):
+    model_file_path, compiled_model_file_path = serving_paths
+
+    def loader(path):
+        content = open(path).read()
+        if content == "broken":
+            raise ValueError("truncated pickle")
+        return content
+
+    model_registry = ModelRegistry(loader=loader)
+    assert model_registry.get_model() is None
+    publish_model(write(tmp_path / "model.pkl", "good"), None, model_file_path, compiled_model_file_path)
+    assert model_registry.get_model() == "good"
+
+    publish_model(write(tmp_path / "model.pkl", "broken"), None, model_file_path, compiled_model_file_path)
+    # a distinct mtime, whatever the file system's timestamp granularity
+    os.utime(model_file_path, (1, 1))
+    assert not model_registry.load()
+    assert model_registry.get_model() == "good"
+    assert "truncated pickle" in model_registry.status()["last_error"]
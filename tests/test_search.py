@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+import pytest
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.ml_utils.model.search import Candidate, HyperparameterSearch, expand_grid
+
+
+class SlowClassifier(ClassifierMixin, BaseEstimator):
+    """Predicts the majority class after sleeping for `delay` seconds in fit"""
+    def __init__(self, delay=0.2):
+        self.delay = delay
+
+    def fit(self, X, y):
+        time.sleep(self.delay)
+        self.classes_, counts = np.unique(y, return_counts=True)
+        self.majority_ = self.classes_[np.argmax(counts)]
+        return self
+
+    def predict(self, X):
+        return np.full(X.shape[0], self.majority_)
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_classification(n_samples=900, n_features=8, n_informative=5, random_state=0)
+
+
+def families():
+    return [
+        {"name": "Logistic Regression", "model": LogisticRegression(max_iter=500), "param_grid": {"C": [0.01, 0.1, 1, 10]}},
+        {"name": "Decision Tree", "model": DecisionTreeClassifier(random_state=0), "param_grid": {"max_depth": [1, 2, 4, 8, None]}}
+    ]
+
+
+def test_schedule_grows_by_factor_and_ends_on_all_rows():
+    search = HyperparameterSearch(families(), factor=3, cv=3)
+    assert search._resource_schedule(27, 9000, 2) == [1000, 3000, 9000]
+    # the smallest rung still has enough rows for every fold and class
+    assert search._resource_schedule(27, 500, 2) == [120, 166, 500]
+    assert HyperparameterSearch(families(), strategy="grid")._resource_schedule(27, 9000, 2) == [9000]
+
+
+def test_survivors_keep_the_best_of_every_family():
+    search = HyperparameterSearch(families(), factor=3)
+    ranked = expand_grid(families())
+    ranked.sort(key=lambda candidate: candidate.family != "Logistic Regression")
+    survivors = search._survivors(ranked)
+    assert survivors[:3] == ranked[:3]
+    assert [candidate.family for candidate in survivors] == ["Logistic Regression"] * 3 + ["Decision Tree"]
+
+
+def test_halving_narrows_the_field_and_refits_on_all_rows(data):
+    X, y = data
+    search = HyperparameterSearch(families(), factor=3, cv=3, n_jobs=2).fit(X, y)
+    n_candidates = [rung["n_candidates"] for rung in search.history_]
+    assert n_candidates[0] == 9 and n_candidates == sorted(n_candidates, reverse=True)
+    assert search.history_[-1]["n_samples"] == len(y) == search.best_n_samples_
+    assert set(search.best_per_family_) == {"Logistic Regression", "Decision Tree"}
+    assert search.best_estimator_.predict(X).shape == y.shape
+
+
+def test_time_budget_stops_starting_fits(data):
+    X, y = data
+    slow = [{"name": "Slow", "model": SlowClassifier(), "param_grid": {"delay": [0.2, 0.21, 0.22, 0.23, 0.24]}}]
+    budget = 0.5
+    start = time.perf_counter()
+    search = HyperparameterSearch(slow, strategy="grid", cv=3, n_jobs=2, time_budget_seconds=budget).fit(X, y)
+    elapsed = time.perf_counter() - start
+
+    # no more than the fits already running when the deadline passed, plus the refit
+    assert elapsed < budget + 2 * 0.25 + 0.3
+    assert search.best_family_ == "Slow"
+    assert search.best_params_["delay"] in (0.2, 0.21)
+
+
+def test_no_finished_candidate_within_the_budget_is_an_error(data):
+    X, y = data
+    slow = [{"name": "Slow", "model": SlowClassifier(), "param_grid": {"delay": [0.5]}}]
+    with pytest.raises(NetworkSecurityException):
+        HyperparameterSearch(slow, strategy="grid", n_jobs=1, time_budget_seconds=0.1).fit(X, y)
+
+
+def test_fits_inside_the_search_are_single_threaded():
+    from sklearn.ensemble import RandomForestClassifier
+    model = Candidate("Random Forest", RandomForestClassifier(n_jobs=-1), {"n_estimators": 5}).build()
+    assert model.n_jobs == 1 and model.n_estimators == 5
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.import_time import REPO_ROOT, TRAINING_ONLY_PACKAGES
+
+
+@pytest.mark.parametrize("module", ["app", "asgi_app"])
+def test_serving_entry_points_do_not_import_the_training_stack(module, tmp_path):
+    # fresh interpreter, outside the repo so no model artifact is loaded
+    code = (f"import sys, {module}\n"
+            f"print(' '.join(sorted({{name.split('.')[0] for name in sys.modules}} & {set(TRAINING_ONLY_PACKAGES)!r})))")
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from networksecurity.utils.ml_utils.drift.sketch import QuantileSketch, compare_sketches, kolmogorov_sf
+
+RELATIVE_ACCURACY = 0.01
+
+
+def sketch_of(values, relative_accuracy: float = RELATIVE_ACCURACY) -> QuantileSketch:
+    return QuantileSketch(relative_accuracy).update(values)
+
+
+def samples(n: int, seed: int, shift: float = 0.0) -> np.ndarray:
+    # positive, negative and zero values, as in the transformed features
+    rng = np.random.default_rng(seed)
+    values = np.concatenate([rng.lognormal(2, 1, n // 2) + shift, rng.normal(shift, 3, n - n // 2)])
+    values[rng.random(n) < 0.02] = 0.0
+    return values
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_median_within_relative_accuracy(seed):
+    values = samples(10001, seed)
+    median = np.median(values)
+    assert abs(sketch_of(values).quantile(0.5) - median) <= RELATIVE_ACCURACY * abs(median)
+
+
+@pytest.mark.parametrize("q", [0.01, 0.1, 0.25, 0.75, 0.9, 0.99])
+def test_quantiles_within_relative_accuracy(q):
+    values = samples(20000, seed=3)
+    expected = np.quantile(values, q, method="lower")
+    assert abs(sketch_of(values).quantile(q) - expected) <= RELATIVE_ACCURACY * abs(expected)
+
+
+def test_merge_equals_sketch_of_all_rows():
+    first, second = samples(5000, seed=4), samples(7000, seed=5, shift=1.0)
+    merged = sketch_of(first).merge(sketch_of(second))
+    whole = sketch_of(np.concatenate([first, second]))
+    merged, whole = merged.to_dict(), whole.to_dict()
+    assert merged.pop("sum") == pytest.approx(whole.pop("sum"))
+    assert merged == whole
+
+
+def test_nan_and_inf_are_ignored():
+    sketch = sketch_of([1.0, np.nan, np.inf, -np.inf, 2.0])
+    assert sketch.count == 2
+    assert sketch.mean == pytest.approx(1.5)
+
+
+@pytest.mark.parametrize("shift", [0.0, 0.05, 0.3, 1.0])
+def test_ks_matches_scipy(shift):
+    reference, current = samples(20000, seed=6), samples(5000, seed=7, shift=shift)
+    expected = stats.ks_2samp(reference, current, method="asymp")
+    result = compare_sketches(sketch_of(reference), sketch_of(current))
+    # the sketch only sees the CDFs at its bucket bounds, each holding values within 1% of each other
+    assert result["ks_statistic"] == pytest.approx(expected.statistic, abs=0.01)
+    assert result["p_value"] == pytest.approx(expected.pvalue, abs=0.05)
+    assert result["drift_detected"] == (expected.pvalue < 0.05)
+
+
+@pytest.mark.parametrize("effective_n", [50, 200, 1000, 10000])
+def test_kolmogorov_sf_close_to_scipy(effective_n):
+    tolerance = 0.005 if effective_n >= 1000 else 0.015
+    for statistic in np.linspace(0.001, 0.5, 200):
+        expected = stats.kstwo.sf(statistic, effective_n)
+        assert kolmogorov_sf(statistic, effective_n) == pytest.approx(expected, abs=tolerance)
@@ -0,0 +1,95 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from networksecurity.entity.artifact_entity import (
+    ClassificationMetricArtifact,
+    DataIngestionArtifact,
+    ModelTrainerArtifact
+)
+from networksecurity.pipeline.stage_cache import StageCache
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Two runs' artifact dirs, an input file and a stage that counts its executions"""
+    run_dir=tmp_path/"artifacts"/"run1"
+    run_dir.mkdir(parents=True)
+    input_file=tmp_path/"input.csv"
+    input_file.write_text("a,b\n1,2\n")
+    calls=[]
+
+    def stage():
+        calls.append(1)
+        output=run_dir/"train.csv"
+        output.write_text(input_file.read_text())
+        return DataIngestionArtifact(trained_file_path=str(output),test_file_path=str(output))
+
+    return SimpleNamespace(tmp_path=tmp_path,run_dir=str(run_dir),input_file=input_file,stage=stage,calls=calls)
+
+
+def cache_for(workspace, run_dir=None):
+    return StageCache(str(workspace.tmp_path/"cache"),run_dir or workspace.run_dir)
+
+
+def fingerprint(cache, workspace, run_dir=None):
+    config=SimpleNamespace(train_file_path=os.path.join(run_dir or workspace.run_dir,"train.csv"),ratio=0.2)
+    return cache.fingerprint("data_ingestion",config=config,files=[str(workspace.input_file)],code=StageCache)
+
+
+def test_unchanged_inputs_reuse_the_artifact_of_another_run(workspace):
+    cache=cache_for(workspace)
+    first,skipped=cache.run("data_ingestion",fingerprint(cache,workspace),DataIngestionArtifact,workspace.stage)
+    assert not skipped
+
+    # a new run directory does not change the fingerprint: the config paths are masked
+    other_run=str(workspace.tmp_path/"artifacts"/"run2")
+    cache=cache_for(workspace,other_run)
+    second,skipped=cache.run("data_ingestion",fingerprint(cache,workspace,other_run),DataIngestionArtifact,
+                             workspace.stage)
+    assert skipped and second==first and len(workspace.calls)==1
+
+
+def test_changed_input_file_reruns_the_stage(workspace):
+    cache=cache_for(workspace)
+    cache.run("data_ingestion",fingerprint(cache,workspace),DataIngestionArtifact,workspace.stage)
+    workspace.input_file.write_text("a,b\n1,2\n3,4\n")
+
+    cache=cache_for(workspace)
+    _,skipped=cache.run("data_ingestion",fingerprint(cache,workspace),DataIngestionArtifact,workspace.stage)
+    assert not skipped and len(workspace.calls)==2
+
+
+def test_tampered_output_reruns_the_stage(workspace):
+    cache=cache_for(workspace)
+    artifact,_=cache.run("data_ingestion",fingerprint(cache,workspace),DataIngestionArtifact,workspace.stage)
+    with open(artifact.trained_file_path,"a") as file:
+        file.write("5,6\n")
+
+    cache=cache_for(workspace)
+    _,skipped=cache.run("data_ingestion",fingerprint(cache,workspace),DataIngestionArtifact,workspace.stage)
+    assert not skipped and len(workspace.calls)==2
+
+    cache.reuse=False
+    _,skipped=cache.run("data_ingestion",fingerprint(cache,workspace),DataIngestionArtifact,workspace.stage)
+    assert not skipped and len(workspace.calls)==3
+
+
+def test_upstream_artifact_content_and_nested_metrics_round_trip(workspace):
+    cache=cache_for(workspace)
+    upstream,_=cache.run("data_ingestion",fingerprint(cache,workspace),DataIngestionArtifact,workspace.stage)
+    model_file=workspace.tmp_path/"model.pkl"
+    model_file.write_bytes(b"model")
+    metric=ClassificationMetricArtifact(accuracy=0.9,precision=0.8,recall=0.7,f1_score=0.75)
+    trained=ModelTrainerArtifact(trained_model_file_path=str(model_file),train_metric=metric,test_metric=metric,
+                                 search_report={"best_family": "Random Forest"})
+
+    key=cache.fingerprint("model_trainer",upstream=[upstream])
+    cache.save("model_trainer",key,trained)
+    loaded=cache.load("model_trainer",key,ModelTrainerArtifact)
+    assert loaded==trained and isinstance(loaded.test_metric,ClassificationMetricArtifact)
+
+    with open(upstream.trained_file_path,"a") as file:
+        file.write("7,8\n")
+    assert StageCache(cache.cache_dir,cache.run_artifact_dir).fingerprint("model_trainer",upstream=[upstream])!=key
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from networksecurity.utils.main_utils import streaming_preprocessor
+from networksecurity.utils.main_utils.streaming_preprocessor import StreamingPreprocessorFitter, transform_to_disk
+from networksecurity.utils.main_utils.utils import load_feature_matrix
+from tests.conftest import NUMERICAL_COLUMNS, make_preprocessor, make_raw_frame
+
+RELATIVE_ACCURACY = 0.001
+
+
+def chunks_of(frame, chunksize: int = 250):
+    return lambda: (frame.iloc[start:start + chunksize] for start in range(0, len(frame), chunksize))
+
+
+def dense(matrix):
+    return matrix.toarray() if sparse.issparse(matrix) else np.asarray(matrix)
+
+
+def fitted_pair(raw_frame, output_format: str):
+    in_memory = make_preprocessor(output_format).fit(raw_frame)
+    streamed = StreamingPreprocessorFitter(make_preprocessor(output_format), RELATIVE_ACCURACY).fit(
+        chunks_of(raw_frame))
+    return in_memory, streamed
+
+
+def imputer_statistics(preprocessor, name: str) -> np.ndarray:
+    return preprocessor.named_transformers_[name].named_steps["imputer"].statistics_
+
+
+@pytest.mark.parametrize("output_format", ["dense", "sparse", "auto"])
+def test_streaming_fit_matches_in_memory_fit(raw_frame, output_format):
+    in_memory, streamed = fitted_pair(raw_frame, output_format)
+
+    assert streamed.sparse_output_ == in_memory.sparse_output_
+    np.testing.assert_allclose(imputer_statistics(streamed, "num_pipeline").astype(float),
+                               imputer_statistics(in_memory, "num_pipeline").astype(float), rtol=1e-12)
+    assert list(imputer_statistics(streamed, "cat_pipeline")) == list(imputer_statistics(in_memory, "cat_pipeline"))
+    for streamed_categories, expected_categories in zip(
+            streamed.named_transformers_["cat_pipeline"].named_steps["encoder"].categories_,
+            in_memory.named_transformers_["cat_pipeline"].named_steps["encoder"].categories_):
+        assert list(streamed_categories) == list(expected_categories)
+
+    frame = make_raw_frame(500, seed=2)
+    np.testing.assert_allclose(dense(streamed.transform(frame)), dense(in_memory.transform(frame)), atol=1e-9)
+
+
+def test_sketched_medians_within_relative_accuracy(raw_frame, monkeypatch):
+    # past this many distinct values a column's median comes from its QuantileSketch
+    monkeypatch.setattr(streaming_preprocessor, "EXACT_MEDIAN_MAX_DISTINCT", 10)
+    in_memory, streamed = fitted_pair(raw_frame, "dense")
+
+    streamed_medians = imputer_statistics(streamed, "num_pipeline").astype(float)
+    expected_medians = imputer_statistics(in_memory, "num_pipeline").astype(float)
+    for column, streamed_median, expected_median in zip(NUMERICAL_COLUMNS, streamed_medians, expected_medians):
+        values = np.sort(raw_frame[column].dropna().to_numpy())
+        # the sketch returns a value near one of the middle data values, not their mean
+        middle = values[(len(values) - 1) // 2:len(values) // 2 + 1]
+        assert np.min(np.abs(middle - streamed_median)) <= RELATIVE_ACCURACY * np.max(np.abs(middle)) + 1e-9, column
+        assert abs(streamed_median - expected_median) <= RELATIVE_ACCURACY * abs(expected_median) \
+            + np.ptp(middle) / 2 + 1e-9, column
+
+    frame = make_raw_frame(500, seed=2).dropna()
+    np.testing.assert_allclose(dense(streamed.transform(frame)), dense(in_memory.transform(frame)),
+                               rtol=1e-2, atol=1e-2)
+
+
+@pytest.mark.parametrize("output_format", ["dense", "sparse"])
+def test_transform_to_disk_matches_transform(raw_frame, output_format, tmp_path):
+    preprocessor = make_preprocessor(output_format).fit(raw_frame)
+    file_path = transform_to_disk(preprocessor, chunks_of(raw_frame)(), len(raw_frame),
+                                  str(tmp_path / "train.npy"), dtype=np.float64)
+    np.testing.assert_allclose(dense(load_feature_matrix(file_path)), dense(preprocessor.transform(raw_frame)))
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import subprocess
+import multiprocessing
+
+import pytest
+
+from networksecurity.pipeline.training_job import (
+    JobStore,
+    TrainingInProgressError,
+    TrainingJobManager,
+    TrainingLock,
+    _pid_alive
+)
+
+
+def _update_many(jobs_dir: str, job_id: str, field: str, n: int) -> None:
+    store = JobStore(jobs_dir)
+    for i in range(n):
+        store.update(job_id, **{field: i})
+
+
+def test_concurrent_updates_from_two_processes_lose_nothing(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.write({"job_id": "a" * 12, "status": "running"})
+    context = multiprocessing.get_context("spawn")
+    writers = [context.Process(target=_update_many, args=(str(tmp_path), "a" * 12, field, 200))
+               for field in ("parent", "child")]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+    job = store.read("a" * 12)
+    assert job["parent"] == 199 and job["child"] == 199 and job["status"] == "running"
+
+
+def test_update_with_expected_status_keeps_a_finished_job(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.write({"job_id": "b" * 12, "status": "succeeded"})
+    job = store.update("b" * 12, expected_status=("queued", "running"), status="failed")
+    assert job["status"] == "succeeded"
+    assert store.read("b" * 12)["status"] == "succeeded"
+
+
+def test_get_marks_a_dead_unfinished_job_failed_but_not_a_finished_one(tmp_path):
+    manager = TrainingJobManager(str(tmp_path / "jobs"), str(tmp_path / "training.lock"))
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    manager.store.write({"job_id": "c" * 12, "status": "running", "pid": process.pid})
+    manager.store.write({"job_id": "d" * 12, "status": "succeeded", "pid": process.pid})
+    assert manager.get("c" * 12)["status"] == "failed"
+    assert manager.get("d" * 12)["status"] == "succeeded"
+    assert manager.get("../etc") is None
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="no /proc to tell a zombie apart")
+def test_zombie_child_is_not_alive():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    # not waited for: once it exits, the child stays a zombie
+    deadline = time.time() + 10
+    while _pid_alive(process.pid) and time.time() < deadline:
+        time.sleep(0.05)
+    assert os.path.exists(f"/proc/{process.pid}")
+    assert not _pid_alive(process.pid)
+    process.wait()
+    assert _pid_alive(os.getpid())
+
+
+def test_training_lock_is_exclusive_until_released(tmp_path):
+    lock_path = str(tmp_path / "training.lock")
+    first = TrainingLock(lock_path)
+    first.acquire("e" * 12)
+    with pytest.raises(TrainingInProgressError) as error:
+        TrainingLock(lock_path).acquire("f" * 12)
+    assert error.value.job_id == "e" * 12
+    first.release()
+    second = TrainingLock(lock_path)
+    second.acquire("f" * 12)
+    second.release()
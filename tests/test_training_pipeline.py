@@ -0,0 +1,47 @@
+import pytest
+
+from networksecurity.constant import training_pipeline as constants
+from networksecurity.entity.artifact_entity import DataValidationArtifact
+from networksecurity.pipeline import training_pipeline
+from networksecurity.pipeline.training_pipeline import TrainingPipeline
+
+
+def validation_artifact(status: bool) -> DataValidationArtifact:
+    return DataValidationArtifact(status, None, None, None, None, None)
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(constants, "MODEL_TRAINER_TRAINING_MODE", "incremental")
+    return TrainingPipeline(force=True)
+
+
+def test_incremental_dag_validates_the_delta_before_updating(pipeline):
+    nodes = {node.name: node for node in pipeline.build_dag(incremental=True)}
+    assert list(nodes) == ["data_ingestion", "data_validation", "incremental_update"]
+    assert nodes["incremental_update"].inputs == ["data_ingestion", "data_validation"]
+
+
+def test_both_executors_run_validation_before_the_incremental_update(pipeline, monkeypatch):
+    calls = []
+    artifact = object()
+    monkeypatch.setattr(pipeline, "start_data_ingestion", lambda: calls.append("data_ingestion") or "ingested")
+    monkeypatch.setattr(pipeline, "start_data_validation",
+                        lambda ingested: calls.append("data_validation") or validation_artifact(True))
+    monkeypatch.setattr(pipeline, "start_incremental_update",
+                        lambda ingested, validated: calls.append(("incremental_update", validated.validation_status))
+                        or artifact)
+    monkeypatch.setattr(pipeline, "publish_serving_model", lambda model_trainer_artifact: None)
+    pipeline.training_pipeline_config.executor = "sequential"
+    assert pipeline.run_pipeline() is artifact
+    assert calls == ["data_ingestion", "data_validation", ("incremental_update", True)]
+
+
+def test_incremental_update_skips_data_that_failed_validation(pipeline, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("the model must not be updated on invalid data")
+
+    monkeypatch.setattr(training_pipeline.ModelTrainer, "initiate_incremental_training", fail)
+    assert training_pipeline._incremental_update_node(
+        pipeline.training_pipeline_config, None, validation_artifact(False)) is None
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.utils import (
+    count_dataframe_rows,
+    documents_to_dataframe,
+    get_collection_as_dataframe,
+    iter_dataframe_chunks,
+    load_dataframe,
+    save_dataframe,
+    with_file_format
+)
+
+SCHEMA = {"columns": [{"name": "id", "dtype": "int"}, {"name": "rank", "dtype": "int"},
+                      {"name": "url", "dtype": "string"}]}
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"id": np.arange(25, dtype=np.int64),
+                         "rank": [np.nan if i % 7 == 0 else float(i % 3) for i in range(25)],
+                         "url": [f"site{i}.com" for i in range(25)]})
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet", "feather"])
+def test_every_format_round_trips_typed(frame, tmp_path, file_format):
+    path = str(tmp_path / with_file_format("data.csv", file_format))
+    assert path.endswith(f".{file_format}")
+    save_dataframe(path, frame)
+    loaded = load_dataframe(path, SCHEMA)
+    pd.testing.assert_frame_equal(loaded, frame, check_dtype=False)
+    assert loaded["id"].dtype == np.int64 and loaded["rank"].dtype == np.float64
+
+    assert count_dataframe_rows(path, chunksize=10) == 25
+    chunks = list(iter_dataframe_chunks(path, chunksize=10, columns=["id", "url"]))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[0].columns) == ["id", "url"]
+    assert pd.concat(chunks)["id"].tolist() == list(range(25))
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(NetworkSecurityException, match="Unsupported dataframe format"):
+        save_dataframe(str(tmp_path / "data.xlsx"), pd.DataFrame({"a": [1]}))
+
+
+class FakeCollection:
+    """find() over in-memory documents, applying an inclusion projection like the server"""
+    def __init__(self, documents):
+        self.documents = documents
+        self.find_calls = []
+
+    def find(self, query, projection=None, batch_size=None):
+        self.find_calls.append({"query": query, "projection": projection, "batch_size": batch_size})
+        for document in self.documents:
+            if projection is None:
+                yield dict(document)
+            else:
+                yield {key: value for key, value in document.items() if projection.get(key)}
+
+
+def test_documents_become_typed_columns_batch_by_batch():
+    documents = ({"id": i, "rank": "na" if i == 1 else ("high" if i == 3 else i), "url": None if i == 2 else "a.com"}
+                 for i in range(5))
+    frame = documents_to_dataframe(documents, {"id": "int64", "rank": "int64", "url": "object", "label": "int64"},
+                                   batch_size=2)
+    # a column no document has is left out for validation to report
+    assert list(frame.columns) == ["id", "rank", "url"]
+    assert frame["id"].dtype == np.int64 and frame["id"].tolist() == list(range(5))
+    assert frame["rank"].dtype == np.float64 and frame["rank"].isna().tolist() == [False, True, False, True, False]
+    assert frame["url"].isna().tolist() == [False, False, True, False, False]
+
+
+def test_collection_export_projects_the_schema_columns():
+    collection = FakeCollection([{"_id": "x1", "id": 1, "rank": 2, "url": "a.com", "unused": "big"}])
+    client = {"db": {"coll": collection}}
+    frame = get_collection_as_dataframe("db", "coll", client, schema=SCHEMA, batch_size=500)
+    assert collection.find_calls[0]["projection"] == {"id": 1, "rank": 1, "url": 1, "_id": 0}
+    assert collection.find_calls[0]["batch_size"] == 500
+    assert list(frame.columns) == ["id", "rank", "url"]
+
+    frame = get_collection_as_dataframe("db", "coll", client, schema=SCHEMA, include_id=True,
+                                        query={"id": {"$gte": 1}})
+    assert collection.find_calls[1]["query"] == {"id": {"$gte": 1}}
+    assert list(frame.columns) == ["_id", "id", "rank", "url"] and frame["_id"].tolist() == ["x1"]
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
+from networksecurity.utils.main_utils.utils import read_yaml_file, save_dataframe
+from networksecurity.utils.main_utils.validation_engine import ValidationEngine, compile_rules
+
+SCHEMA = {
+    "columns": [{"name": "rank", "dtype": "int"}, {"name": "score", "dtype": "float"},
+                {"name": "flag", "dtype": "int"}, {"name": "url", "dtype": "string"}],
+    "domain_values": {"flag": [-1, 1], "url": ["a.com", "b.com"]},
+    "value_ranges": {"rank": {"min": 0, "max": 10}},
+    "max_null_ratio": {"default": 0.0, "score": 0.25}
+}
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "rank": ["1", "2.5", "x", "11", "-1", "3", None, "4"],
+        "score": [0.1, None, 0.3, None, 0.5, 0.6, 0.7, 0.8],
+        "flag": [1, -1, 1, 0, 1, -1, 1, 1],
+        "url": ["a.com", "b.com", "c.com", None, "a.com", "a.com", "b.com", "a.com"],
+        "extra": range(8)
+    })
+
+
+def test_every_violation_is_counted_in_one_pass(frame):
+    report = ValidationEngine(SCHEMA).validate_chunks([frame]).to_dict()
+    columns = report["columns"]
+    assert report["rows"] == 8 and report["unexpected_columns"] == ["extra"]
+    # "2.5" is not an int, "x" is not a number; 11 and -1 are out of [0, 10]
+    assert columns["rank"]["dtype_violations"] == 2
+    assert columns["rank"]["range_violations"] == 2
+    assert (columns["rank"]["min"], columns["rank"]["max"]) == (-1.0, 11.0)
+    assert columns["rank"]["nulls"] == 1
+    assert columns["flag"]["domain_violations"] == 1
+    assert columns["url"]["domain_violations"] == 1 and columns["url"]["nulls"] == 1
+    # 2 nulls in 8 rows is within the score column's own limit
+    assert columns["score"]["null_ratio"] == 0.25
+    assert not report["passed"]
+    failed = " | ".join(report["failed_rules"])
+    assert "score" not in failed
+    for column in ("rank", "flag", "url"):
+        assert column in failed
+
+
+def test_chunked_counts_add_up_to_the_whole_file(frame):
+    engine = ValidationEngine(SCHEMA)
+    whole = engine.validate_chunks([frame]).to_dict()
+    chunked = engine.validate_chunks([frame.iloc[:3], frame.iloc[3:5], frame.iloc[5:]]).to_dict()
+    assert chunked == whole
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_validate_file_streams_chunks(frame, tmp_path, file_format):
+    frame = frame.drop(columns=["extra"]).assign(rank=np.arange(8), score=np.linspace(0, 1, 8),
+                                                 flag=1, url="b.com")
+    path = str(tmp_path / f"data.{file_format}")
+    save_dataframe(path, frame)
+    report = ValidationEngine(SCHEMA).validate_file(path, chunksize=3)
+    assert report.passed and report.rows == 8 and report.columns["rank"].max == 7.0
+
+
+def test_missing_columns_fail_and_the_repo_schema_compiles():
+    report = ValidationEngine(SCHEMA).validate_chunks([pd.DataFrame({"rank": [1]})])
+    assert report.missing_columns == ["score", "flag", "url"]
+    assert "missing column url" in report.failed_rules
+
+    rules = compile_rules(read_yaml_file(SCHEMA_FILE_PATH))
+    assert rules["label"].domain.tolist() == [0.0, 1.0]
+    assert (rules["page_rank"].min_value, rules["page_rank"].max_value) == (0, 10)